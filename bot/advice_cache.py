@@ -0,0 +1,135 @@
+"""LRU + TTL cache of advisor replies keyed by a board fingerprint."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config import ADVICE_CACHE_PATH, ADVICE_CACHE_SIZE, ADVICE_CACHE_TTL
+from utils import logger
+
+_FORMAT_VERSION = 2
+
+
+class AdviceCache:
+    """Advisor replies for boards we've already asked about.
+
+    Solo gates replay the same opening hands a lot, so an identical board,
+    command list, phase and model is answered from here instead of a model
+    round-trip. Entries expire after *ttl* seconds and the least recently
+    used ones are evicted past *max_entries*. With a *path* the cache is
+    kept as gzipped JSON across sessions; ``path=""`` keeps it in memory.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_entries: int = ADVICE_CACHE_SIZE,
+        ttl: float = ADVICE_CACHE_TTL,
+    ) -> None:
+        self._path = ADVICE_CACHE_PATH if path is None else path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()  # key -> (stored_at, text)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Fresh entry present; unlike ``get()`` this doesn't count as a hit or miss."""
+        entry = self._entries.get(key)
+        return entry is not None and time.time() - entry[0] <= self.ttl
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """Canonical hash of everything that determines a reply (board, commands, model...)."""
+        blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+                self._dirty = True
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        if not text:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def load(self) -> int:
+        if not self._path or not os.path.isfile(self._path):
+            return 0
+        try:
+            with gzip.open(self._path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warn(f"Advice cache unreadable, starting empty: {exc}")
+            return 0
+        if data.get("version") != _FORMAT_VERSION:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for key, stored_at, text in data.get("entries", []):
+                if stored_at >= cutoff:
+                    self._entries[key] = (stored_at, text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return len(self._entries)
+
+    def save(self) -> bool:
+        if not self._path:
+            return True
+        with self._lock:
+            if not self._dirty:
+                return True
+            payload = {
+                "version": _FORMAT_VERSION,
+                "entries": [[k, t, text] for k, (t, text) in self._entries.items()],
+            }
+            self._dirty = False
+        tmp = self._path + ".tmp"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp, self._path)
+            return True
+        except OSError as exc:
+            logger.error(f"Advice cache save failed: {exc}")
+            return False
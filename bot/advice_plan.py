@@ -0,0 +1,190 @@
+"""Structured advisor replies: JSON steps pointing at ``get_commands()`` entries."""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+
+from bot.prompt_builder import ACTION_NAMES, zone_label
+
+_ACTION_BITS = {label.lower(): bit for bit, label in ACTION_NAMES.items()}
+MAX_STEPS = 3   # told to the model and enforced on what comes back
+
+PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "steps": {
+            "type": "array",
+            "maxItems": MAX_STEPS,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "cmd": {"type": "integer"},
+                    "action": {"type": "string", "enum": list(ACTION_NAMES.values())},
+                    "why": {"type": "string"},
+                },
+                "required": ["cmd", "action"],
+            },
+        },
+        "note": {"type": "string"},
+    },
+    "required": ["steps"],
+}
+
+PLAN_INSTRUCTIONS = f"""\
+Reply with JSON only:
+{{"steps":[{{"cmd":<index from Commands>,"action":"<one of that command's actions>","why":"<few words>"}}],"note":"<one line>"}}
+At most {MAX_STEPS} steps, in order. Only use listed commands; put anything else (battle, what to chain later) in note.
+"""
+
+_STEPS_OPEN = re.compile(r'"steps"\s*:\s*\[')
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```\s*$")
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    cmd: int           # index into the commands list the prompt was built from
+    action: str
+    why: str
+    name: str
+    zone: int
+    index: int         # card index within the zone
+    uid: int           # card uid; survives the command list being rebuilt
+    bit: int           # mask bit of the action, 0 when invalid
+    error: str = ""
+
+    @property
+    def valid(self) -> bool:
+        return not self.error
+
+    @property
+    def command_type(self) -> int:
+        """CommandType for ``do_command``; the agent's mask has bit n set for CommandType n."""
+        return self.bit.bit_length() - 1
+
+    @property
+    def label(self) -> str:
+        zone = f" ({zone_label(self.zone)})" if self.zone >= 0 else ""
+        return f"{self.action} {self.name}{zone}"
+
+
+@dataclass(frozen=True)
+class AdvicePlan:
+    steps: tuple[PlanStep, ...]
+    note: str
+    revision: int      # board revision the plan was made for
+    online: bool
+
+    @property
+    def executable(self) -> tuple[PlanStep, ...]:
+        return tuple(s for s in self.steps if s.valid)
+
+
+def parse_plan(text: str) -> dict | None:
+    """The reply's JSON object (tolerating code fences and chatter around it), or None."""
+    text = _FENCE.sub("", text.strip())
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        obj, _ = json.JSONDecoder().raw_decode(text, start)
+    except ValueError:
+        return None
+    if not isinstance(obj, dict) or not isinstance(obj.get("steps"), list):
+        return None
+    return obj
+
+
+def validate_step(raw: object, commands: list[dict]) -> PlanStep:
+    """Check one JSON step against the command list; problems end up in ``error``."""
+    raw = raw if isinstance(raw, dict) else {}
+    cmd = raw.get("cmd")
+    action = str(raw.get("action", "")).strip()
+    why = str(raw.get("why", "")).strip()
+    if not isinstance(cmd, int) or isinstance(cmd, bool) or not 0 <= cmd < len(commands):
+        return PlanStep(-1, action, why, "?", -1, -1, 0, 0, f"no command [{cmd}]")
+    c = commands[cmd]
+    name = c.get("name") or f"id:{c.get('cardId', '?')}"
+    bit = _ACTION_BITS.get(action.lower(), 0)
+    error = ""
+    if not bit:
+        error = f"unknown action '{action}'"
+    elif not c.get("mask", 0) & bit:
+        error = f"{action} not available"
+        bit = 0
+    if bit:
+        action = ACTION_NAMES[bit]
+    return PlanStep(cmd, action, why, name, c.get("zone", -1), c.get("index", -1), c.get("uid", 0), bit, error)
+
+
+def validate_plan(raw: dict, commands_result: dict, revision: int) -> AdvicePlan:
+    commands = commands_result.get("commands", []) if isinstance(commands_result, dict) else []
+    steps = tuple(validate_step(s, commands) for s in raw.get("steps", [])[:MAX_STEPS])
+    note = str(raw.get("note", "") or "").strip()
+    return AdvicePlan(steps, note, revision, bool(commands_result.get("online", False)))
+
+
+def resolve_step(step: PlanStep, commands_result: dict | None) -> dict | None:
+    """The live command for *step* (matched by card uid and action), or None if it's gone."""
+    if not step.valid or not isinstance(commands_result, dict):
+        return None
+    for c in commands_result.get("commands", []):
+        if c.get("uid") == step.uid and c.get("mask", 0) & step.bit:
+            return c
+    return None
+
+
+def format_step(n: int, step: PlanStep) -> str:
+    line = f"{n}. {step.label}"
+    if step.why:
+        line += f" -- {step.why}"
+    if step.error:
+        line += f" ({step.error})"
+    return line
+
+
+def render_plan(plan: AdvicePlan) -> str:
+    lines = [format_step(i, s) for i, s in enumerate(plan.steps, 1)]
+    if plan.note:
+        lines.append(plan.note)
+    return "\n".join(lines)
+
+
+class StepStream:
+    """Pulls complete step objects out of a JSON reply while it is still streaming."""
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._pos: int | None = None   # where the next step starts, once "steps": [ was seen
+        self._decoder = json.JSONDecoder()
+        self._count = 0
+
+    def feed(self, chunk: str) -> list:
+        """Steps completed by *chunk*; none past ``MAX_STEPS``, which validate_plan() drops too."""
+        self.text += chunk
+        out = []
+        if self._count >= MAX_STEPS:
+            return out
+        if self._pos is None:
+            m = _STEPS_OPEN.search(self.text)
+            if not m:
+                return out
+            self._pos = m.end()
+        buf = self.text
+        while True:
+            i = self._pos
+            while i < len(buf) and buf[i] in " \t\r\n,":
+                i += 1
+            self._pos = i
+            if i >= len(buf) or buf[i] == "]":
+                return out
+            try:
+                obj, end = self._decoder.raw_decode(buf, i)
+            except ValueError:
+                return out
+            out.append(obj)
+            self._pos = end
+            self._count += 1
+            if self._count >= MAX_STEPS:
+                return out
@@ -0,0 +1,352 @@
+"""Board advice from a selectable backend, with caching and prefetch bookkeeping."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING
+
+from bot.advice_cache import AdviceCache
+from bot.advice_plan import AdvicePlan, StepStream, format_step, parse_plan, validate_plan, validate_step
+from bot.advisor_backend import AdviceRequest, AdvisorBackend
+from bot.advisor_metrics import AdviceRecord, AdvisorMetrics, now_ms
+from bot.advisor_scheduler import AdvisorScheduler, error_code
+from bot.gemini_advisor import GeminiBackend
+from bot.heuristic_advisor import HeuristicBackend
+from bot.prompt_builder import Prompt, PromptBuilder, RefExpander
+from config import ADVISOR_BACKEND, ADVISOR_STRUCTURED
+from utils import logger
+
+if TYPE_CHECKING:
+    from memory.card_catalog import CardCatalog
+    from memory.state_poller import StatePoller, StateSnapshot
+
+
+class Advisor:
+    """What the GUI, hotkeys and prefetcher talk to.
+
+    Holds every backend and routes requests to the selected one. For
+    remote backends it also builds the compact prompt, answers repeated
+    boards from the advice cache, sends requests through the scheduler
+    (rate limit, retries, hedging) and keeps track of in-flight requests so
+    a prefetch and an F4 press for the same board share one model call.
+    Every request leaves an ``AdviceRecord`` in ``metrics``.
+    """
+
+    def __init__(self, backend: str = ADVISOR_BACKEND, structured: bool = ADVISOR_STRUCTURED) -> None:
+        self.gemini = GeminiBackend()
+        self.local = HeuristicBackend()
+        self._backends: dict[str, AdvisorBackend] = {b.name: b for b in (self.gemini, self.local)}
+        self._backend = self._backends.get(backend, self.gemini)
+        self.scheduler = AdvisorScheduler()
+        self.structured = structured
+        self.prompts = PromptBuilder()
+        self._prompt_rev = -1
+        self._prompt: Prompt | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, threading.Event] = {}  # cache key -> set when its request ends
+        self.cache = AdviceCache()
+        self.metrics = AdvisorMetrics()
+        if self.cache.load():
+            logger.info(f"Advice cache: {len(self.cache)} entries")
+
+    # ── backend selection ──
+
+    @property
+    def backends(self) -> list[AdvisorBackend]:
+        return list(self._backends.values())
+
+    @property
+    def backend(self) -> AdvisorBackend:
+        return self._backend
+
+    def set_backend(self, name: str) -> bool:
+        backend = self._backends.get(name)
+        if backend is None:
+            return False
+        self._backend = backend
+        os.environ["ADVISOR_BACKEND"] = name
+        logger.info(f"Advisor backend: {backend.label}")
+        return True
+
+    @property
+    def ready(self) -> bool:
+        return self._backend.available
+
+    @property
+    def model(self) -> str:
+        return self._backend.model
+
+    # Gemini settings, kept here so callers don't reach into the backend
+
+    def set_api_key(self, key: str) -> bool:
+        ok = self.gemini.set_api_key(key)
+        if ok:
+            self.gemini.warm_models()
+        return ok
+
+    def set_model(self, model: str) -> None:
+        self.gemini.set_model(model)
+
+    def list_models(self) -> list[str]:
+        return self.gemini.list_models()
+
+    def cached_models(self) -> tuple[list[str], float]:
+        return self.gemini.cached_models()
+
+    def refresh_models(self) -> list[str]:
+        return self.gemini.refresh_models()
+
+    def warm_models(self) -> None:
+        self.gemini.warm_models()
+
+    # ── advice ──
+
+    def analyze_board_stream(
+        self,
+        poller: StatePoller,
+        cancel: threading.Event | None = None,
+        on_plan: Callable[[AdvicePlan], None] | None = None,
+        on_revision: Callable[[int], None] | None = None,
+    ) -> Iterator[str]:
+        """Yield advice text as the backend produces it.
+
+        Stops between chunks once *cancel* is set. Records time-to-first-token,
+        total latency and token usage for every request; backend errors are logged and
+        re-raised to the consumer. For remote backends a board seen before
+        is answered from the advice cache in a single chunk (after waiting
+        for a prefetch of that board if one is running); replies that finish
+        streaming are stored there.
+
+        With ``structured`` on, the backend's JSON is turned into one
+        numbered line per step as each step completes, and the validated
+        plan is handed to *on_plan* once the reply is complete.
+
+        *on_revision* gets the revision of the board snapshot the request
+        was built from, before anything is sent to the backend.
+        """
+        backend = self._backend
+        if not backend.available:
+            return
+        rec = self._record("ask", backend)
+        built = self._build_request(poller, backend, rec)
+        if not built:
+            return
+        request, key, revision = built
+        if on_revision is not None:
+            on_revision(revision)
+        chunks = self._stream(backend, request, key, cancel, rec)
+        if not request.structured:
+            yield from chunks
+            return
+
+        steps = StepStream()
+        commands = request.commands.get("commands", [])
+        shown = 0
+        for chunk in chunks:
+            for raw in steps.feed(chunk):
+                shown += 1
+                yield ("\n" if shown > 1 else "") + format_step(shown, validate_step(raw, commands))
+        if cancel is not None and cancel.is_set():
+            return
+        parsed = parse_plan(steps.text)
+        if parsed is None:
+            # the model ignored the format; show what it said instead
+            if steps.text.strip() and not shown:
+                yield steps.text
+            return
+        plan = validate_plan(parsed, request.commands, revision)
+        if plan.note:
+            yield ("\n" if shown else "") + plan.note
+        if on_plan is not None:
+            on_plan(plan)
+
+    def _stream(
+        self, backend: AdvisorBackend, request: AdviceRequest, key: str, cancel: threading.Event | None,
+        rec: AdviceRecord,
+    ) -> Iterator[str]:
+        """Raw backend chunks, through the cache and scheduler for remote backends."""
+        done = None
+        start = t0 = now_ms()
+
+        def attempt_started() -> None:
+            # time the reply from the attempt that produced it; the wait before it is queue_ms
+            nonlocal t0
+            t0 = now_ms()
+            rec.queue_ms = t0 - start
+
+        if backend.remote:
+            if not self._await_pending(key, cancel):
+                self._finish(rec, request, "cancelled")
+                return
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Advisor cache hit: {len(cached)} chars ({backend.model})")
+                rec.cache_hit = True
+                self._finish(rec, request, "done")
+                yield cached
+                return
+            done = self._claim(key)
+            chunks = self.scheduler.stream(backend, request, key, cancel, attempt_started)
+            if request.prompt is not None:
+                # replies go to the chat and the cache with card names, not prompt refs
+                chunks = RefExpander(request.prompt.refs, request.structured).stream(chunks)
+        else:
+            chunks = backend.stream(request, cancel)
+
+        ttft = None
+        chars = 0
+        parts: list[str] = []
+        outcome = "done"
+        failure = None
+        try:
+            for text in chunks:
+                if cancel is not None and cancel.is_set():
+                    outcome = "cancelled"
+                    break
+                if ttft is None:
+                    ttft = rec.ttft_ms = now_ms() - t0
+                chars += len(text)
+                parts.append(text)
+                yield text
+            if cancel is not None and cancel.is_set():
+                outcome = "cancelled"
+        except GeneratorExit:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            outcome, failure = "error", e
+            logger.error(f"Advisor stream failed ({backend.name}): {e}")
+            raise
+        finally:
+            if done is not None:
+                if outcome == "done" and parts:
+                    self.cache.put(key, "".join(parts).strip())
+                self._release(key, done)
+            if outcome == "done" and not parts:
+                outcome = "empty"
+            total = self._finish(rec, request, outcome, t0, exc=failure)
+            ttft_s = f"{ttft:.0f} ms" if ttft is not None else "-"
+            logger.info(f"Advisor {outcome}: ttft {ttft_s}, total {total:.0f} ms, {chars} chars ({backend.model})")
+
+    def prefetch(self, poller: StatePoller) -> bool:
+        """Compute advice for the current board into the cache; True if the model was called.
+
+        Only remote backends are prefetched. Skips boards already cached or
+        already being asked about, so it never duplicates a request the user
+        started.
+        """
+        backend = self._backend
+        if not backend.remote or not backend.available:
+            return False
+        rec = self._record("prefetch", backend)
+        built = self._build_request(poller, backend, rec)
+        if not built:
+            return False
+        request, key, _ = built
+        if key in self.cache or key in self._pending:
+            return False
+        done = self._claim(key)
+        start = t0 = now_ms()
+
+        def attempt_started() -> None:
+            nonlocal t0
+            t0 = now_ms()
+            rec.queue_ms = t0 - start
+
+        try:
+            text = self.scheduler.complete(backend, request, key, on_attempt=attempt_started)
+            if request.prompt is not None:
+                text = request.prompt.expand(text, request.structured)
+            self.cache.put(key, text)
+            total = self._finish(rec, request, "done" if text else "empty", t0)
+            logger.info(f"Advisor prefetch: {total:.0f} ms, {len(text)} chars ({backend.model})")
+        except Exception as e:
+            self._finish(rec, request, "error", t0, exc=e)
+            logger.warn(f"Advisor prefetch failed: {e}")
+        finally:
+            self._release(key, done)
+        return True
+
+    # ── internals ──
+
+    @staticmethod
+    def _record(kind: str, backend: AdvisorBackend) -> AdviceRecord:
+        return AdviceRecord(kind, backend.name, backend.model, ts=time.time())
+
+    def _finish(
+        self, rec: AdviceRecord, request: AdviceRequest, outcome: str,
+        t0: float | None = None, exc: BaseException | None = None,
+    ) -> float:
+        """Complete *rec* and add it to the metrics; returns the backend time in ms."""
+        total = now_ms() - t0 if t0 is not None else 0.0
+        rec.total_ms = total if t0 is not None else None
+        rec.outcome = outcome
+        rec.input_tokens = request.usage.get("input_tokens")
+        rec.output_tokens = request.usage.get("output_tokens")
+        if exc is not None:
+            code = error_code(exc)
+            rec.error = type(exc).__name__ + (f" {code}" if code else "")
+        self.metrics.record(rec)
+        return total
+
+    def _claim(self, key: str) -> threading.Event:
+        with self._lock:
+            done = self._pending[key] = threading.Event()
+        return done
+
+    def _release(self, key: str, done: threading.Event) -> None:
+        with self._lock:
+            if self._pending.get(key) is done:
+                del self._pending[key]
+        done.set()
+
+    def _await_pending(self, key: str, cancel: threading.Event | None) -> bool:
+        """Wait out a prefetch already running for *key*; False if cancelled meanwhile."""
+        pending = self._pending.get(key)
+        if pending is None:
+            return True
+        logger.debug("Advisor: waiting for prefetch of this board")
+        while not pending.wait(0.1):
+            if cancel is not None and cancel.is_set():
+                return False
+        return True
+
+    def _build_request(
+        self, poller: StatePoller, backend: AdvisorBackend, rec: AdviceRecord,
+    ) -> tuple[AdviceRequest, str, int] | None:
+        """Request for the current board, its advice-cache key and the board revision."""
+        t0 = now_ms()
+        snap = poller.latest(max_staleness=0.5)
+        rec.board_ms = now_ms() - t0
+        if not snap.duel_active or not snap.game_state:
+            return None
+        cards = poller.frida.cards
+        commands = snap.commands if isinstance(snap.commands, dict) else {}
+        # the prompt doubles as the cache key, so remote backends always build one
+        prompt = None
+        if backend.uses_prompt or backend.remote:
+            t0 = now_ms()
+            prompt = self._get_prompt(snap, cards)
+            rec.prompt_ms = now_ms() - t0
+            rec.prompt_tokens_est = prompt.tokens
+            logger.info(
+                f"Advisor prompt ~{prompt.tokens} tokens (budget {self.prompts.token_budget}, "
+                f"{prompt.glossary} cards, {prompt.clipped} clipped)"
+            )
+        request = AdviceRequest(
+            dict(snap.game_state), commands, cards, prompt if backend.uses_prompt else None, self.structured,
+        )
+        key = AdviceCache.fingerprint(prompt.key, backend.model, self.structured) if prompt else ""
+        return request, key, snap.revision
+
+    def _get_prompt(self, snap: StateSnapshot, cards: CardCatalog) -> Prompt:
+        with self._lock:
+            rev = snap.revision
+            if rev == self._prompt_rev:
+                return self._prompt
+            prompt = self.prompts.build(snap.game_state, snap.commands, cards)
+            self._prompt_rev, self._prompt = rev, prompt
+            return prompt
@@ -0,0 +1,52 @@
+"""What every advisor backend implements, and what it is given per request."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bot.prompt_builder import CardText, Prompt
+
+
+@dataclass(frozen=True)
+class AdviceRequest:
+    game_state: dict
+    commands: dict              # get_commands() result: phase, turnPlayer, myself, commands
+    cards: CardText
+    prompt: Prompt | None = None  # only built for backends with ``uses_prompt``
+    structured: bool = False      # reply as plan JSON (see bot.advice_plan)
+    # filled in by the backend from the reply's usage metadata: input_tokens, output_tokens
+    usage: dict = field(default_factory=dict, compare=False)
+
+
+class AdvisorBackend:
+    """One way of turning a board into advice.
+
+    ``stream()`` yields text chunks and should stop early once *cancel* is
+    set; ``complete()`` returns the whole reply. Backends with ``remote``
+    set are network-bound: their replies go through the advice cache, get
+    prefetched and are rate limited. ``uses_prompt`` asks the caller to
+    build a text prompt into the request.
+    """
+
+    name = ""
+    label = ""
+    remote = False
+    uses_prompt = False
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def model(self) -> str:
+        return self.name
+
+    def stream(self, request: AdviceRequest, cancel: threading.Event | None = None) -> Iterator[str]:
+        raise NotImplementedError
+
+    def complete(self, request: AdviceRequest) -> str:
+        return "".join(self.stream(request)).strip()
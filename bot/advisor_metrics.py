@@ -0,0 +1,102 @@
+"""Per-request advisor telemetry: timings, tokens, cache hits and errors."""
+
+from __future__ import annotations
+
+import csv
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+
+from config import ADVISOR_METRICS_KEEP, ADVISOR_PRICE_IN, ADVISOR_PRICE_OUT
+
+_TIMINGS = ("board_ms", "prompt_ms", "queue_ms", "ttft_ms", "total_ms")
+
+
+@dataclass
+class AdviceRecord:
+    kind: str                       # "ask" (streamed) or "prefetch"
+    backend: str
+    model: str = ""
+    ts: float = 0.0                 # epoch seconds at request start
+    board_ms: float | None = None   # waiting for a fresh snapshot
+    prompt_ms: float | None = None  # building the prompt (0 when reused for the same revision)
+    queue_ms: float | None = None   # rate-limit wait, backoff and failed attempts before the last attempt
+    ttft_ms: float | None = None    # start of the last attempt to the first chunk
+    total_ms: float | None = None   # start of the last attempt to the last chunk
+    prompt_tokens_est: int | None = None
+    input_tokens: int | None = None   # from the response's usage metadata
+    output_tokens: int | None = None
+    cache_hit: bool = False
+    outcome: str = ""               # done | cancelled | empty | error
+    error: str = ""                 # exception class (and HTTP code) when outcome is error
+
+
+def _pct(values: list[float], p: float) -> float | None:
+    if not values:
+        return None
+    s = sorted(values)
+    return round(s[min(len(s) - 1, int(len(s) * p / 100.0))], 1)
+
+
+class AdvisorMetrics:
+    """Ring buffer of the last ``keep`` advisor requests plus aggregates over it."""
+
+    def __init__(self, keep: int = ADVISOR_METRICS_KEEP) -> None:
+        self._records: deque[AdviceRecord] = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self.version = 0   # bumps on every record so views can skip redraws
+
+    def record(self, rec: AdviceRecord) -> None:
+        with self._lock:
+            self._records.append(rec)
+            self.version += 1
+
+    def records(self) -> list[AdviceRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> dict:
+        recs = self.records()
+        out: dict = {"requests": len(recs)}
+        if not recs:
+            return out
+        out["cache_hits"] = sum(r.cache_hit for r in recs)
+        out["errors"] = sum(r.outcome == "error" for r in recs)
+        out["cancelled"] = sum(r.outcome == "cancelled" for r in recs)
+        # latencies of replies that actually came from a model
+        live = [r for r in recs if not r.cache_hit and r.outcome == "done"]
+        for name in _TIMINGS:
+            values = [getattr(r, name) for r in (recs if name in ("board_ms", "prompt_ms") else live)]
+            values = [v for v in values if v is not None]
+            out[name] = {"p50": _pct(values, 50), "p95": _pct(values, 95), "p99": _pct(values, 99)}
+        out["input_tokens"] = sum(r.input_tokens or 0 for r in recs)
+        out["output_tokens"] = sum(r.output_tokens or 0 for r in recs)
+        if ADVISOR_PRICE_IN or ADVISOR_PRICE_OUT:
+            cost = out["input_tokens"] * ADVISOR_PRICE_IN + out["output_tokens"] * ADVISOR_PRICE_OUT
+            out["cost_usd"] = round(cost / 1e6, 4)
+        errors: dict[str, int] = {}
+        for r in recs:
+            if r.error:
+                errors[r.error] = errors.get(r.error, 0) + 1
+        out["error_classes"] = errors
+        return out
+
+    def export(self, path: str) -> int:
+        """Write every kept record to *path* (CSV if it ends in .csv, else JSONL); returns the count."""
+        recs = self.records()
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.lower().endswith(".csv"):
+                writer = csv.DictWriter(f, fieldnames=[fl.name for fl in fields(AdviceRecord)])
+                writer.writeheader()
+                for r in recs:
+                    writer.writerow(asdict(r))
+            else:
+                for r in recs:
+                    f.write(json.dumps(asdict(r), separators=(",", ":")) + "\n")
+        return len(recs)
+
+
+def now_ms() -> float:
+    return time.perf_counter() * 1000.0
@@ -0,0 +1,136 @@
+"""Background advisor requests at the moments F4 is most likely to be pressed."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from config import ADVISOR_PREFETCH_BUDGET, ADVISOR_PREFETCH_DEBOUNCE
+from utils import logger
+
+if TYPE_CHECKING:
+    from bot.advisor import Advisor
+    from memory.state_poller import StatePoller, StateSnapshot
+
+_MAIN1 = 2
+
+
+class AdvisorPrefetcher:
+    """Warms the advice cache so F4 is a lookup instead of a model round-trip.
+
+    Watches ``phase``/``turnPlayer`` in each snapshot's commands and queues a
+    prefetch at the start of my Main Phase 1 and whenever I get commands on
+    the rival's turn (a chain window). A queued prefetch only fires once the
+    board has held still for *debounce* seconds, each new snapshot pushes it
+    back, and at most *budget* model requests are spent per duel.
+    """
+
+    def __init__(
+        self,
+        advisor: Advisor,
+        poller: StatePoller,
+        budget: int = ADVISOR_PREFETCH_BUDGET,
+        debounce: float = ADVISOR_PREFETCH_DEBOUNCE,
+    ) -> None:
+        self.advisor = advisor
+        self.poller = poller
+        self.budget = budget
+        self.debounce = debounce
+        self._cond = threading.Condition()
+        self._due: float | None = None   # monotonic time the queued prefetch may run
+        self._reason = ""
+        self._window: tuple | None = None
+        self._in_duel = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._unsubscribe = None
+        self.spent = 0          # requests this duel
+        self.requests = 0       # requests this session
+        self.over_budget = 0    # windows skipped for lack of budget
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._unsubscribe = self.poller.subscribe(self._on_snapshot)
+        self._thread = threading.Thread(target=self._run, name="AdvisorPrefetch", daemon=True)
+        self._thread.start()
+        logger.info(f"Advisor prefetch on (budget {self.budget}/duel, debounce {self.debounce:.1f}s)")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "this_duel": self.spent, "over_budget": self.over_budget}
+
+    # ── poller thread ──
+
+    def _on_snapshot(self, snap: StateSnapshot) -> None:
+        with self._cond:
+            if snap.duel_active != self._in_duel:
+                self._in_duel = snap.duel_active
+                self.spent = 0
+                self._window = None
+                self._due = None
+            if not snap.duel_active:
+                return
+            window = self._window_of(snap)
+            if window is not None and window != self._window:
+                self._window = window
+                self._reason = window[0]
+                self._due = time.monotonic() + self.debounce
+                self._cond.notify()
+            elif self._due is not None:
+                # still churning: restart the quiet period
+                self._due = time.monotonic() + self.debounce
+
+    @staticmethod
+    def _window_of(snap: StateSnapshot) -> tuple | None:
+        cmd = snap.commands if isinstance(snap.commands, dict) else {}
+        my_turn = cmd.get("myself", 0) == cmd.get("turnPlayer", -1)
+        turn = (snap.game_state or {}).get("turnNum")
+        if my_turn and cmd.get("phase") == _MAIN1:
+            return ("main1", turn)
+        if not my_turn and cmd.get("commands"):
+            return ("chain", turn, snap.revision)
+        return None
+
+    # ── worker thread ──
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._stop.is_set():
+                    now = time.monotonic()
+                    if self._due is not None and now >= self._due:
+                        break
+                    self._cond.wait(None if self._due is None else self._due - now)
+                if self._stop.is_set():
+                    return
+                self._due = None
+                reason = self._reason
+                if self.spent >= self.budget:
+                    self.over_budget += 1
+                    if self.over_budget == 1 or self.over_budget % 10 == 0:
+                        logger.debug(f"Advisor prefetch: duel budget of {self.budget} spent, skipping {reason}")
+                    continue
+            if not self.advisor.ready:
+                continue
+            try:
+                called = self.advisor.prefetch(self.poller)
+            except Exception as exc:
+                logger.error(f"Advisor prefetch ({reason}) failed: {exc}")
+                called = True
+            if called:
+                with self._cond:
+                    self.spent += 1
+                    self.requests += 1
@@ -0,0 +1,367 @@
+"""Rate limiting, retries, hedging and supersession for remote advisor calls."""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+
+from bot.advisor_backend import AdviceRequest, AdvisorBackend
+from config import (
+    ADVISOR_BACKOFF, ADVISOR_BACKOFF_MAX, ADVISOR_BURST, ADVISOR_HEDGE_PERCENTILE,
+    ADVISOR_QUEUE_TIMEOUT, ADVISOR_RETRIES, ADVISOR_RPM, ADVISOR_TIMEOUT,
+)
+from utils import logger
+
+# free-tier requests/minute by model family, most specific first
+_MODEL_RPM = (("flash-lite", 15.0), ("flash", 10.0), ("pro", 5.0))
+_DEFAULT_RPM = 10.0
+
+_TRANSIENT_CODES = {408, 429, 500, 502, 503, 504}
+# transport errors from httpx/requests don't share a base class worth importing
+_TRANSIENT_NAMES = ("Timeout", "Connect", "RemoteProtocol", "ServerError")
+_RETRY_DELAY = re.compile(r"retry(?:Delay)?\D{0,12}?([\d.]+)\s*s", re.IGNORECASE)
+
+# TTFT samples kept for the hedge threshold; hedging waits for this many
+_TTFT_WINDOW = 100
+_HEDGE_MIN_SAMPLES = 10
+
+
+class AdvisorBusy(Exception):
+    """A request waited longer than the queue timeout for rate-limit tokens."""
+
+
+def rpm_for_model(model: str) -> float:
+    if ADVISOR_RPM > 0:
+        return ADVISOR_RPM
+    model = model.lower()
+    for family, rpm in _MODEL_RPM:
+        if family in model:
+            return rpm
+    return _DEFAULT_RPM
+
+
+def error_code(exc: BaseException) -> int | None:
+    for attr in ("code", "status_code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    code = error_code(exc)
+    if code is not None:
+        return code in _TRANSIENT_CODES
+    return any(n in type(exc).__name__ for n in _TRANSIENT_NAMES)
+
+
+class TokenBucket:
+    """Classic token bucket; ``take()`` never blocks, it says how long to wait."""
+
+    def __init__(self, rate_per_sec: float, capacity: float) -> None:
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self._tokens = capacity
+        self._stamp = time.monotonic()
+        self._hold_until = 0.0
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate_per_sec: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate_per_sec
+
+    def take(self) -> float:
+        """Take a token if one is available (returns 0), else seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._hold_until:
+                return self._hold_until - now
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+    def hold(self, seconds: float) -> None:
+        """Hand out nothing for *seconds* (the server told us to back off)."""
+        with self._lock:
+            self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+
+class _Attempt(threading.Thread):
+    """Runs one backend stream, pushing (attempt id, kind, payload) into a shared queue."""
+
+    def __init__(self, aid: int, backend: AdvisorBackend, request: AdviceRequest, out: queue.Queue) -> None:
+        super().__init__(name=f"advisor-attempt-{aid}", daemon=True)
+        self.aid = aid
+        self.stop = threading.Event()
+        self.started_at = time.perf_counter()
+        self._backend = backend
+        self._request = request
+        self._out = out
+
+    def run(self) -> None:
+        try:
+            for text in self._backend.stream(self._request, self.stop):
+                if self.stop.is_set():
+                    return
+                self._out.put((self.aid, "chunk", text))
+            self._out.put((self.aid, "end", None))
+        except Exception as exc:
+            self._out.put((self.aid, "error", exc))
+
+
+class AdvisorScheduler:
+    """Puts every remote advisor request through one policy.
+
+    - a token bucket sized to the model's requests-per-minute quota; callers
+      queue for tokens (up to ``queue_timeout``) instead of being rejected,
+      and a 429 holds the bucket for the server's retry delay;
+    - transient failures (429/5xx, timeouts, dropped connections) are retried
+      with full-jitter exponential backoff, but only before the first chunk
+      has been handed out, so a retry never repeats text;
+    - once enough first-chunk latencies are known, a request still silent at
+      the ``hedge_percentile`` gets a second copy (if a token is free) and
+      whichever speaks first wins;
+    - a request still waiting (for tokens or a retry) when a request for a
+      different board arrives is dropped as superseded.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: float | None = None,
+        burst: float = ADVISOR_BURST,
+        retries: int = ADVISOR_RETRIES,
+        backoff: float = ADVISOR_BACKOFF,
+        backoff_max: float = ADVISOR_BACKOFF_MAX,
+        timeout: float = ADVISOR_TIMEOUT,
+        queue_timeout: float = ADVISOR_QUEUE_TIMEOUT,
+        hedge_percentile: float = ADVISOR_HEDGE_PERCENTILE,
+    ) -> None:
+        # rpm pins the quota; by default it follows the model of each request
+        self._pinned = rpm is not None
+        self.bucket = TokenBucket((rpm or _DEFAULT_RPM) / 60.0, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.hedge_percentile = hedge_percentile
+        self._model = ""
+        self._ttft: deque[float] = deque(maxlen=_TTFT_WINDOW)
+        self._lock = threading.Lock()
+        self._tickets = itertools.count(1)
+        self._latest = (0, "")   # (ticket, key) of the newest request
+        self.counters = {
+            "requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0,
+            "superseded": 0, "throttled": 0, "errors": 0,
+        }
+
+    # ── public ──
+
+    def stream(
+        self,
+        backend: AdvisorBackend,
+        request: AdviceRequest,
+        key: str = "",
+        cancel: threading.Event | None = None,
+        on_attempt: Callable[[], None] | None = None,
+    ) -> Iterator[str]:
+        """Yield the reply's chunks under the scheduling policy.
+
+        Yields nothing if *cancel* is set or the request is superseded while
+        waiting; raises ``AdvisorBusy`` if no token comes within the queue
+        timeout, and the backend's error once retries are exhausted.
+        *on_attempt* is called each time a call to the backend starts, after
+        the rate-limit wait and any backoff.
+        """
+        self._configure(backend.model)
+        with self._lock:
+            ticket = next(self._tickets)
+            self._latest = (ticket, key)
+            self.counters["requests"] += 1
+        attempt = 0
+        while True:
+            if not self._wait_for_token(ticket, key, cancel):
+                return
+            started = False
+            if on_attempt is not None:
+                on_attempt()
+            try:
+                for text in self._race(backend, request, cancel):
+                    started = True
+                    yield text
+                return
+            except Exception as exc:
+                if started or attempt >= self.retries or not is_transient(exc):
+                    self.counters["errors"] += 1
+                    raise
+                attempt += 1
+                self.counters["retries"] += 1
+                delay = self._backoff_delay(attempt, exc)
+                logger.warn(f"Advisor request failed ({exc}); retry {attempt}/{self.retries} in {delay:.1f}s")
+                if not self._pause(delay, ticket, key, cancel):
+                    return
+
+    def complete(self, backend: AdvisorBackend, request: AdviceRequest, key: str = "",
+                 cancel: threading.Event | None = None, on_attempt: Callable[[], None] | None = None) -> str:
+        return "".join(self.stream(backend, request, key, cancel, on_attempt)).strip()
+
+    def hedge_after(self) -> float | None:
+        """Seconds of silence after which a request is hedged, or None when hedging is off."""
+        if self.hedge_percentile <= 0:
+            return None
+        with self._lock:
+            if len(self._ttft) < _HEDGE_MIN_SAMPLES:
+                return None
+            s = sorted(self._ttft)
+        return s[min(len(s) - 1, int(len(s) * self.hedge_percentile / 100.0))]
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = sorted(self._ttft)
+        out = dict(self.counters)
+        out["rpm"] = round(self.bucket.rate * 60.0, 1)
+        if s:
+            out["ttft_p50_ms"] = round(s[len(s) // 2] * 1000.0)
+            out["ttft_p95_ms"] = round(s[min(len(s) - 1, int(len(s) * 0.95))] * 1000.0)
+        return out
+
+    # ── internals ──
+
+    def _configure(self, model: str) -> None:
+        if not self._pinned and model != self._model:
+            self._model = model
+            self.bucket.set_rate(rpm_for_model(model) / 60.0)
+
+    def _superseded(self, ticket: int, key: str) -> bool:
+        latest_ticket, latest_key = self._latest
+        if latest_ticket > ticket and latest_key != key:
+            self.counters["superseded"] += 1
+            logger.debug(f"Advisor request {ticket} superseded by {latest_ticket}")
+            return True
+        return False
+
+    def _wait_for_token(self, ticket: int, key: str, cancel: threading.Event | None) -> bool:
+        deadline = time.monotonic() + self.queue_timeout
+        throttled = False
+        while True:
+            if cancel is not None and cancel.is_set():
+                return False
+            if self._superseded(ticket, key):
+                return False
+            wait = self.bucket.take()
+            if wait <= 0:
+                return True
+            if not throttled:
+                throttled = True
+                self.counters["throttled"] += 1
+                logger.debug(f"Advisor rate limit: waiting {wait:.1f}s for quota")
+            if time.monotonic() + wait > deadline:
+                raise AdvisorBusy(f"rate limit: no quota within {self.queue_timeout:.0f}s")
+            self._sleep(min(wait, 0.25), cancel)
+
+    def _pause(self, seconds: float, ticket: int, key: str, cancel: threading.Event | None) -> bool:
+        end = time.monotonic() + seconds
+        while (left := end - time.monotonic()) > 0:
+            if cancel is not None and cancel.is_set():
+                return False
+            if self._superseded(ticket, key):
+                return False
+            self._sleep(min(left, 0.25), cancel)
+        return True
+
+    @staticmethod
+    def _sleep(seconds: float, cancel: threading.Event | None) -> None:
+        if cancel is not None:
+            cancel.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _backoff_delay(self, attempt: int, exc: BaseException) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * 2 ** (attempt - 1)))
+        if error_code(exc) == 429:
+            m = _RETRY_DELAY.search(str(exc))
+            hinted = float(m.group(1)) if m else self.backoff * 2 ** attempt
+            self.bucket.hold(hinted)
+            delay = max(delay, hinted)
+        return delay
+
+    def _race(self, backend: AdvisorBackend, request: AdviceRequest, cancel: threading.Event | None) -> Iterator[str]:
+        """One attempt, plus a hedged copy if the first stays silent past the threshold."""
+        out: queue.Queue = queue.Queue()
+        attempts = {0: _Attempt(0, backend, request, out)}
+        attempts[0].start()
+        hedge_at = self.hedge_after()
+        t0 = time.perf_counter()
+        winner = None
+        failed: dict[int, Exception] = {}
+        try:
+            while winner is None:
+                now = time.perf_counter()
+                if now - t0 > self.timeout:
+                    raise TimeoutError(f"no reply within {self.timeout:.0f}s")
+                wait = 0.05
+                if hedge_at is not None and len(attempts) == 1:
+                    wait = max(0.0, min(wait, t0 + hedge_at - now))
+                try:
+                    aid, kind, payload = out.get(timeout=wait)
+                except queue.Empty:
+                    if cancel is not None and cancel.is_set():
+                        return
+                    if (hedge_at is not None and len(attempts) == 1
+                            and time.perf_counter() - t0 >= hedge_at and self.bucket.take() <= 0):
+                        self.counters["hedges"] += 1
+                        logger.debug(f"Advisor: no reply after {hedge_at * 1000:.0f} ms, hedging")
+                        attempts[1] = _Attempt(1, backend, request, out)
+                        attempts[1].start()
+                    continue
+                if kind == "error":
+                    failed[aid] = payload
+                    if len(failed) == len(attempts):
+                        raise payload
+                    continue
+                winner = aid
+                with self._lock:
+                    self._ttft.append(time.perf_counter() - attempts[aid].started_at)
+                if aid:
+                    self.counters["hedge_wins"] += 1
+                for other in attempts.values():
+                    if other.aid != aid:
+                        other.stop.set()
+                if kind == "end":
+                    return
+                yield payload
+
+            while True:
+                if cancel is not None and cancel.is_set():
+                    return
+                try:
+                    aid, kind, payload = out.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if aid != winner:
+                    continue
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise payload
+                yield payload
+        finally:
+            for a in attempts.values():
+                a.stop.set()
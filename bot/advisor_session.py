@@ -0,0 +1,113 @@
+"""Runs streaming advisor requests on one long-lived worker thread."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from utils import logger
+
+if TYPE_CHECKING:
+    from bot.advice_plan import AdvicePlan
+    from bot.advisor import Advisor
+    from memory.state_poller import StatePoller, StateSnapshot
+
+# on_token(request_id, text)
+TokenCallback = Callable[[int, str], None]
+# on_done(request_id, status, error) with status "done" | "cancelled" | "empty" | "error"
+DoneCallback = Callable[[int, str, str], None]
+# on_plan(request_id, plan) once a structured reply has been validated
+PlanCallback = Callable[[int, "AdvicePlan"], None]
+
+
+class AdvisorSession:
+    """One advisor request at a time, cancellable.
+
+    ``ask()`` cancels whatever is in flight and queues a new streaming
+    request on a single-worker executor. A board change (a snapshot revision
+    newer than the one the request was built from) also cancels the current
+    request, since its advice is stale.
+    Cancellation is checked between streamed chunks, so a request blocked
+    waiting for its first token finishes that wait before the next starts.
+    """
+
+    def __init__(self, advisor: Advisor, poller: StatePoller, cancel_on_board_change: bool = True) -> None:
+        self.advisor = advisor
+        self.poller = poller
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="advisor")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # (id, cancel, revision of the board the request was built from, None until it is)
+        self._current: tuple[int, threading.Event, int | None] | None = None
+        self._unsubscribe = poller.subscribe(self._on_snapshot) if cancel_on_board_change else None
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None
+
+    def ask(self, on_token: TokenCallback, on_done: DoneCallback, on_plan: PlanCallback | None = None) -> int:
+        """Start a new request (cancelling any current one); returns its id."""
+        rid = next(self._ids)
+        cancel = threading.Event()
+        with self._lock:
+            if self._current:
+                self._current[1].set()
+            self._current = (rid, cancel, None)
+        self._pool.submit(self._run, rid, cancel, on_token, on_done, on_plan)
+        return rid
+
+    def cancel(self) -> bool:
+        with self._lock:
+            if not self._current:
+                return False
+            self._current[1].set()
+            return True
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._unsubscribe:
+            self._unsubscribe()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _on_snapshot(self, snap: StateSnapshot) -> None:
+        with self._lock:
+            # until the request has read the board there is nothing stale to cancel
+            if self._current and self._current[2] is not None and snap.revision > self._current[2]:
+                logger.debug(f"Advisor request {self._current[0]}: board changed, cancelling")
+                self._current[1].set()
+
+    def _built_from(self, rid: int, revision: int) -> None:
+        with self._lock:
+            if self._current and self._current[0] == rid:
+                self._current = (rid, self._current[1], revision)
+
+    def _run(
+        self, rid: int, cancel: threading.Event, on_token: TokenCallback, on_done: DoneCallback,
+        on_plan: PlanCallback | None,
+    ) -> None:
+        status, error = "done", ""
+        got_text = False
+        try:
+            if cancel.is_set():
+                status = "cancelled"
+                return
+            plan_cb = (lambda plan: on_plan(rid, plan)) if on_plan else None
+            stream = self.advisor.analyze_board_stream(
+                self.poller, cancel, plan_cb, on_revision=lambda rev: self._built_from(rid, rev))
+            for text in stream:
+                got_text = True
+                on_token(rid, text)
+            if cancel.is_set():
+                status = "cancelled"
+            elif not got_text:
+                status = "empty"
+        except Exception as exc:
+            status, error = "error", str(exc)
+        finally:
+            with self._lock:
+                if self._current and self._current[0] == rid:
+                    self._current = None
+            on_done(rid, status, error)
@@ -1,40 +1,65 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Iterator
 
-from config import GEMINI_API_KEY, GEMINI_MODEL
-from utils import logger
-
-if TYPE_CHECKING:
-    from memory.frida_il2cpp import FridaIL2CPP
-
-ACTION_NAMES = {0x08: "Activate", 0x10: "Summon", 0x40: "SetMonster", 0x80: "SetSpell"}
-PHASE_NAMES = {0: "Draw", 1: "Standby", 2: "Main1", 3: "Battle", 4: "Main2", 5: "End"}
+from bot.advice_plan import PLAN_INSTRUCTIONS, PLAN_SCHEMA
+from bot.advisor_backend import AdviceRequest, AdvisorBackend
+from config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_MODELS_PATH, GEMINI_MODELS_TTL
+from utils import logger, startup
 
 ADVISOR_PROMPT = """\
 Yu-Gi-Oh! Master Duel coach. Give quick tactical advice.
+The board refers to cards as c1, c2...; "Cards:" lists their names and effects.
+Always call cards by their names in your answer, never by c1, c2...
 Be VERY brief (2-3 lines). Just numbered steps.
-Example: "1. Summon X 2. Activate Y on Z 3. Battle"
+Example: "1. Summon <card name> 2. Activate <card name> on <card name> 3. Battle"
 If opponent's turn: what to negate/chain.
 """
 
+ADVISOR_PLAN_PROMPT = """\
+Yu-Gi-Oh! Master Duel coach. Give quick tactical advice as a plan of commands.
+The board refers to cards as c1, c2...; "Cards:" lists their names and effects.
+Always call cards by their names in your answer, never by c1, c2...
+If opponent's turn: which listed command to chain, if any.
+""" + PLAN_INSTRUCTIONS
+
+
+class GeminiBackend(AdvisorBackend):
 
-class GeminiAdvisor:
+    name = "gemini"
+    label = "Gemini (online)"
+    remote = True
+    uses_prompt = True
 
     def __init__(self) -> None:
+        # google.genai pulls in httpx, pydantic and google.auth; it's only
+        # imported when the client is first needed (see _ensure_client)
         self._client = None
         self._types = None
+        self._key = ""
+        self._client_failed = False
+        self._client_lock = threading.Lock()
         self._model = GEMINI_MODEL
-        self._last_call = 0.0
-        self._min_interval = 2.0
+        self._key_id = ""
+        self._models: list[str] = []
+        self._models_at = 0.0
+        self._models_lock = threading.Lock()
+        self._warming: threading.Thread | None = None
         self._init_client()
 
     @property
     def has_client(self) -> bool:
-        return self._client is not None
+        """A key is configured and the client hasn't failed to load."""
+        return bool(self._key) and not self._client_failed
+
+    @property
+    def available(self) -> bool:
+        return self.has_client
 
     @property
     def model(self) -> str:
@@ -42,8 +67,6 @@ class GeminiAdvisor:
 
     def set_api_key(self, key: str) -> bool:
         os.environ["GEMINI_API_KEY"] = key
-        self._client = None
-        self._types = None
         self._init_client(key or None)
         return self.has_client
 
@@ -52,147 +75,170 @@ class GeminiAdvisor:
         os.environ["GEMINI_MODEL"] = model
         logger.info(f"Gemini model set to: {model}")
 
+    # ── model catalog ──
+
+    def cached_models(self) -> tuple[list[str], float]:
+        """(models, fetched-at epoch) from memory or the disk cache, without touching the network.
+
+        Stale entries are still returned; an entry saved under another API key is not.
+        """
+        with self._models_lock:
+            if self._models:
+                return list(self._models), self._models_at
+        try:
+            with open(GEMINI_MODELS_PATH, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return [], 0.0
+        if data.get("version") != 1 or data.get("key") != self._key_id:
+            return [], 0.0
+        with self._models_lock:
+            self._models, self._models_at = list(data.get("models", [])), float(data.get("fetched", 0.0))
+            return list(self._models), self._models_at
+
     def list_models(self) -> list[str]:
-        if not self._client:
+        """Cached model list if still fresh, otherwise fetched."""
+        models, fetched = self.cached_models()
+        if models and time.time() - fetched < GEMINI_MODELS_TTL:
+            return models
+        return self.refresh_models()
+
+    def refresh_models(self) -> list[str]:
+        """Walk ``models.list()`` (blocking) and update the cache; [] on failure."""
+        client = self._ensure_client()
+        if not client:
             return []
         try:
             models = []
-            for m in self._client.models.list():
+            for m in client.models.list():
                 if any(a == "generateContent" for a in (m.supported_actions or [])):
                     name = m.name
                     if name.startswith("models/"):
                         name = name[7:]
                     models.append(name)
-            return sorted(models)
+            models.sort()
         except Exception as e:
             logger.error(f"Failed to list models: {e}")
             return []
+        now = time.time()
+        with self._models_lock:
+            self._models, self._models_at = models, now
+        tmp = GEMINI_MODELS_PATH + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "key": self._key_id, "fetched": now, "models": models}, f)
+            os.replace(tmp, GEMINI_MODELS_PATH)
+        except OSError as exc:
+            logger.warn(f"Model list cache not saved: {exc}")
+        return models
+
+    def warm_models(self) -> None:
+        """Load the client on a background thread, refreshing the model list if it is missing or stale."""
+        if not self.has_client or (self._warming and self._warming.is_alive()):
+            return
+        self._warming = threading.Thread(target=self._warm, name="gemini-warm", daemon=True)
+        self._warming.start()
+
+    def _warm(self) -> None:
+        self._ensure_client()
+        models, fetched = self.cached_models()
+        if not models or time.time() - fetched >= GEMINI_MODELS_TTL:
+            self.refresh_models()
 
     def _init_client(self, api_key: str | None = None) -> None:
         key = api_key if api_key is not None else GEMINI_API_KEY
+        key_id = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12] if key else ""
+        if key_id != self._key_id:
+            with self._models_lock:
+                self._key_id, self._models, self._models_at = key_id, [], 0.0
+        with self._client_lock:
+            self._key, self._client, self._types, self._client_failed = key or "", None, None, False
         if not key:
             logger.warn("Gemini: no API key configured (set GEMINI_API_KEY in .env)")
             return
-        try:
-            from google import genai
-            from google.genai import types
-            self._client = genai.Client(api_key=key)
-            self._types = types
-            logger.ok("Gemini advisor ready")
-        except Exception as e:
-            logger.error(f"Gemini init failed: {e}")
-
-    def analyze_board(self, frida: FridaIL2CPP) -> str | None:
-        if not self._client or not self._types:
-            return None
-
-        now = time.time()
-        if now - self._last_call < self._min_interval:
-            return "Please wait a moment before asking again."
-
-        board = self._get_board_state(frida)
-        if not board:
-            return None
-
-        cmd_result = frida.get_commands()
-        commands = cmd_result.get("commands", []) if isinstance(cmd_result, dict) else []
-        cmd_list = self._format_commands(commands) if commands else "  (none)"
-
-        phase = cmd_result.get("phase", -1) if isinstance(cmd_result, dict) else -1
-        myself = cmd_result.get("myself", 0) if isinstance(cmd_result, dict) else 0
-        turn_player = cmd_result.get("turnPlayer", -1) if isinstance(cmd_result, dict) else -1
-        my_turn = (myself == turn_player)
-        phase_name = PHASE_NAMES.get(phase, str(phase))
-
-        prompt = (
-            f"{json.dumps(board, separators=(',', ':'))}\n"
-            f"Phase:{phase_name} MyTurn:{my_turn}\n"
-            f"Commands:\n{cmd_list}\n"
-            "Quick advice?"
+        logger.ok("Gemini advisor ready")
+
+    def _ensure_client(self):
+        """The genai client, created on first use; None without a key or if the SDK fails to load."""
+        client = self._client
+        if client is not None:
+            return client
+        with self._client_lock:
+            if self._client is None and self._key and not self._client_failed:
+                try:
+                    with startup.timed("google.genai client"):
+                        from google import genai
+                        from google.genai import types
+                        self._types = types
+                        self._client = genai.Client(api_key=self._key)
+                except Exception as e:
+                    self._client_failed = True
+                    logger.error(f"Gemini init failed: {e}")
+            return self._client
+
+    def _require_client(self):
+        client = self._ensure_client()
+        if client is None:
+            raise RuntimeError("Gemini client not available")
+        return client
+
+    def complete(self, request: AdviceRequest) -> str:
+        resp = self._require_client().models.generate_content(
+            model=self._model,
+            contents=request.prompt.text,
+            config=self._gen_config(request.structured),
         )
+        _store_usage(request, resp)
+        return (resp.text or "").strip()
 
-        self._last_call = time.time()
+    def stream(self, request: AdviceRequest, cancel: threading.Event | None = None) -> Iterator[str]:
+        """Yield text as Gemini streams it; closes the HTTP stream when stopped early."""
+        stream = None
         try:
-            resp = self._client.models.generate_content(
+            stream = self._require_client().models.generate_content_stream(
                 model=self._model,
-                contents=prompt,
-                config=self._types.GenerateContentConfig(
-                    system_instruction=ADVISOR_PROMPT,
-                    temperature=0.3,
-                    max_output_tokens=512,
-                    thinking_config=self._types.ThinkingConfig(thinking_budget=0),
-                ),
+                contents=request.prompt.text,
+                config=self._gen_config(request.structured),
             )
-            return resp.text.strip()
-        except Exception as e:
-            logger.error(f"Gemini advisor query failed: {e}")
-            return None
-
-    def _get_board_state(self, frida: FridaIL2CPP) -> dict | None:
-        gs = frida.get_game_state()
-        if not gs:
-            return None
-
-        def card_detail(cards: list) -> list[dict]:
-            result = []
-            for c in cards:
-                name = c.get("name") or f"id:{c.get('cardId', '?')}"
-                entry = {"name": name}
-                desc = c.get("desc")
-                if desc:
-                    entry["effect"] = desc
-                result.append(entry)
-            return result
-
-        def names(cards: list) -> list[str]:
-            return [c.get("name") or f"id:{c.get('cardId', '?')}" for c in cards]
-
-        def field_summary(field: dict) -> list[dict]:
-            return card_detail(
-                field.get("monsters", [])
-                + field.get("spells", [])
-                + field.get("extraMonsters", [])
+            for chunk in stream:
+                if cancel is not None and cancel.is_set():
+                    return
+                # only the last chunk carries the final counts, but each one has running totals
+                _store_usage(request, chunk)
+                text = chunk.text or ""
+                if text:
+                    yield text
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    def _gen_config(self, structured: bool = False):
+        if structured:
+            return self._types.GenerateContentConfig(
+                system_instruction=ADVISOR_PLAN_PROMPT,
+                temperature=0.3,
+                max_output_tokens=512,
+                response_mime_type="application/json",
+                response_schema=PLAN_SCHEMA,
+                thinking_config=self._types.ThinkingConfig(thinking_budget=0),
             )
+        return self._types.GenerateContentConfig(
+            system_instruction=ADVISOR_PROMPT,
+            temperature=0.3,
+            max_output_tokens=512,
+            thinking_config=self._types.ThinkingConfig(thinking_budget=0),
+        )
 
-        return {
-            "myLP": gs.get("myLP", "?"),
-            "rivalLP": gs.get("rivalLP", "?"),
-            "myHand": card_detail(gs.get("myHand", [])),
-            "myField": field_summary(gs.get("myField", {})),
-            "rivalField": field_summary(gs.get("rivalField", {})),
-            "myGY": names(gs.get("myGY", [])),
-            "rivalGY": names(gs.get("rivalGY", [])),
-            "myBanished": names(gs.get("myBanished", [])),
-            "rivalBanished": names(gs.get("rivalBanished", [])),
-            "myDeckCount": gs.get("myDeckCount", "?"),
-            "myExtraDeckCount": gs.get("myExtraDeckCount", "?"),
-            "rivalDeckCount": gs.get("rivalDeckCount", "?"),
-            "turnNum": gs.get("turnNum", "?"),
-        }
-
-    def _format_commands(self, commands: list[dict]) -> str:
-        lines = []
-        for i, cmd in enumerate(commands):
-            name = cmd.get("name") or f"Unknown(id={cmd.get('cardId', '?')})"
-            actions = []
-            mask = cmd["mask"]
-            for bit, label in ACTION_NAMES.items():
-                if mask & bit:
-                    actions.append(label)
-            zone_label = self._zone_label(cmd["zone"])
-            lines.append(
-                f"  [{i}] {name} | zone={zone_label} | actions={','.join(actions)}"
-            )
-        return "\n".join(lines) if lines else "  (none)"
-
-    @staticmethod
-    def _zone_label(zone: int) -> str:
-        if zone == 13:
-            return "Hand"
-        if 1 <= zone <= 5:
-            return f"Monster{zone}"
-        if 6 <= zone <= 10:
-            return f"Spell{zone - 5}"
-        if zone in (11, 12):
-            return f"ExtraMonster{zone - 10}"
-        return str(zone)
+
+def _store_usage(request: AdviceRequest, resp) -> None:
+    meta = getattr(resp, "usage_metadata", None)
+    if meta is None:
+        return
+    if meta.prompt_token_count is not None:
+        request.usage["input_tokens"] = meta.prompt_token_count
+    if meta.candidates_token_count is not None:
+        request.usage["output_tokens"] = meta.candidates_token_count
@@ -0,0 +1,99 @@
+"""Offline advisor: ranks the legal commands with fixed rules, no network."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator
+
+from bot.advisor_backend import AdviceRequest, AdvisorBackend
+from bot.prompt_builder import ACTION_NAMES, zone_label
+
+_HAND = 13
+_MAIN1, _BATTLE, _MAIN2 = 2, 3, 4
+
+# score per action bit on my turn; field effects first, then the normal
+# summon, then hand effects, with sets last so they don't telegraph plays
+_MY_TURN = {0x08: 40, 0x10: 35, 0x80: 15, 0x40: 10}
+# on the rival's turn only activations matter; hand traps are the usual answer
+_RIVAL_TURN = {0x08: 40}
+_STEPS = 3
+
+
+class HeuristicBackend(AdvisorBackend):
+    """Ranks ``get_commands()`` entries by action bit, zone and phase.
+
+    Runs in microseconds and needs neither a key nor a connection, so it is
+    the fallback when Gemini is unavailable and a baseline to measure it
+    against. It knows nothing about card text: the advice is which legal
+    action to take first, not why.
+    """
+
+    name = "local"
+    label = "Local heuristic (offline)"
+
+    @property
+    def model(self) -> str:
+        return "local heuristic"
+
+    def stream(self, request: AdviceRequest, cancel: threading.Event | None = None) -> Iterator[str]:
+        yield self.complete(request)
+
+    def complete(self, request: AdviceRequest) -> str:
+        cmd = request.commands or {}
+        phase = cmd.get("phase", -1)
+        my_turn = cmd.get("myself", 0) == cmd.get("turnPlayer", -1)
+        ranked = self.rank(cmd.get("commands", []), phase, my_turn)
+        battle = my_turn and phase == _MAIN1 and (
+            any(r[3] == 0x10 for r in ranked[:_STEPS]) or self._has_attackers(request.game_state)
+        )
+        if request.structured:
+            steps = [{"cmd": i, "action": ACTION_NAMES[bit], "why": ""} for _, i, _, bit in ranked[:_STEPS]]
+            note = "Then battle." if battle else ("" if steps else "Nothing worth doing -- pass.")
+            return json.dumps({"steps": steps, "note": note})
+
+        steps = []
+        for score, _, c, bit in ranked[:_STEPS]:
+            name = c.get("name") or request.cards.name(c.get("cardId", 0)) or f"id:{c.get('cardId', '?')}"
+            steps.append(f"{ACTION_NAMES[bit]} {name} ({zone_label(c.get('zone', -1))})")
+        if battle:
+            steps.append("Battle")
+        if not steps:
+            return "Nothing worth chaining -- pass." if not my_turn else "No plays -- end turn."
+        return "\n".join(f"{i}. {s}" for i, s in enumerate(steps, 1))
+
+    @staticmethod
+    def rank(commands: list[dict], phase: int, my_turn: bool) -> list[tuple[int, int, dict, int]]:
+        """(score, index, command, best action bit), best first; unscored commands are dropped."""
+        table = _MY_TURN if my_turn else _RIVAL_TURN
+        ranked = []
+        for i, c in enumerate(commands):
+            mask = c.get("mask", 0)
+            zone = c.get("zone", -1)
+            best, best_bit = 0, 0
+            for bit, base in table.items():
+                if not mask & bit:
+                    continue
+                score = base
+                if bit == 0x08:
+                    if not my_turn and zone == _HAND:
+                        score += 15
+                    elif my_turn and zone != _HAND:
+                        score += 10
+                    if my_turn and phase == _BATTLE:
+                        score -= 20
+                elif phase == _MAIN2 and bit in (0x40, 0x80):
+                    score += 20   # set backrow after combat
+                elif phase == _BATTLE:
+                    score = 0     # no summons or sets in battle
+                if score > best:
+                    best, best_bit = score, bit
+            if best_bit:
+                ranked.append((best, i, c, best_bit))
+        ranked.sort(key=lambda r: (-r[0], r[1]))
+        return ranked
+
+    @staticmethod
+    def _has_attackers(gs: dict) -> bool:
+        field = gs.get("myField", {})
+        return bool(field.get("monsters") or field.get("extraMonsters"))
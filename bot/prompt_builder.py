@@ -0,0 +1,245 @@
+"""Compact advisor prompts: short card refs, a deduped glossary, a token budget."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from config import ADVISOR_PROMPT_TOKENS
+
+ACTION_NAMES = {0x08: "Activate", 0x10: "Summon", 0x40: "SetMonster", 0x80: "SetSpell"}
+PHASE_NAMES = {0: "Draw", 1: "Standby", 2: "Main1", 3: "Battle", 4: "Main2", 5: "End"}
+
+# rough English/Gemini ratio; good enough for budgeting, not billing
+_CHARS_PER_TOKEN = 4
+# below this many chars a clipped effect is more noise than help
+_MIN_CLIP = 60
+
+_WS = re.compile(r"\s+")
+_REF = re.compile(r"\b[cC](\d+)\b")
+# a chunk ending in what may be the start of a ref, e.g. "Summon c" or "c1"
+_REF_TAIL = re.compile(r"(?<!\w)[cC]\d*$")
+
+
+class CardText(Protocol):
+    def name(self, card_id: int) -> str | None: ...
+    def desc(self, card_id: int) -> str | None: ...
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def zone_label(zone: int) -> str:
+    if zone == 13:
+        return "Hand"
+    if 1 <= zone <= 5:
+        return f"Monster{zone}"
+    if 6 <= zone <= 10:
+        return f"Spell{zone - 5}"
+    if zone in (11, 12):
+        return f"ExtraMonster{zone - 10}"
+    return str(zone)
+
+
+def _clip(text: str, limit: int) -> str:
+    """Cut *text* to at most *limit* chars, preferring a sentence, then a word boundary."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    end = cut.rfind(". ")
+    if end >= limit // 2:
+        return cut[:end + 1] + "…"
+    space = cut.rfind(" ")
+    if space > 0:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:") + "…"
+
+
+@dataclass(frozen=True)
+class Prompt:
+    text: str
+    tokens: int        # estimate, see estimate_tokens()
+    key: dict          # id-only view of the board for the advice cache
+    glossary: int      # cards listed in the glossary
+    clipped: int       # of those, how many had effect text shortened or dropped
+    refs: dict[str, str] = field(default_factory=dict, compare=False)  # "c1" -> card name
+
+    def expand(self, text: str, json_strings: bool = False) -> str:
+        """*text* with any card refs the model echoed replaced by card names."""
+        return RefExpander(self.refs, json_strings).expand(text)
+
+
+class RefExpander:
+    """Replaces ``cN`` refs with card names in text that arrives in chunks.
+
+    A chunk that ends in what could be the start of a ref is held back
+    until the next one, so a ref split across chunks is still replaced.
+    With *json_strings* the names are escaped for use inside a JSON string.
+    """
+
+    def __init__(self, refs: dict[str, str], json_strings: bool = False) -> None:
+        self._names = {r: json.dumps(n, ensure_ascii=False)[1:-1] if json_strings else n for r, n in refs.items()}
+        self._held = ""
+
+    def expand(self, text: str) -> str:
+        if not self._names:
+            return text
+        return _REF.sub(lambda m: self._names.get(f"c{m.group(1)}", m.group(0)), text)
+
+    def feed(self, chunk: str) -> str:
+        text, self._held = self._held + chunk, ""
+        m = _REF_TAIL.search(text)
+        if m and self._names:
+            text, self._held = text[:m.start()], text[m.start():]
+        return self.expand(text)
+
+    def flush(self) -> str:
+        text, self._held = self._held, ""
+        return self.expand(text)
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            text = self.feed(chunk)
+            if text:
+                yield text
+        tail = self.flush()
+        if tail:
+            yield tail
+
+
+class PromptBuilder:
+    """Builds advisor prompts that stay under a token budget.
+
+    Cards are written as short refs (``c1``, ``c2``...) numbered in glossary
+    order, so the same board always gets the same refs, and each distinct
+    card's name and effect text appears once in a glossary at the end of
+    the prompt. ``Prompt.refs`` maps the refs back to names for replies
+    that use them anyway. When the whole prompt would go
+    over *token_budget*, effect text is shortened: cards the player can act
+    with (from ``get_commands()``) keep their full text first, the rest share
+    what is left, and text that can't get a useful share is dropped.
+    """
+
+    def __init__(self, token_budget: int = ADVISOR_PROMPT_TOKENS) -> None:
+        self.token_budget = token_budget
+
+    def build(self, gs: dict, cmd_result: dict | None, cards: CardText) -> Prompt:
+        cmd_result = cmd_result if isinstance(cmd_result, dict) else {}
+        commands = cmd_result.get("commands", [])
+        phase = cmd_result.get("phase", gs.get("phase", -1))
+        my_turn = cmd_result.get("myself", 0) == cmd_result.get("turnPlayer", -1)
+        phase_name = PHASE_NAMES.get(phase, str(phase))
+
+        hand = [c.get("cardId", 0) for c in gs.get("myHand", [])]
+        my_field = self._field(gs.get("myField", {}))
+        rival_field = self._field(gs.get("rivalField", {}))
+        cmd_ids = [cmd.get("cardId", 0) for cmd in commands]
+
+        # glossary order is the priority order for effect text, and numbers the refs
+        order: list[int] = []
+        for cid in cmd_ids + hand + [c for c, _ in my_field] + [c for c, _ in rival_field]:
+            if cid and cid not in order:
+                order.append(cid)
+        refs = {cid: f"c{i + 1}" for i, cid in enumerate(order)}
+
+        def ref(card_id: int) -> str:
+            return refs.get(card_id, "?")
+
+        def names(pile: list) -> str:
+            return ", ".join(c.get("name") or f"id:{c.get('cardId', '?')}" for c in pile) or "-"
+
+        def placed(field: list[tuple[int, str]]) -> str:
+            return ", ".join(f"{ref(cid)}@{z}" for cid, z in field) or "-"
+
+        lines = [
+            f"T{gs.get('turnNum', '?')} {phase_name} {'my' if my_turn else 'rival'} turn"
+            f" | LP {gs.get('myLP', '?')} vs {gs.get('rivalLP', '?')}"
+            f" | deck {gs.get('myDeckCount', '?')} extra {gs.get('myExtraDeckCount', '?')}"
+            f" rival deck {gs.get('rivalDeckCount', '?')}",
+            f"Hand: {', '.join(ref(cid) for cid in hand) or '-'}",
+            f"Field: {placed(my_field)}",
+            f"Rival field: {placed(rival_field)}",
+            f"GY: {names(gs.get('myGY', []))}",
+            f"Rival GY: {names(gs.get('rivalGY', []))}",
+        ]
+        if gs.get("myBanished") or gs.get("rivalBanished"):
+            lines.append(f"Banished: {names(gs.get('myBanished', []))}")
+            lines.append(f"Rival banished: {names(gs.get('rivalBanished', []))}")
+        lines.append("Commands:")
+        for i, cmd in enumerate(commands):
+            cid = cmd.get("cardId", 0)
+            acts = ",".join(label for bit, label in ACTION_NAMES.items() if cmd.get("mask", 0) & bit)
+            lines.append(f"[{i}] {ref(cid)} {zone_label(cmd.get('zone', -1))} {acts}")
+        if not commands:
+            lines.append("(none)")
+        lines.append("Cards:")
+
+        card_names = {cid: cards.name(cid) or f"id:{cid}" for cid in order}
+        entries = {cid: f"{refs[cid]} {card_names[cid]}" for cid in order}
+        head = "\n".join(lines) + "\n" + "\n".join(entries.values()) + "\nQuick advice?"
+        texts, clipped = self._fit(order, set(cmd_ids), cards, self.token_budget - estimate_tokens(head))
+
+        glossary = [f"{entries[cid]}: {texts[cid]}" if texts.get(cid) else entries[cid] for cid in order]
+        text = "\n".join(lines + glossary) + "\nQuick advice?"
+        key = {
+            "gs": [gs.get("turnNum"), gs.get("myLP"), gs.get("rivalLP"), gs.get("myDeckCount"),
+                   gs.get("myExtraDeckCount"), gs.get("rivalDeckCount")],
+            "hand": sorted(hand),
+            "field": sorted(my_field),
+            "rivalField": sorted(rival_field),
+            "gy": [sorted(c.get("cardId", 0) for c in gs.get(z, []))
+                   for z in ("myGY", "rivalGY", "myBanished", "rivalBanished")],
+            "cmds": [[c.get("cardId", 0), c.get("zone"), c.get("mask")] for c in commands],
+            "phase": [phase_name, my_turn],
+        }
+        return Prompt(
+            text, estimate_tokens(text), key, len(order), clipped,
+            {refs[cid]: card_names[cid] for cid in order},
+        )
+
+    @staticmethod
+    def _field(field: dict) -> list[tuple[int, str]]:
+        out = []
+        for z in ("monsters", "spells", "extraMonsters"):
+            for c in field.get(z, ()):
+                out.append((c.get("cardId", 0), str(c.get("zone", "?"))))
+        return out
+
+    @staticmethod
+    def _fit(order: list[int], priority: set[int], cards: CardText, budget_tokens: int) -> tuple[dict[int, str], int]:
+        """Effect text per card within *budget_tokens*; returns (texts, clipped count)."""
+        full = {cid: _WS.sub(" ", cards.desc(cid) or "").strip() for cid in order}
+        room = max(0, budget_tokens) * _CHARS_PER_TOKEN
+        out: dict[int, str] = {}
+        clipped = 0
+
+        def take(cid: int, limit: int) -> int:
+            nonlocal clipped
+            text = full[cid]
+            if not text:
+                return 0
+            if len(text) + 2 <= limit:
+                out[cid] = text
+                return len(text) + 2
+            clipped += 1
+            if limit - 2 >= _MIN_CLIP:
+                out[cid] = _clip(text, limit - 2)
+                return len(out[cid]) + 2
+            return 0
+
+        for cid in order:
+            if cid in priority:
+                room -= take(cid, room)
+        # the rest, in priority order, as many as can get a useful share; they
+        # split the room evenly, shortest first so unused room carries over
+        rest = [cid for cid in order if cid not in priority and full[cid]]
+        keep = rest[:room // (_MIN_CLIP + 2)]
+        clipped += len(rest) - len(keep)
+        keep.sort(key=lambda c: len(full[c]))
+        for i, cid in enumerate(keep):
+            room -= take(cid, room // (len(keep) - i))
+        return out, clipped
@@ -8,20 +8,87 @@ if getattr(sys, "frozen", False):
 else:
     load_dotenv()
 
+# writable data files (card catalog etc.) live next to the exe / repo root
+if getattr(sys, "frozen", False):
+    DATA_DIR = os.path.dirname(sys.executable)
+else:
+    DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
 WINDOW_TITLE = "masterduel"
 PROCESS_NAME = "masterduel.exe"
 SCAN_INTERVAL = 0.5
+STATE_POLL_INTERVAL = 0.25
+# ms of queued agent work run per game frame on Unity's main thread
+MAIN_THREAD_BUDGET_MS = 4
+
+# AsyncFridaIL2CPP defaults
+ASYNC_RPC_TIMEOUT = 10.0
+ASYNC_RPC_CONCURRENCY = 4
 
 HOTKEY_INSTANT_WIN = "F1"
 HOTKEY_AUTOPILOT = "F2"
 HOTKEY_ASSIST = "F4"
 HOTKEY_WIN_NOW = "F5"
 HOTKEY_SPEED = "F6"
+HOTKEY_RUN_STEP = "F7"
 STOP_HOTKEY = "F12"
 
 SPEED_SCALE = 3.0
 
+CARD_CATALOG_PATH = os.path.join(DATA_DIR, "card_catalog.json.gz")
+
+# advisor reply cache; set ADVICE_CACHE_PERSIST=0 to keep it in memory only
+ADVICE_CACHE_SIZE = 256
+ADVICE_CACHE_TTL = 7 * 24 * 3600
+ADVICE_CACHE_PATH = (
+    os.path.join(DATA_DIR, "advice_cache.json.gz")
+    if os.environ.get("ADVICE_CACHE_PERSIST", "1") != "0" else ""
+)
+
+# "gemini" or "local" (offline heuristic); chosen in the settings dialog
+ADVISOR_BACKEND = os.environ.get("ADVISOR_BACKEND", "gemini")
+# ask for JSON steps that map onto get_commands() entries (runnable with F7)
+ADVISOR_STRUCTURED = os.environ.get("ADVISOR_STRUCTURED", "1") == "1"
+
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-3-flash-preview")
+# models.list() result, kept next to .env so the settings dialog opens offline
+GEMINI_MODELS_PATH = os.path.join(DATA_DIR, "gemini_models.json")
+GEMINI_MODELS_TTL = 24 * 3600
+# estimated tokens per advisor prompt; effect text is clipped to fit
+ADVISOR_PROMPT_TOKENS = int(os.environ.get("ADVISOR_PROMPT_TOKENS", "1500"))
+# opt-in: compute advice in the background at my Main 1 and at rival-turn chain windows
+ADVISOR_PREFETCH = os.environ.get("ADVISOR_PREFETCH", "0") == "1"
+ADVISOR_PREFETCH_BUDGET = 20       # model requests per duel
+ADVISOR_PREFETCH_DEBOUNCE = 1.5    # seconds the board must hold still before a prefetch
+# request scheduling for remote advisors; ADVISOR_RPM=0 picks the model's free-tier quota
+ADVISOR_RPM = float(os.environ.get("ADVISOR_RPM", "0"))
+ADVISOR_BURST = 2
+ADVISOR_RETRIES = 3
+ADVISOR_BACKOFF = 1.0              # seconds, doubled per retry (full jitter)
+ADVISOR_BACKOFF_MAX = 20.0
+ADVISOR_TIMEOUT = 30.0             # seconds to the first chunk before a retry
+ADVISOR_QUEUE_TIMEOUT = 30.0       # seconds a request may wait for quota
+ADVISOR_HEDGE_PERCENTILE = float(os.environ.get("ADVISOR_HEDGE_PERCENTILE", "95"))  # 0 disables hedging
+ADVISOR_METRICS_KEEP = 1000        # requests kept for the metrics panel / export
+# USD per million tokens, for the cost estimate in the metrics panel; 0 hides it
+ADVISOR_PRICE_IN = float(os.environ.get("ADVISOR_PRICE_IN", "0"))
+ADVISOR_PRICE_OUT = float(os.environ.get("ADVISOR_PRICE_OUT", "0"))
+
+# console/GUI log level (DEBUG, INFO, WARN, ERROR); debug records are dropped before queueing
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+# optional rotating JSONL log for post-mortems, e.g. LOG_FILE=bot_log.jsonl
+LOG_FILE = os.environ.get("LOG_FILE", "")
+LOG_FILE_MAX_BYTES = 5_000_000
+LOG_FILE_BACKUPS = 3
 
-TUI_REFRESH_RATE = 4
+TUI_REFRESH_RATE = 4                # top TUI redraw rate (Hz); it adapts below this like the GUI
+# GUI/TUI refresh interval by situation (ms); slower still if a refresh overruns FRAME_BUDGET_MS
+REFRESH_ACTIVE_MS = 100            # duel state changing or my turn
+REFRESH_NORMAL_MS = 250            # duel on, nothing happening
+REFRESH_IDLE_MS = 1000             # menus, no duel
+REFRESH_HIDDEN_MS = 2000           # window minimized / hidden
+LOG_VIEW_LINES = 5000               # log entries kept in memory and in the GUI log panel
+CHAT_HISTORY_MAX = 200              # advisor chat messages kept on screen; older ones go to the transcript
+CHAT_TRANSCRIPT_PATH = os.path.join(DATA_DIR, "advisor_transcript.md")
+FRAME_BUDGET_MS = 16.7
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from utils import startup  # first, so the startup clock covers every import below
+
+import os
 import sys
 import threading
 import time
+from typing import TYPE_CHECKING
 
 import keyboard
 from colorama import init as colorama_init
 
 from config import (
+    DATA_DIR,
     WINDOW_TITLE,
     STOP_HOTKEY,
     HOTKEY_INSTANT_WIN,
@@ -15,82 +20,110 @@ from config import (
     HOTKEY_ASSIST,
     HOTKEY_WIN_NOW,
     HOTKEY_SPEED,
+    HOTKEY_RUN_STEP,
     SPEED_SCALE,
     SCAN_INTERVAL,
+    LOG_LEVEL,
+    LOG_FILE,
+    LOG_FILE_MAX_BYTES,
+    LOG_FILE_BACKUPS,
 )
-from memory.frida_il2cpp import FridaIL2CPP
 from window.background_input import find_window
 from ui.bot_state import BotState
 from ui.log_handler import TuiLogBuffer
-from ui.gui_main import run_gui
-from bot.autopilot import DuelAutopilot
-from bot.gemini_advisor import GeminiAdvisor
 from utils import logger
 
+if TYPE_CHECKING:
+    from bot.autopilot import DuelAutopilot
+    from memory.state_poller import StatePoller
+
+# Frida, the advisor stack and PySide6 are imported on a background thread
+# while we wait for the game window, in the order main() needs them
+_PRELOAD = (
+    "memory.frida_il2cpp",
+    "memory.state_poller",
+    "bot.autopilot",
+    "bot.advisor",
+    "PySide6.QtWidgets",
+    "ui.gui_main",
+)
+
 
 def bot_worker(
-    frida_session: FridaIL2CPP,
+    poller: StatePoller,
     state: BotState,
     autopilot: DuelAutopilot,
 ) -> None:
+    frida_session = poller.frida
+    snap = poller.latest()
+
     while not state.stop_event.is_set():
         try:
-            if not frida_session.is_attached():
+            if not snap.attached:
                 state.stop_event.wait(1.0)
+                snap = poller.latest()
                 continue
 
-            if not frida_session.is_duel_active():
-                state.stop_event.wait(SCAN_INTERVAL)
-                continue
-
-            if state.autopilot_enabled:
-                try:
-                    autopilot.tick()
-                except Exception as exc:
-                    logger.error(f"Autopilot tick error: {exc}")
-                state.stop_event.wait(SCAN_INTERVAL)
-                continue
-
-            if state.instant_win_enabled:
-                status = frida_session.get_duel_status()
-                if status:
-                    rival = status.get("rival", 1)
-                    rival_lp = status["lp"][rival]
-                    if rival_lp > 0:
+            if snap.duel_active:
+                if state.autopilot_enabled:
+                    try:
+                        autopilot.tick()
+                    except Exception as exc:
+                        logger.error(f"Autopilot tick error: {exc}")
+                elif state.instant_win_enabled and snap.game_state:
+                    if snap.game_state.get("rivalLP", 0) > 0:
                         frida_session.instant_win()
 
-            state.stop_event.wait(0.5)
+            # sleep until the poller sees a change (it ticks on engine events or its interval)
+            snap = poller.wait_for_change(snap.seq, timeout=SCAN_INTERVAL)
 
         except Exception as exc:
             logger.error(f"Worker error: {exc}")
             state.stop_event.wait(1.0)
+            snap = poller.latest()
 
 
 def main() -> None:
     colorama_init()
+    log_file = os.path.join(DATA_DIR, LOG_FILE) if LOG_FILE else ""
+    logger.configure(level=LOG_LEVEL, file=log_file, max_bytes=LOG_FILE_MAX_BYTES, backups=LOG_FILE_BACKUPS)
 
     state = BotState()
     log_buf = TuiLogBuffer()
     logger.set_log_callback(log_buf.append)
 
     logger.info("Master Duel Bot starting...")
+    startup.preload(*_PRELOAD)
 
     # wait for the game to be running
     logger.info("Waiting for Master Duel window...")
+    startup.mark("waiting for window")
     hwnd = find_window(WINDOW_TITLE)
     while hwnd is None:
         time.sleep(2)
         hwnd = find_window(WINDOW_TITLE)
     logger.ok(f"Found game window (HWND: {hex(hwnd)})")
+    startup.mark("found window")
+
+    # no-ops if the preload already got there; waits on it if it's mid-import
+    from bot.advisor import Advisor
+    from bot.autopilot import DuelAutopilot
+    from memory.frida_il2cpp import FridaIL2CPP
+    from memory.state_poller import StatePoller
+    from ui.gui_main import run_gui
 
     frida_session = FridaIL2CPP()
     while not frida_session.attach():
         logger.info("Waiting for masterduel.exe process...")
         time.sleep(3)
     logger.ok("Frida IL2CPP session ready.")
+    startup.mark("frida attached")
 
+    poller = StatePoller(frida_session)
+    poller.start()
     autopilot = DuelAutopilot(frida_session)
-    advisor = GeminiAdvisor()
+    advisor = Advisor()
+    advisor.warm_models()
 
     def on_toggle_iw():
         new = state.toggle_instant_win()
@@ -113,6 +146,12 @@ def main() -> None:
         else:
             logger.info("AI Assist: GUI not ready yet")
 
+    _run_step_cb = [None]
+
+    def on_run_step():
+        if _run_step_cb[0]:
+            _run_step_cb[0]()
+
     def on_toggle_speed():
         new = state.toggle_speed_hack()
         frida_session.set_time_scale(SPEED_SCALE if new else 1.0)
@@ -134,24 +173,34 @@ def main() -> None:
     keyboard.add_hotkey(HOTKEY_ASSIST, on_assist, suppress=True, trigger_on_release=True)
     keyboard.add_hotkey(HOTKEY_WIN_NOW, on_win_now, suppress=True, trigger_on_release=True)
     keyboard.add_hotkey(HOTKEY_SPEED, on_toggle_speed, suppress=True, trigger_on_release=True)
+    keyboard.add_hotkey(HOTKEY_RUN_STEP, on_run_step, suppress=True, trigger_on_release=True)
     keyboard.add_hotkey(STOP_HOTKEY, on_quit, suppress=True, trigger_on_release=True)
 
-    worker = threading.Thread(target=bot_worker, args=(frida_session, state, autopilot), daemon=True)
+    worker = threading.Thread(target=bot_worker, args=(poller, state, autopilot), daemon=True)
     worker.start()
 
-    logger.ok("GUI starting. Press F1/F2/F3/F4/F5/F6/F12.")
+    logger.ok("GUI starting. Press F1/F2/F3/F4/F5/F6/F7/F12.")
 
     try:
-        run_gui(frida_session, hwnd, state, log_buf, autopilot, advisor, _assist_cb)
+        run_gui(poller, hwnd, state, log_buf, autopilot, advisor, _assist_cb, _run_step_cb)
     except KeyboardInterrupt:
         state.stop_event.set()
     finally:
         state.stop_event.set()
         if autopilot.ai_active:
             autopilot.disable()
+        poller.stop()
         worker.join(timeout=3.0)
+        logger.info(f"State poller: {poller.stats()}")
+        lat = frida_session.events.latency_summary()
+        logger.info(f"Duel update latency (ms): event={lat['event']} poll={lat['poll']}")
+        logger.info(f"Advice cache: {advisor.cache.stats()}")
+        logger.info(f"Advisor scheduler: {advisor.scheduler.stats()}")
+        logger.info(f"Advisor metrics: {advisor.metrics.summary()}")
+        advisor.cache.save()
         frida_session.detach()
         keyboard.unhook_all()
+        logger.flush()
         print("\nBot stopped. Goodbye!")
 
 
@@ -16,7 +16,13 @@ a = Analysis(
         # Frida native extension
         "frida._frida",
         "frida.core",
-        # Google Gemini (dynamically imported)
+        # imported inside main() / preloaded on a background thread
+        "memory.frida_il2cpp",
+        "memory.state_poller",
+        "bot.autopilot",
+        "bot.advisor",
+        "ui.gui_main",
+        # Google Gemini (imported on first use of the client)
         "google.genai",
         "google.genai.types",
         "google.auth",
@@ -106,7 +112,9 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX-packed DLLs are decompressed on every launch, which costs more cold-start
+    # time (and AV scans) than the disk space it saves
+    upx=False,
     console=True,
     uac_admin=True,
 )
@@ -117,7 +125,7 @@ coll = COLLECT(
     a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name="MasterDuelAutoly",
 )
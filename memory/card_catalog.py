@@ -0,0 +1,109 @@
+"""Persistent cardId -> (name, desc) catalog fed by the Frida agent's card-text delta."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+
+from config import CARD_CATALOG_PATH
+from utils import logger
+
+_FORMAT_VERSION = 1
+
+# flush to disk after this many new cards so a crash doesn't lose a whole session
+_SAVE_EVERY = 50
+
+
+class CardCatalog:
+    """Card names and effect text keyed by cardId.
+
+    The agent only ships text for ids it hasn't sent before; everything it
+    sends is ingested here and persisted as gzipped JSON so later sessions
+    can prime the agent and start warm.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self._path = path or CARD_CATALOG_PATH
+        self._cards: dict[int, tuple[str | None, str | None]] = {}
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __contains__(self, card_id: int) -> bool:
+        return card_id in self._cards
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def name(self, card_id: int) -> str | None:
+        entry = self._cards.get(card_id)
+        return entry[0] if entry else None
+
+    def desc(self, card_id: int) -> str | None:
+        entry = self._cards.get(card_id)
+        return entry[1] if entry else None
+
+    def known_ids(self) -> list[int]:
+        with self._lock:
+            return list(self._cards)
+
+    def ingest(self, delta: dict | None) -> int:
+        """Merge an agent delta ({"cardId": [name, desc]}); returns how many ids were new."""
+        if not delta:
+            return 0
+        added = 0
+        with self._lock:
+            for key, value in delta.items():
+                try:
+                    card_id = int(key)
+                    name, desc = value
+                except (TypeError, ValueError):
+                    continue
+                if card_id not in self._cards:
+                    added += 1
+                self._cards[card_id] = (name, desc)
+            self._unsaved += added
+            flush = self._unsaved >= _SAVE_EVERY
+        if flush:
+            self.save()
+        return added
+
+    def load(self) -> int:
+        if not os.path.isfile(self._path):
+            return 0
+        try:
+            with gzip.open(self._path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warn(f"Card catalog unreadable, starting cold: {exc}")
+            return 0
+        if data.get("version") != _FORMAT_VERSION:
+            return 0
+        with self._lock:
+            for key, (name, desc) in data.get("cards", {}).items():
+                self._cards[int(key)] = (name, desc)
+            return len(self._cards)
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self._unsaved and os.path.isfile(self._path):
+                return True
+            payload = {
+                "version": _FORMAT_VERSION,
+                "cards": {str(k): [n, d] for k, (n, d) in self._cards.items()},
+            }
+            self._unsaved = 0
+        tmp = self._path + ".tmp"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp, self._path)
+            return True
+        except OSError as exc:
+            logger.error(f"Card catalog save failed: {exc}")
+            return False
@@ -0,0 +1,135 @@
+"""Wakes duel consumers on agent ``duelDirty`` events, with a polling fallback."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+
+from config import SCAN_INTERVAL
+
+# upper bucket edges in ms; the last bucket is open-ended
+_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# in event mode consumers still wake this often: outside a duel to notice
+# the next one start, which goes through no hooked entry point, and during
+# one to catch what the engine-step signature doesn't cover (ATK/DEF and
+# counter changes, chain links that move no card)
+EVENT_HEARTBEAT = 1.0
+EVENT_HEARTBEAT_DUEL = 0.1
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (ms) with approximate percentiles."""
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BUCKETS_MS) + 1)
+        self._total = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def record(self, ms: float) -> None:
+        ms = max(0.0, ms)
+        self._counts[bisect.bisect_left(_BUCKETS_MS, ms)] += 1
+        self._total += 1
+        self._sum += ms
+        self._max = max(self._max, ms)
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    def percentile(self, p: float) -> float | None:
+        """Upper edge of the bucket holding the p-th percentile (max for the open bucket)."""
+        if not self._total:
+            return None
+        target = p / 100.0 * self._total
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= target and n:
+                return float(_BUCKETS_MS[i]) if i < len(_BUCKETS_MS) else self._max
+        return self._max
+
+    def summary(self) -> dict:
+        return {
+            "count": self._total,
+            "mean": round(self._sum / self._total, 1) if self._total else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": round(self._max, 1),
+        }
+
+
+class DuelEventHub:
+    """Condition variable that consumers wait on for duel state changes.
+
+    In ``event`` mode the agent's Interceptor hooks drive ``notify``; in
+    ``poll`` mode (hooks unavailable) ``wait`` simply times out after the
+    scan interval like the old fixed sleep. Both paths feed a latency
+    histogram so the two modes can be compared on the same session:
+    ``event`` is agent hook time -> Python wake, ``poll`` is agent hook time
+    (or, without hooks, the previous poll as an upper bound) -> the poll that
+    first observed the change.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._mode = "poll"
+        self._unobserved_ts: float | None = None  # agent ts of the oldest event no poll has seen yet
+        self._last_poll = 0.0
+        self.latency = {"event": LatencyHistogram(), "poll": LatencyHistogram()}
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def idle_timeout(self) -> float:
+        return EVENT_HEARTBEAT if self._mode == "event" else SCAN_INTERVAL
+
+    def set_mode(self, mode: str) -> None:
+        with self._cond:
+            self._mode = mode
+            self._unobserved_ts = None
+            self._cond.notify_all()
+
+    def notify(self, payload: dict | None = None) -> None:
+        now_ms = time.time() * 1000.0
+        with self._cond:
+            self._seq += 1
+            ts = (payload or {}).get("ts")
+            if ts is not None:
+                self.latency["event"].record(now_ms - ts)
+                if self._unobserved_ts is None:
+                    self._unobserved_ts = ts
+            self._cond.notify_all()
+
+    def wait(self, last_seq: int, timeout: float | None = None) -> int:
+        """Block until an event newer than *last_seq* or the timeout; returns the current seq."""
+        if timeout is None:
+            timeout = self.idle_timeout
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != last_seq, timeout)
+            return self._seq
+
+    def record_poll(self, changed: bool) -> None:
+        """Called by a polling reader after each state read."""
+        now = time.time()
+        with self._cond:
+            if changed:
+                if self._unobserved_ts is not None:
+                    self.latency["poll"].record(now * 1000.0 - self._unobserved_ts)
+                elif self._mode == "poll" and self._last_poll:
+                    self.latency["poll"].record((now - self._last_poll) * 1000.0)
+            self._unobserved_ts = None
+            self._last_poll = now
+
+    def latency_summary(self) -> dict:
+        with self._cond:
+            return {mode: h.summary() for mode, h in self.latency.items()}
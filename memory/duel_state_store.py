@@ -0,0 +1,101 @@
+"""Applies the agent's versioned game-state patches and serves immutable snapshots."""
+
+from __future__ import annotations
+
+import threading
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class DuelStateStore:
+    """Current duel snapshot rebuilt from ``duelState`` messages.
+
+    ``revision`` increases by one every time the snapshot changes, so
+    consumers can remember the last revision they rendered and skip work
+    while it stays the same. Snapshots are read-only (mappings are
+    ``MappingProxyType``, lists are tuples) and unchanged zones are shared
+    between revisions.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._zones: dict[str, Any] = {}
+        self._snapshot: Mapping[str, Any] | None = None
+        self._revision = 0
+        self._agent_rev: int | None = None
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def snapshot(self) -> Mapping[str, Any] | None:
+        """The current duel state, or None when no duel is active."""
+        return self._snapshot
+
+    @property
+    def needs_resync(self) -> bool:
+        return self._agent_rev is None
+
+    def read(self) -> tuple[int, Mapping[str, Any] | None]:
+        with self._lock:
+            return self._revision, self._snapshot
+
+    def clear(self) -> None:
+        """Drop the snapshot (e.g. on detach); bumps the revision if there was one."""
+        with self._lock:
+            self._agent_rev = None
+            if self._snapshot is not None:
+                self._zones = {}
+                self._snapshot = None
+                self._revision += 1
+
+    def invalidate(self) -> None:
+        """Forget the agent revision so the next push must be a full snapshot."""
+        with self._lock:
+            self._agent_rev = None
+
+    def apply(self, msg: dict) -> bool:
+        """Apply one ``duelState`` message. Returns False if a resync is needed."""
+        with self._lock:
+            rev = msg.get("rev")
+            if msg.get("reset"):
+                self._agent_rev = rev
+                if self._snapshot is not None:
+                    self._zones = {}
+                    self._snapshot = None
+                    self._revision += 1
+                return True
+
+            if not msg.get("full") and (self._agent_rev is None or msg.get("base") != self._agent_rev):
+                self._agent_rev = None
+                return False
+
+            patch = msg.get("patch") or {}
+            if not patch and not msg.get("full"):
+                self._agent_rev = rev
+                return True
+
+            if msg.get("full"):
+                self._zones = {}
+            for key, value in patch.items():
+                prev = self._zones.get(key)
+                if isinstance(value, dict) and isinstance(prev, Mapping):
+                    merged = dict(prev)
+                    merged.update({k: _freeze(v) for k, v in value.items()})
+                    self._zones[key] = MappingProxyType(merged)
+                else:
+                    self._zones[key] = _freeze(value)
+
+            self._agent_rev = rev
+            self._snapshot = MappingProxyType(dict(self._zones))
+            self._revision += 1
+            return True
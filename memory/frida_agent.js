@@ -101,60 +101,213 @@ function readCStr(p) {
     try { return p.readCString() || ""; } catch (e) { return ""; }
 }
 
-// ── IL2CPP class/method helpers ──
+// ── IL2CPP metadata index ──
+// One pass over every assembly maps "ns.name" -> klass. Each class gets a
+// method table (name and name/arity -> MethodInfo) and a field table
+// (name -> FieldInfo + offset) the first time it is touched; all of it lives
+// until the domain is reloaded or invalidateMetaIndex() is called.
+
+var _metaIndex = null;  // { domain, asmCount, classes: {"ns.name": klass}, methods: {klass: table}, fields: {klass: table} }
+var _metaStats = {
+    builds: 0, lastBuildMs: 0, classCount: 0,
+    classHits: 0, classCold: 0,
+    methodHits: 0, methodCold: 0,
+    fieldHits: 0, fieldCold: 0,
+    invalidations: 0, lastInvalidation: null
+};
 
-function findEngineClass() {
-    const domain = il2cpp_domain_get();
-    const sizePtr = Memory.alloc(Process.pointerSize);
-    const assemblies = il2cpp_domain_get_assemblies(domain, sizePtr);
-    const count = sizePtr.readUInt();
-    for (let i = 0; i < count; i++) {
-        const asm = assemblies.add(i * Process.pointerSize).readPointer();
-        const image = il2cpp_assembly_get_image(asm);
-        const cc = il2cpp_image_get_class_count(image);
-        for (let j = 0; j < cc; j++) {
-            const klass = il2cpp_image_get_class(image, j);
-            if (readCStr(il2cpp_class_get_namespace(klass)) === "YgomGame.Duel" &&
-                readCStr(il2cpp_class_get_name(klass)) === "Engine") {
-                return klass;
-            }
+function _domainAssemblies(domain) {
+    var sizePtr = Memory.alloc(Process.pointerSize);
+    var assemblies = il2cpp_domain_get_assemblies(domain, sizePtr);
+    return { list: assemblies, count: sizePtr.readU32() };
+}
+
+function _buildClassMap(domain) {
+    var t0 = Date.now();
+    var asms = _domainAssemblies(domain);
+    var classes = {};
+    var classCount = 0;
+    for (var i = 0; i < asms.count; i++) {
+        var asm = asms.list.add(i * Process.pointerSize).readPointer();
+        var image = il2cpp_assembly_get_image(asm);
+        var cc = il2cpp_image_get_class_count(image);
+        for (var j = 0; j < cc; j++) {
+            var klass = il2cpp_image_get_class(image, j);
+            var key = readCStr(il2cpp_class_get_namespace(klass)) + "." +
+                      readCStr(il2cpp_class_get_name(klass));
+            // first definition wins, same as the old linear scans
+            if (!classes[key]) { classes[key] = klass; classCount++; }
         }
     }
-    return null;
+    _metaStats.builds++;
+    _metaStats.classCount = classCount;
+    _metaStats.lastBuildMs = Date.now() - t0;
+    send("metaIndex: " + classCount + " classes from " + asms.count + " assemblies in " + _metaStats.lastBuildMs + "ms");
+    return { asmCount: asms.count, classes: classes };
 }
 
-function getMethodAddr(klass, methodName) {
-    const iter = Memory.alloc(Process.pointerSize);
+/**
+ * Build the index if it is missing or belongs to a previous domain.
+ * Returns true when a build happened, i.e. the caller's lookup is cold.
+ */
+function ensureMetaIndex() {
+    var domain = il2cpp_domain_get();
+    if (_metaIndex !== null && _metaIndex.domain.equals(domain)) return false;
+    if (_metaIndex !== null) invalidateMetaIndex("domain reload");
+
+    il2cpp_thread_attach(domain);
+    var map = _buildClassMap(domain);
+    _metaIndex = { domain: domain, asmCount: map.asmCount, classes: map.classes, methods: {}, fields: {} };
+    return true;
+}
+
+/**
+ * Drop the index and every cache holding MethodInfo/class pointers taken from it.
+ * Runs automatically when il2cpp_domain_get() changes; also exposed over RPC.
+ */
+function invalidateMetaIndex(reason) {
+    _metaIndex = null;
+    _metaStats.invalidations++;
+    _metaStats.lastInvalidation = reason || "manual";
+
+    _resolved = false;
+    _cardMI = null;
+    _pvpCardMI = null;
+    _pvpTurnMI = null;
+    _pvpCmdMI = null;
+    _contentInstance = null;
+    _dictClassCache = null;
+    _dictCtorCache = null;
+    _dictAddCache = null;
+    _invokeDirect = new Map();
+    resetOnlineCache();
+}
+
+function _methodTable(klass) {
+    var key = klass.toString();
+    var table = _metaIndex.methods[key];
+    if (table) return table;
+
+    table = { list: [], byName: {}, byArity: {}, cold: true };
+    var iter = Memory.alloc(Process.pointerSize);
     iter.writePointer(ptr(0));
     while (true) {
-        const method = il2cpp_class_get_methods(klass, iter);
-        if (method.isNull()) return null;
-        if (readCStr(il2cpp_method_get_name(method)) === methodName) {
-            return method.readPointer(); // methodPointer is first field
-        }
+        var method = il2cpp_class_get_methods(klass, iter);
+        if (method.isNull()) break;
+        var name = readCStr(il2cpp_method_get_name(method));
+        var arityKey = name + "/" + il2cpp_method_get_param_count(method);
+        table.list.push(method);
+        if (!table.byName.hasOwnProperty(name)) table.byName[name] = method;
+        if (!table.byArity.hasOwnProperty(arityKey)) table.byArity[arityKey] = method;
     }
+    _metaIndex.methods[key] = table;
+    return table;
 }
 
-function getStaticFieldPtr(klass, fieldName) {
-    const iter = Memory.alloc(Process.pointerSize);
+function _fieldTable(klass) {
+    var key = klass.toString();
+    var table = _metaIndex.fields[key];
+    if (table) return table;
+
+    table = { byName: {}, cold: true };
+    var iter = Memory.alloc(Process.pointerSize);
     iter.writePointer(ptr(0));
     while (true) {
-        const field = il2cpp_class_get_fields(klass, iter);
-        if (field.isNull()) return null;
-        if (readCStr(il2cpp_field_get_name(field)) === fieldName &&
-            !il2cpp_field_is_literal(field)) {
-            const buf = Memory.alloc(Process.pointerSize);
-            il2cpp_field_static_get_value(field, buf);
-            return buf.readPointer();
+        var field = il2cpp_class_get_fields(klass, iter);
+        if (field.isNull()) break;
+        if (il2cpp_field_is_literal(field)) continue;
+        var name = readCStr(il2cpp_field_get_name(field));
+        if (!table.byName.hasOwnProperty(name)) {
+            table.byName[name] = { field: field, offset: il2cpp_field_get_offset(field) };
         }
     }
+    _metaIndex.fields[key] = table;
+    return table;
+}
+
+/** Every MethodInfo* of a class in declaration order, served from the index. */
+function classMethods(klass) {
+    ensureMetaIndex();
+    return _methodTable(klass).list;
+}
+
+/** Look up a non-literal field of a class. Returns {field, offset} or null. */
+function findField(klass, name) {
+    var cold = ensureMetaIndex();
+    var table = _fieldTable(klass);
+    if (cold || table.cold) { _metaStats.fieldCold++; table.cold = false; }
+    else _metaStats.fieldHits++;
+    return table.byName.hasOwnProperty(name) ? table.byName[name] : null;
+}
+
+function findEngineClass() {
+    return findClassByName("YgomGame.Duel", "Engine");
+}
+
+function getMethodAddr(klass, methodName) {
+    const method = findMethodByName(klass, methodName, -1);
+    return method ? method.readPointer() : null; // methodPointer is first field
+}
+
+function getStaticFieldPtr(klass, fieldName) {
+    const f = findField(klass, fieldName);
+    if (!f) return null;
+    const buf = Memory.alloc(Process.pointerSize);
+    il2cpp_field_static_get_value(f.field, buf);
+    return buf.readPointer();
 }
 
 // ── Main-thread executor ──
-// Queue callbacks to run on Unity's main thread via ContentViewControllerManager.Update hook
+// Queue callbacks to run on Unity's main thread via ContentViewControllerManager.Update hook.
+// Each Update drains the queue until _mainThreadBudgetMs is spent (always at
+// least one job), so a long queue spreads over frames instead of stalling one.
+// Blocking callers sleep on a Win32 event that the main thread signals when
+// their job finishes; async callers get a ticket and a "mainThreadDone" message.
+
+const MAIN_THREAD_TIMEOUT_MS = 30000;
+const MAIN_THREAD_TICKETS_MAX = 256;   // finished async jobs kept for mainThreadResult()
+const MAIN_THREAD_ASYNC_EXPORTS = ["doCommand", "movePhase", "cancelCommand", "dialogSetResult",
+                                   "listSendIndex", "dismissTopDialog", "dismissAllDialogs"];
 
 var _mainThreadQueue = [];
 var _mainThreadHooked = false;
+var _mainThreadBudgetMs = 4;
+var _mainThreadSeq = 0;
+var _mainThreadTickets = new Map();    // ticket -> finished async job
+var _mainThreadAsync = null;           // collects tickets while mainThreadAsync() runs an export
+var _mainThreadStats = {
+    submitted: 0, completed: 0, failed: 0, timeouts: 0,
+    frames: 0, deferredFrames: 0, maxDepth: 0,
+    waitMsTotal: 0, waitMsMax: 0, execMsTotal: 0, execMsMax: 0
+};
+
+var _win32Event = null;                // kernel32 event API, or false if unavailable
+
+function _eventApi() {
+    if (_win32Event !== null) return _win32Event;
+    try {
+        var k32 = Process.getModuleByName("kernel32.dll");
+        _win32Event = {
+            create: new NativeFunction(k32.findExportByName("CreateEventW"), "pointer", ["pointer", "int", "int", "pointer"]),
+            wait: new NativeFunction(k32.findExportByName("WaitForSingleObject"), "uint32", ["pointer", "uint32"]),
+            set: new NativeFunction(k32.findExportByName("SetEvent"), "int", ["pointer"]),
+            close: new NativeFunction(k32.findExportByName("CloseHandle"), "int", ["pointer"]),
+            pool: []
+        };
+    } catch (e) {
+        send("mainThread: no kernel32 events (" + e.message + "), using sleep polling");
+        _win32Event = false;
+    }
+    return _win32Event;
+}
+
+function _takeEvent() {
+    var api = _eventApi();
+    if (!api) return null;
+    if (api.pool.length > 0) return api.pool.pop();
+    var h = api.create(ptr(0), 0, 0, ptr(0));  // auto-reset, initially unsignalled
+    return h.isNull() ? null : h;
+}
 
 function setupMainThreadHook() {
     if (_mainThreadHooked) return true;
@@ -171,16 +324,7 @@ function setupMainThreadHook() {
     var updateAddr = updateMethod.readPointer();
     Interceptor.attach(updateAddr, {
         onEnter: function () {
-            while (_mainThreadQueue.length > 0) {
-                var cb = _mainThreadQueue.shift();
-                try {
-                    cb.result = cb.fn();
-                    cb.done = true;
-                } catch (e) {
-                    cb.error = e.message;
-                    cb.done = true;
-                }
-            }
+            if (_mainThreadQueue.length > 0) _drainMainThreadQueue();
         }
     });
 
@@ -189,90 +333,167 @@ function setupMainThreadHook() {
     return true;
 }
 
-// Minimal class/method finders used before _classCache is available
-function _findClassForHook(ns, name) {
-    var sizeOut = Memory.alloc(4);
-    var assemblies = il2cpp_domain_get_assemblies(il2cpp_domain_get(), sizeOut);
-    var count = sizeOut.readU32();
-    for (var i = 0; i < count; i++) {
-        var asm = assemblies.add(i * Process.pointerSize).readPointer();
-        var image = il2cpp_assembly_get_image(asm);
-        var cc = il2cpp_image_get_class_count(image);
-        for (var j = 0; j < cc; j++) {
-            var klass = il2cpp_image_get_class(image, j);
-            if (readCStr(il2cpp_class_get_namespace(klass)) === ns &&
-                readCStr(il2cpp_class_get_name(klass)) === name) {
-                return klass;
-            }
+function _drainMainThreadQueue() {
+    var t0 = Date.now();
+    _mainThreadStats.frames++;
+    do {
+        _runMainThreadJob(_mainThreadQueue.shift());
+    } while (_mainThreadQueue.length > 0 && Date.now() - t0 < _mainThreadBudgetMs);
+    if (_mainThreadQueue.length > 0) _mainThreadStats.deferredFrames++;
+}
+
+function _runMainThreadJob(job) {
+    var started = Date.now();
+    try {
+        job.result = job.fn();
+    } catch (e) {
+        job.error = e.message;
+    }
+    job.fn = null;
+    job.waitMs = started - job.enqueuedAt;
+    job.execMs = Date.now() - started;
+    job.done = true;
+
+    var s = _mainThreadStats;
+    s.completed++;
+    if (job.error) s.failed++;
+    s.waitMsTotal += job.waitMs;
+    s.execMsTotal += job.execMs;
+    if (job.waitMs > s.waitMsMax) s.waitMsMax = job.waitMs;
+    if (job.execMs > s.execMsMax) s.execMsMax = job.execMs;
+
+    if (job.event) {
+        // a waiter that timed out while this ran is gone: nobody would
+        // consume the signal, so close the event rather than pool it set
+        if (job.abandoned) _eventApi().close(job.event);
+        else _eventApi().set(job.event);
+    }
+    if (job.async) {
+        _mainThreadTickets.set(job.ticket, job);
+        if (_mainThreadTickets.size > MAIN_THREAD_TICKETS_MAX) {
+            _mainThreadTickets.delete(_mainThreadTickets.keys().next().value);
         }
+        send({ type: "mainThreadDone", ticket: job.ticket, result: job.result, error: job.error,
+               waitMs: job.waitMs, execMs: job.execMs });
     }
-    return null;
 }
 
-function _findMethodForHook(klass, name, paramCount) {
-    var iter = Memory.alloc(Process.pointerSize);
-    iter.writePointer(ptr(0));
-    while (true) {
-        var method = il2cpp_class_get_methods(klass, iter);
-        if (method.isNull()) break;
-        if (readCStr(il2cpp_method_get_name(method)) === name &&
-            il2cpp_method_get_param_count(method) === paramCount) {
-            return method;
-        }
+/** Queue fn for the main thread without waiting; returns the job. */
+function _enqueueMainThread(fn) {
+    if (!_mainThreadHooked && !setupMainThreadHook()) {
+        throw new Error("Cannot set up main thread hook");
     }
-    return null;
+    var job = { ticket: ++_mainThreadSeq, fn: fn, done: false, result: null, error: null,
+                enqueuedAt: Date.now(), event: null, async: false, abandoned: false };
+    _mainThreadQueue.push(job);
+    _mainThreadStats.submitted++;
+    if (_mainThreadQueue.length > _mainThreadStats.maxDepth) _mainThreadStats.maxDepth = _mainThreadQueue.length;
+    return job;
+}
+
+// Hook setup goes through the same metadata index as every other resolver
+function _findClassForHook(ns, name) {
+    return findClassByName(ns, name);
+}
+
+function _findMethodForHook(klass, name, paramCount) {
+    return findMethodByName(klass, name, paramCount);
 }
 
 /**
  * Run a function on the Unity main thread. Blocks the Frida RPC thread
- * until the callback executes (max 30 seconds).
+ * until the callback executes (default max 30 seconds). Inside
+ * mainThreadAsync() it queues the callback and returns null immediately.
  */
-function runOnMainThread(fn) {
-    if (!_mainThreadHooked) {
-        if (!setupMainThreadHook()) {
-            throw new Error("Cannot set up main thread hook");
-        }
+function runOnMainThread(fn, timeoutMs) {
+    if (_mainThreadAsync) {
+        var asyncJob = _enqueueMainThread(fn);
+        asyncJob.async = true;
+        _mainThreadAsync.push(asyncJob.ticket);
+        return null;
     }
-    var cb = { fn: fn, done: false, result: null, error: null };
-    _mainThreadQueue.push(cb);
 
-    for (var i = 0; i < 300; i++) {
-        if (cb.done) {
-            if (cb.error) throw new Error("Main thread: " + cb.error);
-            return cb.result;
-        }
-        Thread.sleep(0.1);
+    var job = _enqueueMainThread(fn);
+    job.event = _takeEvent();
+    var limit = timeoutMs || MAIN_THREAD_TIMEOUT_MS;
+    var waited = 0;
+    if (job.event) {
+        waited = _eventApi().wait(job.event, limit);
+    } else {
+        var deadline = Date.now() + limit;
+        while (!job.done && Date.now() < deadline) Thread.sleep(0.005);
     }
-    throw new Error("Main thread callback timeout (30s)");
+
+    if (!job.done) {
+        var idx = _mainThreadQueue.indexOf(job);
+        if (idx >= 0) {
+            // Drop it so it doesn't run after we've given up; the event is
+            // never signalled now, so it can go back to the pool.
+            _mainThreadQueue.splice(idx, 1);
+            if (job.event) _eventApi().pool.push(job.event);
+        } else if (job.event) {
+            // Already running: _runMainThreadJob closes the event instead.
+            job.abandoned = true;
+        }
+        _mainThreadStats.timeouts++;
+        throw new Error("Main thread callback timeout (" + (limit / 1000) + "s)");
+    }
+    if (job.event) {
+        // Finished right at the deadline: SetEvent has been or is being
+        // called, so take that signal before pooling the event. If it
+        // somehow never shows up, leave the handle alone rather than pool
+        // or close one that may still be signalled.
+        if (waited === 0 || _eventApi().wait(job.event, limit) === 0) _eventApi().pool.push(job.event);
+    }
+    if (job.error) throw new Error("Main thread: " + job.error);
+    return job.result;
+}
+
+function mainThreadStats() {
+    var s = _mainThreadStats;
+    return {
+        hooked: _mainThreadHooked,
+        signalled: !!_eventApi(),
+        budgetMs: _mainThreadBudgetMs,
+        queueDepth: _mainThreadQueue.length,
+        maxDepth: s.maxDepth,
+        submitted: s.submitted,
+        completed: s.completed,
+        failed: s.failed,
+        timeouts: s.timeouts,
+        frames: s.frames,
+        deferredFrames: s.deferredFrames,
+        waitMsAvg: s.completed ? s.waitMsTotal / s.completed : 0,
+        waitMsMax: s.waitMsMax,
+        execMsAvg: s.completed ? s.execMsTotal / s.completed : 0,
+        execMsMax: s.execMsMax,
+        pendingTickets: _mainThreadTickets.size
+    };
 }
 
-// ── Generalized class/method finders (cached) ──
+// ── Generalized class/method finders (indexed) ──
 
-const _classCache = {};  // "ns.name" -> klass pointer
 var _interceptedCalls = {};  // captured Duel_begin/Duel_end params
 
 function findClassByName(ns, name) {
-    const key = ns + "." + name;
-    if (_classCache[key]) return _classCache[key];
-
-    const domain = il2cpp_domain_get();
-    const sizePtr = Memory.alloc(Process.pointerSize);
-    const assemblies = il2cpp_domain_get_assemblies(domain, sizePtr);
-    const count = sizePtr.readUInt();
-    for (let i = 0; i < count; i++) {
-        const asm = assemblies.add(i * Process.pointerSize).readPointer();
-        const image = il2cpp_assembly_get_image(asm);
-        const cc = il2cpp_image_get_class_count(image);
-        for (let j = 0; j < cc; j++) {
-            const klass = il2cpp_image_get_class(image, j);
-            if (readCStr(il2cpp_class_get_namespace(klass)) === ns &&
-                readCStr(il2cpp_class_get_name(klass)) === name) {
-                _classCache[key] = klass;
-                return klass;
-            }
+    var cold = ensureMetaIndex();
+    var key = ns + "." + name;
+    var klass = _metaIndex.classes[key];
+    if (!klass && !cold) {
+        // Assemblies can still be registering right after boot; rebuild the
+        // class map (keeping method/field tables) if the count moved.
+        var asms = _domainAssemblies(_metaIndex.domain);
+        if (asms.count !== _metaIndex.asmCount) {
+            var map = _buildClassMap(_metaIndex.domain);
+            _metaIndex.asmCount = map.asmCount;
+            _metaIndex.classes = map.classes;
+            klass = map.classes[key];
+            cold = true;
         }
     }
-    return null;
+    if (cold) _metaStats.classCold++;
+    else _metaStats.classHits++;
+    return klass || null;
 }
 
 /**
@@ -281,26 +502,60 @@ function findClassByName(ns, name) {
  */
 function findMethodByName(klass, name, paramCount) {
     if (paramCount === undefined) paramCount = -1;
-    const iter = Memory.alloc(Process.pointerSize);
-    iter.writePointer(ptr(0));
-    while (true) {
-        const method = il2cpp_class_get_methods(klass, iter);
-        if (method.isNull()) return null;
-        if (readCStr(il2cpp_method_get_name(method)) === name) {
-            if (paramCount < 0 || il2cpp_method_get_param_count(method) === paramCount) {
-                return method;
-            }
-        }
+    var cold = ensureMetaIndex();
+    var table = _methodTable(klass);
+    if (cold || table.cold) { _metaStats.methodCold++; table.cold = false; }
+    else _metaStats.methodHits++;
+    if (paramCount < 0) {
+        return table.byName.hasOwnProperty(name) ? table.byName[name] : null;
     }
+    var key = name + "/" + paramCount;
+    return table.byArity.hasOwnProperty(key) ? table.byArity[key] : null;
 }
 
-/**
- * Call a static method via il2cpp_runtime_invoke.
- * args: array of NativePointer values (already marshaled as void*).
- * Returns the Il2CppObject* result (may be null for void methods).
- * Throws on exception.
- */
-function invokeStatic(methodInfo, args) {
+// ── Invocation buffer pool ──
+// runtime_invoke needs a void*[] of argument pointers and an exception slot,
+// and int arguments need a 4-byte box each. Allocating those per call
+// dominated the hot read paths (getCommands, getCardsInZone), so each thread
+// gets a stack of preallocated frames indexed by nesting depth: an invoke can
+// re-enter the agent through a hook on the same thread, and the main-thread
+// hook runs JS on another thread while the RPC thread sits inside an invoke.
+// A frame holds up to INVOKE_MAX_ARGS params, so one frame shape serves every
+// arity; calls with more arguments fall back to fresh allocations.
+
+const INVOKE_MAX_ARGS = 8;
+var _invokeFrames = {};            // threadId -> {depth, frames}
+var _invokeDirect = new Map();     // MethodInfo* -> NativeFunction | false
+var _invokeDirectEnabled = true;
+var _invokeStats = { pooled: 0, direct: 0, allocated: 0, frames: 0 };
+
+function _acquireFrame() {
+    var tid = Process.getCurrentThreadId();
+    var stack = _invokeFrames[tid];
+    if (!stack) stack = _invokeFrames[tid] = { depth: 0, frames: [] };
+    var f = stack.frames[stack.depth];
+    if (!f) {
+        var ps = Process.pointerSize;
+        var base = Memory.alloc(ps * INVOKE_MAX_ARGS + 8 * INVOKE_MAX_ARGS + ps);
+        f = { stack: stack, params: base, paramSlots: [], valueSlots: [],
+              exc: base.add(ps * INVOKE_MAX_ARGS + 8 * INVOKE_MAX_ARGS) };
+        for (var i = 0; i < INVOKE_MAX_ARGS; i++) {
+            f.paramSlots.push(base.add(i * ps));
+            f.valueSlots.push(base.add(ps * INVOKE_MAX_ARGS + i * 8));
+        }
+        stack.frames[stack.depth] = f;
+        _invokeStats.frames++;
+    }
+    stack.depth++;
+    return f;
+}
+
+function _releaseFrame(f) {
+    f.stack.depth--;
+}
+
+/** The original allocate-per-call invoke; used past INVOKE_MAX_ARGS and as the benchmark baseline. */
+function _invokeAlloc(methodInfo, obj, args) {
     const exc = Memory.alloc(Process.pointerSize);
     exc.writePointer(ptr(0));
 
@@ -312,7 +567,8 @@ function invokeStatic(methodInfo, args) {
         }
     }
 
-    const result = il2cpp_runtime_invoke(methodInfo, ptr(0), paramsPtr, exc);
+    _invokeStats.allocated++;
+    const result = il2cpp_runtime_invoke(methodInfo, obj, paramsPtr, exc);
 
     const excObj = exc.readPointer();
     if (!excObj.isNull()) {
@@ -321,28 +577,160 @@ function invokeStatic(methodInfo, args) {
     return result;
 }
 
+function _invokePooled(methodInfo, obj, args) {
+    var n = args ? args.length : 0;
+    if (n > INVOKE_MAX_ARGS) return _invokeAlloc(methodInfo, obj, args);
+    var f = _acquireFrame();
+    try {
+        f.exc.writePointer(ptr(0));
+        for (var i = 0; i < n; i++) f.paramSlots[i].writePointer(args[i]);
+        _invokeStats.pooled++;
+        var result = il2cpp_runtime_invoke(methodInfo, obj, n ? f.params : ptr(0), f.exc);
+        if (!f.exc.readPointer().isNull()) throw new Error("IL2CPP exception during invoke");
+        return result;
+    } finally {
+        _releaseFrame(f);
+    }
+}
+
+/**
+ * Call a static method via il2cpp_runtime_invoke.
+ * args: array of NativePointer values (already marshaled as void*).
+ * Returns the Il2CppObject* result (may be null for void methods).
+ * Throws on exception.
+ */
+function invokeStatic(methodInfo, args) {
+    return _invokePooled(methodInfo, ptr(0), args);
+}
+
 /**
  * Call an instance method via il2cpp_runtime_invoke.
  */
 function invokeInstance(methodInfo, obj, args) {
-    const exc = Memory.alloc(Process.pointerSize);
-    exc.writePointer(ptr(0));
+    return _invokePooled(methodInfo, obj, args);
+}
 
-    let paramsPtr = ptr(0);
-    if (args && args.length > 0) {
-        paramsPtr = Memory.alloc(Process.pointerSize * args.length);
-        for (let i = 0; i < args.length; i++) {
-            paramsPtr.add(i * Process.pointerSize).writePointer(args[i]);
+/**
+ * Direct NativeFunction for a static P/Invoke wrapper (DLL_/PVP_ prefix)
+ * taking and returning only System.Int32, or null. IL2CPP compiles those as
+ * int32 fn(int32..., const MethodInfo*), so calling methodPointer skips
+ * runtime_invoke and the result box entirely.
+ */
+function _directFn(methodInfo, argc) {
+    var key = methodInfo.toString();
+    var fn = _invokeDirect.get(key);
+    if (fn !== undefined) return fn || null;
+
+    fn = false;
+    try {
+        var name = readCStr(il2cpp_method_get_name(methodInfo)) || "";
+        var isPInvoke = name.indexOf("DLL_") === 0 || name.indexOf("PVP_") === 0;
+        var isStatic = true;
+        if (il2cpp_method_get_flags) {
+            isStatic = !!(il2cpp_method_get_flags(methodInfo, ptr(0)) & METHOD_ATTRIBUTE_STATIC);
+        }
+        if (isPInvoke && isStatic && il2cpp_method_get_param_count(methodInfo) === argc &&
+            readCStr(il2cpp_type_get_name(il2cpp_method_get_return_type(methodInfo))) === "System.Int32") {
+            var allInt = true;
+            for (var i = 0; i < argc && allInt; i++) {
+                allInt = readCStr(il2cpp_type_get_name(il2cpp_method_get_param(methodInfo, i))) === "System.Int32";
+            }
+            var addr = methodInfo.readPointer();
+            if (allInt && !addr.isNull()) {
+                var sig = [];
+                for (var j = 0; j < argc; j++) sig.push("int32");
+                sig.push("pointer");
+                fn = new NativeFunction(addr, "int32", sig);
+            }
         }
+    } catch (e) {
+        fn = false;
     }
+    _invokeDirect.set(key, fn);
+    return fn || null;
+}
 
-    const result = il2cpp_runtime_invoke(methodInfo, obj, paramsPtr, exc);
+/**
+ * Call a static method with int arguments and return the int result:
+ * callI32(mi, a, b, c). Uses the direct P/Invoke path when the signature
+ * allows it, otherwise runtime_invoke with pooled buffers.
+ */
+function callI32(methodInfo) {
+    var n = arguments.length - 1;
+    var direct = _invokeDirectEnabled ? _directFn(methodInfo, n) : null;
+    if (direct) {
+        _invokeStats.direct++;
+        switch (n) {
+            case 0: return direct(methodInfo);
+            case 1: return direct(arguments[1] | 0, methodInfo);
+            case 2: return direct(arguments[1] | 0, arguments[2] | 0, methodInfo);
+            case 3: return direct(arguments[1] | 0, arguments[2] | 0, arguments[3] | 0, methodInfo);
+        }
+        var dargs = [];
+        for (var d = 1; d <= n; d++) dargs.push(arguments[d] | 0);
+        dargs.push(methodInfo);
+        return direct.apply(null, dargs);
+    }
 
-    const excObj = exc.readPointer();
-    if (!excObj.isNull()) {
-        throw new Error("IL2CPP exception during invoke");
+    if (n > INVOKE_MAX_ARGS) {
+        var boxed = [];
+        for (var b = 1; b <= n; b++) boxed.push(boxInt32(arguments[b]));
+        var r0 = _invokeAlloc(methodInfo, ptr(0), boxed);
+        return (!r0 || r0.isNull()) ? 0 : r0.add(0x10).readS32();
     }
-    return result;
+
+    var f = _acquireFrame();
+    try {
+        f.exc.writePointer(ptr(0));
+        for (var i = 0; i < n; i++) {
+            f.valueSlots[i].writeS32(arguments[i + 1] | 0);
+            f.paramSlots[i].writePointer(f.valueSlots[i]);
+        }
+        _invokeStats.pooled++;
+        var result = il2cpp_runtime_invoke(methodInfo, ptr(0), n ? f.params : ptr(0), f.exc);
+        if (!f.exc.readPointer().isNull()) throw new Error("IL2CPP exception during invoke");
+        return (!result || result.isNull()) ? 0 : result.add(0x10).readS32();
+    } finally {
+        _releaseFrame(f);
+    }
+}
+
+/**
+ * ns per call for getCardNum(0, hand) through the three invoke paths:
+ * "alloc" (fresh buffers, the old behaviour), "pooled" and "direct".
+ */
+function benchInvoke(iterations) {
+    il2cpp_thread_attach(il2cpp_domain_get());
+    var mi = getActiveCardMI();
+    if (!mi || !mi.getCardNum) return { error: "Card methods not resolved" };
+    var n = Math.max(1, iterations | 0);
+    var out = { iterations: n, method: readCStr(il2cpp_method_get_name(mi.getCardNum)) };
+
+    var t0 = Date.now();
+    for (var i = 0; i < n; i++) {
+        var r = _invokeAlloc(mi.getCardNum, ptr(0), [boxInt32(0), boxInt32(ZONE_HAND)]);
+        if (!r.isNull()) r.add(0x10).readS32();
+    }
+    out.allocNs = (Date.now() - t0) * 1e6 / n;
+
+    var wasDirect = _invokeDirectEnabled;
+    _invokeDirectEnabled = false;
+    t0 = Date.now();
+    try {
+        for (var j = 0; j < n; j++) callI32(mi.getCardNum, 0, ZONE_HAND);
+    } finally {
+        _invokeDirectEnabled = wasDirect;
+    }
+    out.pooledNs = (Date.now() - t0) * 1e6 / n;
+
+    if (_directFn(mi.getCardNum, 2)) {
+        t0 = Date.now();
+        for (var k = 0; k < n; k++) callI32(mi.getCardNum, 0, ZONE_HAND);
+        out.directNs = (Date.now() - t0) * 1e6 / n;
+    } else {
+        out.directNs = null;  // signature not eligible
+    }
+    return out;
 }
 
 /**
@@ -510,20 +898,10 @@ function readDictionaryObj(dictObj, dictClass, depth) {
         if (count <= 0) return result;
 
         // Find _entries array field
-        var fIter = Memory.alloc(Process.pointerSize);
-        fIter.writePointer(ptr(0));
-        var entriesField = null;
-        while (true) {
-            var field = il2cpp_class_get_fields(dictClass, fIter);
-            if (field.isNull()) break;
-            if (readCStr(il2cpp_field_get_name(field)) === "_entries") {
-                entriesField = field;
-                break;
-            }
-        }
+        var entriesField = findField(dictClass, "_entries");
         if (!entriesField) { result._note = "_entries not found"; return result; }
 
-        var entriesOffset = il2cpp_field_get_offset(entriesField);
+        var entriesOffset = entriesField.offset;
         var entriesArr = dictObj.add(entriesOffset).readPointer();
         if (entriesArr.isNull()) return result;
 
@@ -576,20 +954,10 @@ function readListObj(listObj, listClass, depth) {
         if (count <= 0) return result;
 
         // List<T> stores items in _items array field
-        var fIter = Memory.alloc(Process.pointerSize);
-        fIter.writePointer(ptr(0));
-        var itemsField = null;
-        while (true) {
-            var field = il2cpp_class_get_fields(listClass, fIter);
-            if (field.isNull()) break;
-            if (readCStr(il2cpp_field_get_name(field)) === "_items") {
-                itemsField = field;
-                break;
-            }
-        }
+        var itemsField = findField(listClass, "_items");
         if (!itemsField) { result._note = "_items not found"; return result; }
 
-        var itemsOffset = il2cpp_field_get_offset(itemsField);
+        var itemsOffset = itemsField.offset;
         var itemsArr = listObj.add(itemsOffset).readPointer();
         if (itemsArr.isNull()) return result;
 
@@ -628,18 +996,7 @@ function getDictEntries(dictObj) {
         // Easier: use GetEnumerator and iterate
         // Actually simplest: use the class fields directly
         // Find _entries field on the dict class
-        var fIter = Memory.alloc(Process.pointerSize);
-        fIter.writePointer(ptr(0));
-        var entriesField = null;
-        while (true) {
-            var field = il2cpp_class_get_fields(dictClass, fIter);
-            if (field.isNull()) break;
-            var fname = readCStr(il2cpp_field_get_name(field));
-            if (fname === "_entries") {
-                entriesField = field;
-                break;
-            }
-        }
+        var entriesField = findField(dictClass, "_entries");
 
         if (!entriesField) {
             // Fallback: try to read keys one by one is complex
@@ -649,7 +1006,7 @@ function getDictEntries(dictObj) {
         }
 
         // Read _entries array from the object instance
-        var entriesOffset = il2cpp_field_get_offset(entriesField);
+        var entriesOffset = entriesField.offset;
         var entriesArr = dictObj.add(entriesOffset).readPointer();
         if (entriesArr.isNull()) return results;
 
@@ -840,19 +1197,12 @@ var _uidCardIdCache = {};    // UID -> cardId cache (survives intermittent 0 ret
  * Uses il2cpp_field_static_get_value to read the raw byte.
  */
 function readEngineStaticByte(engineKlass, fieldName) {
-    var iter = Memory.alloc(Process.pointerSize);
-    iter.writePointer(ptr(0));
-    while (true) {
-        var field = il2cpp_class_get_fields(engineKlass, iter);
-        if (field.isNull()) return -1;
-        if (readCStr(il2cpp_field_get_name(field)) === fieldName &&
-            !il2cpp_field_is_literal(field)) {
-            var buf = Memory.alloc(4);
-            buf.writeU32(0);
-            il2cpp_field_static_get_value(field, buf);
-            return buf.readU8();
-        }
-    }
+    var f = findField(engineKlass, fieldName);
+    if (!f) return -1;
+    var buf = Memory.alloc(4);
+    buf.writeU32(0);
+    il2cpp_field_static_get_value(f.field, buf);
+    return buf.readU8();
 }
 
 /**
@@ -864,6 +1214,11 @@ var _isOnlineCache = null;  // null = unknown, true/false = detected
 
 function isOnlineMode() {
     if (_isOnlineCache !== null) return _isOnlineCache;
+    // a negative probe isn't cached globally, but inside one batch it holds
+    return _batchMemo("online", _probeOnlineMode);
+}
+
+function _probeOnlineMode() {
 
     var engineKlass = findEngineClass();
     if (!engineKlass) return false;
@@ -878,18 +1233,10 @@ function isOnlineMode() {
         try {
             // IL2CPP objects: header (klass+monitor) is 0x10 on 64-bit, then fields
             // isOnlineMode offset from field enumeration is relative offset within fields
-            var fIter = Memory.alloc(Process.pointerSize);
-            fIter.writePointer(ptr(0));
-            while (true) {
-                var field = il2cpp_class_get_fields(engineKlass, fIter);
-                if (field.isNull()) break;
-                if (readCStr(il2cpp_field_get_name(field)) === "isOnlineMode" &&
-                    !il2cpp_field_is_literal(field)) {
-                    var offset = il2cpp_field_get_offset(field);
-                    var instVal = inst.add(offset).readU8();
-                    if (instVal === 1) { _isOnlineCache = true; return true; }
-                    break;
-                }
+            var onlineField = findField(engineKlass, "isOnlineMode");
+            if (onlineField) {
+                var instVal = inst.add(onlineField.offset).readU8();
+                if (instVal === 1) { _isOnlineCache = true; return true; }
             }
         } catch (e) {}
     }
@@ -898,14 +1245,14 @@ function isOnlineMode() {
     try {
         if (!resolvePvpCardMethods()) return false;  // don't cache — may succeed later
         if (_pvpTurnMI && _pvpTurnMI.getLP) {
-            var pvpLP = callCardFn(_pvpTurnMI.getLP, [boxInt32(0)]);
+            var pvpLP = callI32(_pvpTurnMI.getLP, 0);
             if (pvpLP > 0) {
                 send("isOnlineMode: detected via PVP_DuelGetLP probe (LP=" + pvpLP + ")");
                 _isOnlineCache = true;
                 return true;
             }
             // Also try player 1 in case player 0 LP isn't ready yet
-            pvpLP = callCardFn(_pvpTurnMI.getLP, [boxInt32(1)]);
+            pvpLP = callI32(_pvpTurnMI.getLP, 1);
             if (pvpLP > 0) {
                 send("isOnlineMode: detected via PVP_DuelGetLP(1) probe (LP=" + pvpLP + ")");
                 _isOnlineCache = true;
@@ -935,15 +1282,15 @@ function detectPvpMyselfIndex() {
 
     try {
         // DLL_ player 0 hand count = our hand in engine numbering
-        var dllHand = callCardFn(_cardMI.getCardNum, [boxInt32(0), boxInt32(13)]);
-        var dllDeck = callCardFn(_cardMI.getCardNum, [boxInt32(0), boxInt32(15)]);
+        var dllHand = callI32(_cardMI.getCardNum, 0, 13);
+        var dllDeck = callI32(_cardMI.getCardNum, 0, 15);
         if (dllHand <= 0 && dllDeck <= 0) return -1;  // duel not started yet
 
         // PVP_ player 0 and 1 hand+deck counts
-        var pvpHand0 = callCardFn(_pvpCardMI.getCardNum, [boxInt32(0), boxInt32(13)]);
-        var pvpDeck0 = callCardFn(_pvpCardMI.getCardNum, [boxInt32(0), boxInt32(15)]);
-        var pvpHand1 = callCardFn(_pvpCardMI.getCardNum, [boxInt32(1), boxInt32(13)]);
-        var pvpDeck1 = callCardFn(_pvpCardMI.getCardNum, [boxInt32(1), boxInt32(15)]);
+        var pvpHand0 = callI32(_pvpCardMI.getCardNum, 0, 13);
+        var pvpDeck0 = callI32(_pvpCardMI.getCardNum, 0, 15);
+        var pvpHand1 = callI32(_pvpCardMI.getCardNum, 1, 13);
+        var pvpDeck1 = callI32(_pvpCardMI.getCardNum, 1, 15);
 
         // Match: which PVP index has same hand+deck as DLL player 0?
         var dllTotal = dllHand + dllDeck;
@@ -1171,9 +1518,9 @@ function callCardFn(methodInfo, args) {
     return result.add(0x10).readS32();
 }
 
-/** Get card name from Card.Content singleton. Returns string or null. */
+/** Read card name from Card.Content singleton (uncached). Returns string or null. */
 var _contentInstance = null;
-function getCardName(cardId, mi) {
+function _invokeCardName(cardId, mi) {
     var activeMI = mi || _cardMI || _pvpCardMI;
     if (!activeMI || !activeMI.contentGetName) return null;
     try {
@@ -1190,8 +1537,8 @@ function getCardName(cardId, mi) {
     }
 }
 
-/** Get card description from Card.Content singleton. Returns string or null. */
-function getCardDesc(cardId, mi) {
+/** Read card description from Card.Content singleton (uncached). Returns string or null. */
+function _invokeCardDesc(cardId, mi) {
     var activeMI = mi || _cardMI || _pvpCardMI;
     if (!activeMI || !activeMI.contentGetDesc) return null;
     try {
@@ -1208,9 +1555,65 @@ function getCardDesc(cardId, mi) {
     }
 }
 
+// ── Card text cache ──
+// Name/desc never change for a cardId, so they are read once through
+// Card.Content and kept in an LRU. _cardTextSent tracks which ids the Python
+// CardCatalog already holds; gameState only ships text for the rest.
+
+const CARD_TEXT_CACHE_MAX = 2048;
+var _cardTextCache = new Map();  // cardId -> {name, desc}; Map order doubles as LRU order
+var _cardTextSent = {};          // cardId -> true once delivered to (or primed by) Python
+var _cardTextStats = { hits: 0, misses: 0, evictions: 0 };
+
+/** Cached {name, desc} for a cardId. Failed lookups are not cached. */
+function getCardText(cardId, mi) {
+    var entry = _cardTextCache.get(cardId);
+    if (entry) {
+        _cardTextCache.delete(cardId);
+        _cardTextCache.set(cardId, entry);
+        _cardTextStats.hits++;
+        return entry;
+    }
+    _cardTextStats.misses++;
+    entry = { name: _invokeCardName(cardId, mi), desc: _invokeCardDesc(cardId, mi) };
+    // Content may not be loaded yet — retry on the next call instead of caching nulls
+    if (entry.name === null) return entry;
+    _cardTextCache.set(cardId, entry);
+    while (_cardTextCache.size > CARD_TEXT_CACHE_MAX) {
+        _cardTextCache.delete(_cardTextCache.keys().next().value);
+        _cardTextStats.evictions++;
+    }
+    return entry;
+}
+
+/** Get card name (cached). Returns string or null. */
+function getCardName(cardId, mi) {
+    return getCardText(cardId, mi).name;
+}
+
+/** Get card description (cached). Returns string or null. */
+function getCardDesc(cardId, mi) {
+    return getCardText(cardId, mi).desc;
+}
+
+/**
+ * Collect text for cardIds the Python side hasn't seen yet into newCards
+ * ({cardId: [name, desc]}) and mark them as sent.
+ */
+function collectNewCardText(cards, newCards, mi) {
+    for (var i = 0; i < cards.length; i++) {
+        var cardId = cards[i].cardId;
+        if (cardId <= 0 || _cardTextSent[cardId] || newCards[cardId]) continue;
+        var text = getCardText(cardId, mi);
+        if (text.name === null) continue;
+        newCards[cardId] = [text.name, text.desc];
+        _cardTextSent[cardId] = true;
+    }
+}
+
 /**
  * Query cards in a specific zone for a player using il2cpp_runtime_invoke.
- * Returns array of {cardId, name, uid, face, zone, index}.
+ * Returns array of {cardId, uid, face, zone, index}; text comes from getCardText.
  * zoneLabel is a short string for display (e.g. "M2" for monster zone 2).
  * mi: optional method info set to use (defaults to auto-detect via getActiveCardMI).
  */
@@ -1220,24 +1623,23 @@ function getCardsInZone(player, zoneVal, zoneLabel, mi) {
     var cards = [];
     var useDllFallback = (_cardMI && activeMI !== _cardMI);
     try {
-        var count = callCardFn(activeMI.getCardNum, [boxInt32(player), boxInt32(zoneVal)]);
+        var count = callI32(activeMI.getCardNum, player, zoneVal);
         // Fallback: if PVP_ getCardNum returned 0, try DLL_ version
         if (count <= 0 && useDllFallback) {
-            count = callCardFn(_cardMI.getCardNum, [boxInt32(player), boxInt32(zoneVal)]);
+            count = callI32(_cardMI.getCardNum, player, zoneVal);
         }
         for (var i = 0; i < count && i < 20; i++) {
-            var uid = callCardFn(activeMI.getCardUID, [boxInt32(player), boxInt32(zoneVal), boxInt32(i)]);
+            var uid = callI32(activeMI.getCardUID, player, zoneVal, i);
             // Fallback: if PVP_ getCardUID returned 0, try DLL_ version
             if (uid <= 0 && useDllFallback) {
-                uid = callCardFn(_cardMI.getCardUID, [boxInt32(player), boxInt32(zoneVal), boxInt32(i)]);
+                uid = callI32(_cardMI.getCardUID, player, zoneVal, i);
             }
             var cardId = 0;
-            var name = null;
             if (uid > 0) {
-                cardId = callCardFn(activeMI.getCardIDByUID, [boxInt32(uid)]);
+                cardId = callI32(activeMI.getCardIDByUID, uid);
                 // Fallback: if PVP_ method returned 0, try DLL_ version
                 if (cardId <= 0 && useDllFallback) {
-                    cardId = callCardFn(_cardMI.getCardIDByUID, [boxInt32(uid)]);
+                    cardId = callI32(_cardMI.getCardIDByUID, uid);
                 }
                 // Cache hit: use previously resolved cardId if current call returned 0
                 if (cardId > 0) {
@@ -1245,15 +1647,13 @@ function getCardsInZone(player, zoneVal, zoneLabel, mi) {
                 } else if (_uidCardIdCache[uid]) {
                     cardId = _uidCardIdCache[uid];
                 }
-                if (cardId > 0) name = getCardName(cardId, activeMI);
             }
-            var face = callCardFn(activeMI.getCardFace, [boxInt32(player), boxInt32(zoneVal), boxInt32(i)]);
+            var face = callI32(activeMI.getCardFace, player, zoneVal, i);
             // Fallback: if PVP_ getCardFace returned invalid, try DLL_ version
             if ((face === null || face === undefined) && useDllFallback) {
-                face = callCardFn(_cardMI.getCardFace, [boxInt32(player), boxInt32(zoneVal), boxInt32(i)]);
+                face = callI32(_cardMI.getCardFace, player, zoneVal, i);
             }
-            var desc = (cardId > 0) ? getCardDesc(cardId, activeMI) : null;
-            cards.push({ cardId: cardId, name: name, desc: desc, uid: uid, face: face, zone: zoneLabel, index: i });
+            cards.push({ cardId: cardId, uid: uid, face: face, zone: zoneLabel, index: i });
         }
     } catch (e) {
         send("getCardsInZone error (zone=" + zoneVal + "): " + e.message);
@@ -1584,6 +1984,159 @@ function removeRevealHooks() {
     return { success: true };
 }
 
+// ── Batched reads ──
+//
+// batch() runs several read-only exports in one agent invocation. While a
+// batch is running, values that every read would otherwise re-derive (the
+// online-mode probe, the DLL_ myself/rival seats) are computed once and
+// shared through _batchCtx.
+
+const BATCH_READS = ["active", "status", "gameState", "pushState", "getCommands",
+                     "getInputState", "getDuelResult", "defaultLocation", "duelEventStats"];
+
+var _batchCtx = null;
+var _batchStats = { batches: 0, reads: 0, lastMs: 0 };
+
+function _batchMemo(key, compute) {
+    if (!_batchCtx) return compute();
+    if (!_batchCtx.hasOwnProperty(key)) _batchCtx[key] = compute();
+    return _batchCtx[key];
+}
+
+/** DLL_DuelMyself / DLL_DuelRival as {myself, rival}; -1 where unavailable. */
+function _engineSeats() {
+    return _batchMemo("seats", function () {
+        var seats = { myself: -1, rival: -1 };
+        try {
+            if (_duelMyselfFn) seats.myself = _duelMyselfFn(ptr(0));
+            if (_duelRivalFn) seats.rival = _duelRivalFn(ptr(0));
+        } catch (e) {}
+        return seats;
+    });
+}
+
+/**
+ * Run each read in order. Entries are export names or [name, arg...].
+ * Returns {results, errors, ms} where results[i] is the value of reads[i],
+ * or {error: message} if it isn't batchable or threw; errors counts those.
+ */
+function runBatch(reads) {
+    var t0 = Date.now();
+    il2cpp_thread_attach(il2cpp_domain_get());
+
+    var results = [], errors = 0;
+    _batchCtx = {};
+    try {
+        for (var i = 0; i < reads.length; i++) {
+            var entry = Array.isArray(reads[i]) ? reads[i] : [reads[i]];
+            var name = entry[0];
+            if (BATCH_READS.indexOf(name) < 0) {
+                results.push({ error: name + ": not a batchable read" });
+                errors++;
+                continue;
+            }
+            try {
+                results.push(rpc.exports[name].apply(null, entry.slice(1)));
+            } catch (e) {
+                results.push({ error: e.message });
+                errors++;
+            }
+        }
+    } finally {
+        _batchCtx = null;
+    }
+
+    var ms = Date.now() - t0;
+    _batchStats.batches++;
+    _batchStats.reads += reads.length;
+    _batchStats.lastMs = ms;
+    return { results: results, errors: errors, ms: ms };
+}
+
+// ── Versioned state stream ──
+// The agent remembers the last gameState it pushed and send()s only the
+// zones that changed: {type: "duelState", rev, base, patch, cards}. Field
+// objects (myField/rivalField) are diffed one level deeper so a single
+// monster moving doesn't resend the spell zones. Python applies patches in
+// order and asks for a full snapshot whenever base doesn't match its rev.
+
+const STREAM_NESTED_KEYS = { myField: true, rivalField: true };
+
+var _streamRev = 0;
+var _streamLast = null;   // "key" / "key.sub" -> JSON of the last pushed value
+var _streamTimer = null;
+var _streamStats = { pushes: 0, unchanged: 0, full: 0, resets: 0 };
+
+function _diffState(state, full) {
+    var patch = {};
+    var seen = {};
+    var changed = false;
+    for (var key in state) {
+        if (key === "cards") continue;
+        var value = state[key];
+        if (STREAM_NESTED_KEYS[key] && value !== null && typeof value === "object") {
+            for (var sub in value) {
+                var subKey = key + "." + sub;
+                var subJson = JSON.stringify(value[sub]);
+                seen[subKey] = subJson;
+                if (full || _streamLast === null || _streamLast[subKey] !== subJson) {
+                    if (!patch[key]) patch[key] = {};
+                    patch[key][sub] = value[sub];
+                    changed = true;
+                }
+            }
+            continue;
+        }
+        var json = JSON.stringify(value);
+        seen[key] = json;
+        if (full || _streamLast === null || _streamLast[key] !== json) {
+            patch[key] = value;
+            changed = true;
+        }
+    }
+    return { patch: patch, seen: seen, changed: changed };
+}
+
+/**
+ * Read gameState and push the delta against the last pushed snapshot.
+ * full=true resends every zone (Python resync). Returns {rev, changed}.
+ */
+function pushStateDelta(full) {
+    var state = rpc.exports.gameState();
+    if (state.error) {
+        if (_streamLast !== null || full) {
+            _streamLast = null;
+            _streamRev++;
+            _streamStats.resets++;
+            send({ type: "duelState", rev: _streamRev, base: _streamRev - 1, reset: true });
+            return { rev: _streamRev, changed: true, active: false };
+        }
+        return { rev: _streamRev, changed: false, active: false };
+    }
+
+    var isFull = !!full || _streamLast === null;
+    var diff = _diffState(state, isFull);
+    var hasCards = Object.keys(state.cards || {}).length > 0;
+    if (!diff.changed && !hasCards) {
+        _streamStats.unchanged++;
+        return { rev: _streamRev, changed: false, active: true };
+    }
+
+    _streamLast = diff.seen;
+    _streamRev++;
+    _streamStats.pushes++;
+    if (isFull) _streamStats.full++;
+    send({
+        type: "duelState",
+        rev: _streamRev,
+        base: isFull ? null : _streamRev - 1,
+        full: isFull,
+        patch: diff.patch,
+        cards: state.cards || {}
+    });
+    return { rev: _streamRev, changed: diff.changed, active: true };
+}
+
 // ══════════════════════════════════════════
 // RPC exports
 // ══════════════════════════════════════════
@@ -1591,6 +2144,29 @@ function removeRevealHooks() {
 rpc.exports = {
     ping: function () { return "pong"; },
 
+    /**
+     * Metadata index counters: lookups served from the index (hits) vs. ones
+     * that had to build the index or a per-class table first (cold).
+     */
+    indexStats: function () {
+        var stats = {};
+        for (var k in _metaStats) stats[k] = _metaStats[k];
+        stats.built = _metaIndex !== null;
+        if (_metaIndex !== null) {
+            stats.methodTables = Object.keys(_metaIndex.methods).length;
+            stats.fieldTables = Object.keys(_metaIndex.fields).length;
+        }
+        return stats;
+    },
+
+    /**
+     * Drop the metadata index and resolved method caches; the next lookup rebuilds.
+     */
+    invalidateIndex: function () {
+        invalidateMetaIndex("rpc");
+        return { success: true, invalidations: _metaStats.invalidations };
+    },
+
     /**
      * Enumerate IL2CPP classes matching a namespace prefix.
      * Returns array of {namespace, class, methods: [{name, params, isStatic}], fields: [{name, offset, isStatic, isLiteral}]}
@@ -1614,11 +2190,8 @@ rpc.exports = {
 
         var online = isOnlineMode();
 
-        let myself = -1, rival = -1;
-        try {
-            if (_duelMyselfFn) myself = _duelMyselfFn(ptr(0));
-            if (_duelRivalFn) rival = _duelRivalFn(ptr(0));
-        } catch (e) {}
+        var seats = _engineSeats();
+        let myself = seats.myself, rival = seats.rival;
 
         var lp0 = 0, lp1 = 0, xorKey = 0;
 
@@ -1626,8 +2199,8 @@ rpc.exports = {
         resolvePvpCardMethods();
         if (_pvpTurnMI && _pvpTurnMI.getLP) {
             try {
-                lp0 = callCardFn(_pvpTurnMI.getLP, [boxInt32(0)]);
-                lp1 = callCardFn(_pvpTurnMI.getLP, [boxInt32(1)]);
+                lp0 = callI32(_pvpTurnMI.getLP, 0);
+                lp1 = callI32(_pvpTurnMI.getLP, 1);
             } catch (e) {}
             if (lp0 > 0 || lp1 > 0) {
                 online = true;
@@ -1686,10 +2259,7 @@ rpc.exports = {
         if (!inst || inst.isNull()) return { error: "No duel active" };
 
         // Get rival index
-        let rival = 1;
-        try {
-            if (_duelRivalFn) rival = _duelRivalFn(ptr(0));
-        } catch (e) {}
+        let rival = _engineSeats().rival;
         if (rival < 0 || rival > 1) rival = 1;
 
         // Read current LP
@@ -2784,7 +3354,7 @@ rpc.exports = {
 
         // ---- Helper: hook any VC's OnCreatedView -> auto OnBack ----
         // Uses onEnter only (onLeave can crash on IL2CPP methods).
-        // Queues OnBack on the main thread via _mainThreadQueue.
+        // Queues OnBack on the main thread via _enqueueMainThread.
         function hookVcOnBack(ns, className) {
             var cls = findClassByName(ns, className);
             if (!cls) return false;
@@ -2802,13 +3372,10 @@ rpc.exports = {
                     send("[AutoAdv] " + tag + ".OnCreatedView — will queue OnBack");
                     // Delay 300ms to let VC fully initialize, then queue on main thread
                     setTimeout(function () {
-                        _mainThreadQueue.push({
-                            fn: function () {
-                                invokeInstance(ref, inst, []);
-                                send("[AutoAdv] " + tag + ".OnBack called (main thread)");
-                                return tag + ".OnBack";
-                            },
-                            done: false, result: null, error: null
+                        _enqueueMainThread(function () {
+                            invokeInstance(ref, inst, []);
+                            send("[AutoAdv] " + tag + ".OnBack called (main thread)");
+                            return tag + ".OnBack";
                         });
                     }, 300);
                 }
@@ -2835,13 +3402,10 @@ rpc.exports = {
                         var ref = _notifOnBack;
                         send("[AutoAdv] NotificationVC.NotificationStackEntry — will queue OnBack");
                         setTimeout(function () {
-                            _mainThreadQueue.push({
-                                fn: function () {
-                                    invokeInstance(ref, inst, []);
-                                    send("[AutoAdv] NotificationVC.OnBack called (main thread)");
-                                    return "NotifVC.OnBack";
-                                },
-                                done: false, result: null, error: null
+                            _enqueueMainThread(function () {
+                                invokeInstance(ref, inst, []);
+                                send("[AutoAdv] NotificationVC.OnBack called (main thread)");
+                                return "NotifVC.OnBack";
                             });
                         }, 500);
                     }
@@ -3348,7 +3912,7 @@ rpc.exports = {
         var hand = [];
         for (var i = 0; i < handCards.length; i++) {
             var c = handCards[i];
-            hand.push({ id: c.cardId, name: c.name });
+            hand.push({ id: c.cardId, name: getCardName(c.cardId) });
         }
 
         // Query rival's field zones for face-down cards
@@ -3359,7 +3923,7 @@ rpc.exports = {
             var cards = getCardsInZone(rival, z, "M" + z);
             for (var i = 0; i < cards.length; i++) {
                 if (cards[i].face === 0) {
-                    facedown.push({ id: cards[i].cardId, name: cards[i].name,
+                    facedown.push({ id: cards[i].cardId, name: getCardName(cards[i].cardId),
                                     zone: "M", index: z });
                 }
             }
@@ -3369,7 +3933,7 @@ rpc.exports = {
             var cards = getCardsInZone(rival, z, "EM" + (z - ZONE_EXTRA_MONSTER_1 + 1));
             for (var i = 0; i < cards.length; i++) {
                 if (cards[i].face === 0) {
-                    facedown.push({ id: cards[i].cardId, name: cards[i].name,
+                    facedown.push({ id: cards[i].cardId, name: getCardName(cards[i].cardId),
                                     zone: "EM", index: z - ZONE_EXTRA_MONSTER_1 + 1 });
                 }
             }
@@ -3380,7 +3944,7 @@ rpc.exports = {
             var cards = getCardsInZone(rival, z, "S" + (z - ZONE_SPELL_START + 1));
             for (var i = 0; i < cards.length; i++) {
                 if (cards[i].face === 0) {
-                    facedown.push({ id: cards[i].cardId, name: cards[i].name,
+                    facedown.push({ id: cards[i].cardId, name: getCardName(cards[i].cardId),
                                     zone: "S", index: z - ZONE_SPELL_START + 1 });
                 }
             }
@@ -3428,10 +3992,10 @@ rpc.exports = {
 
         // Game state
         try {
-            if (whichTurn) results.whichTurn = callCardFn(whichTurn, []);
-            if (getPhase) results.phase = callCardFn(getPhase, []);
-            if (getTurnNum) results.turnNum = callCardFn(getTurnNum, []);
-            if (getDuelFinish) results.duelFinish = callCardFn(getDuelFinish, []);
+            if (whichTurn) results.whichTurn = callI32(whichTurn);
+            if (getPhase) results.phase = callI32(getPhase);
+            if (getTurnNum) results.turnNum = callI32(getTurnNum);
+            if (getDuelFinish) results.duelFinish = callI32(getDuelFinish);
         } catch(e) { results.stateError = e.message; }
 
         // Zone scan: test ALL values 0-70 to find every zone
@@ -3445,18 +4009,15 @@ rpc.exports = {
             for (var ti = 0; ti < testVals.length; ti++) {
                 var zv = testVals[ti];
                 try {
-                    var count = callCardFn(_cardMI.getCardNum,
-                        [boxInt32(p), boxInt32(zv)]);
+                    var count = callI32(_cardMI.getCardNum, p, zv);
                     if (count > 0 && count < 100) {
                         var cards = [];
                         for (var i = 0; i < count && i < 15; i++) {
-                            var uid = callCardFn(_cardMI.getCardUID,
-                                [boxInt32(p), boxInt32(zv), boxInt32(i)]);
-                            var face = callCardFn(_cardMI.getCardFace,
-                                [boxInt32(p), boxInt32(zv), boxInt32(i)]);
+                            var uid = callI32(_cardMI.getCardUID, p, zv, i);
+                            var face = callI32(_cardMI.getCardFace, p, zv, i);
                             var cardId = 0, name = null;
                             if (uid > 0) {
-                                cardId = callCardFn(_cardMI.getCardIDByUID, [boxInt32(uid)]);
+                                cardId = callI32(_cardMI.getCardIDByUID, uid);
                                 if (cardId > 0) name = getCardName(cardId);
                             }
                             cards.push({i:i, uid:uid, cid:cardId, name:name, face:face});
@@ -3473,12 +4034,12 @@ rpc.exports = {
         if (getCardInHand && listGetMax && listGetID) {
             for (var p = 0; p <= 1; p++) {
                 try {
-                    callCardFn(getCardInHand, [boxInt32(p)]);
-                    var max = callCardFn(listGetMax, []);
+                    callI32(getCardInHand, p);
+                    var max = callI32(listGetMax);
                     var items = [];
                     for (var i = 0; i < max && i < 15; i++) {
-                        var cid = callCardFn(listGetID, [boxInt32(i)]);
-                        var uid = listGetUID ? callCardFn(listGetUID, [boxInt32(i)]) : -1;
+                        var cid = callI32(listGetID, i);
+                        var uid = listGetUID ? callI32(listGetUID, i) : -1;
                         var nm = getCardName(cid);
                         items.push({cid:cid, uid:uid, name:nm});
                     }
@@ -3495,7 +4056,7 @@ rpc.exports = {
             var knownUIDs = [1,2,3,4,5,6,7,8,9,10,23];
             for (var ui = 0; ui < knownUIDs.length; ui++) {
                 try {
-                    var r = callCardFn(searchByUID, [boxInt32(knownUIDs[ui])]);
+                    var r = callI32(searchByUID, knownUIDs[ui]);
                     if (r !== 0) results.searchUID["uid" + knownUIDs[ui]] = r;
                 } catch(e) {}
             }
@@ -3508,7 +4069,7 @@ rpc.exports = {
                 var opens = [];
                 for (var i = 0; i < 10; i++) {
                     try {
-                        var r = callCardFn(getHandOpen, [boxInt32(p), boxInt32(i)]);
+                        var r = callI32(getHandOpen, p, i);
                         opens.push(r);
                     } catch(e) { break; }
                 }
@@ -3524,7 +4085,7 @@ rpc.exports = {
                 for (var ti = 0; ti < testVals.length; ti++) {
                     var zv = testVals[ti];
                     try {
-                        var r = callCardFn(isCardExist, [boxInt32(p), boxInt32(zv)]);
+                        var r = callI32(isCardExist, p, zv);
                         if (r !== 0) exists["z" + zv] = r;
                     } catch(e) {}
                 }
@@ -3539,7 +4100,7 @@ rpc.exports = {
                 var tops = {};
                 for (var zv = 0; zv <= 8; zv++) {
                     try {
-                        var r = callCardFn(topCard, [boxInt32(p), boxInt32(zv)]);
+                        var r = callI32(topCard, p, zv);
                         if (r !== 0 && r !== -1) tops["z" + zv] = r;
                     } catch(e) {}
                 }
@@ -3564,12 +4125,10 @@ rpc.exports = {
 
         var filter = (prefix !== undefined && prefix !== null) ? prefix : "DLL_DuelCom";
         var methods = [];
-        var iter = Memory.alloc(Process.pointerSize);
-        iter.writePointer(ptr(0));
+        var engineMethods = classMethods(engineKlass);
 
-        while (true) {
-            var method = il2cpp_class_get_methods(engineKlass, iter);
-            if (method.isNull()) break;
+        for (var mi = 0; mi < engineMethods.length; mi++) {
+            var method = engineMethods[mi];
 
             var mName = readCStr(il2cpp_method_get_name(method));
             if (filter && mName.indexOf(filter) !== 0) continue;
@@ -3609,7 +4168,10 @@ rpc.exports = {
     /**
      * Get complete game state snapshot for autopilot decision-making.
      * Returns {myself, rival, myLP, rivalLP, turnPlayer, phase, turnNum,
-     *          myHand, rivalHand, myField, rivalField, myGY, rivalGY, myDeck, rivalDeck}.
+     *          myHand, rivalHand, myField, rivalField, myGY, rivalGY, myDeck, rivalDeck,
+     *          cards}.
+     * Cards carry ids only; `cards` holds {cardId: [name, desc]} for ids the
+     * Python CardCatalog hasn't received yet.
      */
     gameState: function () {
         var domain = il2cpp_domain_get();
@@ -3636,10 +4198,9 @@ rpc.exports = {
                 rival = detected === 0 ? 1 : 0;
             }
         } else {
-            try {
-                if (_duelMyselfFn) myself = _duelMyselfFn(ptr(0));
-                if (_duelRivalFn) rival = _duelRivalFn(ptr(0));
-            } catch (e) {}
+            var seats = _engineSeats();
+            if (seats.myself !== -1) myself = seats.myself;
+            if (seats.rival !== -1) rival = seats.rival;
         }
         if (myself < 0 || myself > 1) myself = 0;
         if (rival < 0 || rival > 1) rival = 1;
@@ -3648,8 +4209,8 @@ rpc.exports = {
         var myLP = 0, rivalLP = 0;
         if (_pvpTurnMI && _pvpTurnMI.getLP) {
             try {
-                myLP = callCardFn(_pvpTurnMI.getLP, [boxInt32(myself)]);
-                rivalLP = callCardFn(_pvpTurnMI.getLP, [boxInt32(rival)]);
+                myLP = callI32(_pvpTurnMI.getLP, myself);
+                rivalLP = callI32(_pvpTurnMI.getLP, rival);
             } catch (e) {}
             if (myLP > 0 || rivalLP > 0) {
                 online = true;  // confirmed PvP
@@ -3677,9 +4238,9 @@ rpc.exports = {
         var turnPlayer = -1, phase = -1, turnNum = -1;
         if (_pvpTurnMI) {
             try {
-                if (_pvpTurnMI.whichTurn) turnPlayer = callCardFn(_pvpTurnMI.whichTurn, []);
-                if (_pvpTurnMI.getPhase) phase = callCardFn(_pvpTurnMI.getPhase, []);
-                if (_pvpTurnMI.getTurnNum) turnNum = callCardFn(_pvpTurnMI.getTurnNum, []);
+                if (_pvpTurnMI.whichTurn) turnPlayer = callI32(_pvpTurnMI.whichTurn);
+                if (_pvpTurnMI.getPhase) phase = callI32(_pvpTurnMI.getPhase);
+                if (_pvpTurnMI.getTurnNum) turnNum = callI32(_pvpTurnMI.getTurnNum);
             } catch (e) {}
         }
         if (turnNum <= 0) {
@@ -3688,9 +4249,9 @@ rpc.exports = {
                 var whichTurn = findMethodByName(engineKlass, "DLL_DuelWhichTurnNow", -1);
                 var getPhase = findMethodByName(engineKlass, "DLL_DuelGetCurrentPhase", -1);
                 var getTurnNum = findMethodByName(engineKlass, "DLL_DuelGetTurnNum", -1);
-                if (whichTurn) { var v = callCardFn(whichTurn, []); if (v >= 0) turnPlayer = v; }
-                if (getPhase) { var v = callCardFn(getPhase, []); if (v >= 0) phase = v; }
-                if (getTurnNum) { var v = callCardFn(getTurnNum, []); if (v > 0) turnNum = v; }
+                if (whichTurn) { var v = callI32(whichTurn); if (v >= 0) turnPlayer = v; }
+                if (getPhase) { var v = callI32(getPhase); if (v >= 0) phase = v; }
+                if (getTurnNum) { var v = callI32(getTurnNum); if (v > 0) turnNum = v; }
             } catch (e) {}
         }
 
@@ -3741,9 +4302,9 @@ rpc.exports = {
         }
         var myGY = zoneCards(myself, ZONE_GRAVE, "GY");
         var myDeckCount = 0;
-        try { myDeckCount = callCardFn(activeMI.getCardNum, [boxInt32(myself), boxInt32(15)]); } catch (e) {}
+        try { myDeckCount = callI32(activeMI.getCardNum, myself, 15); } catch (e) {}
         var myExtraDeckCount = 0;
-        try { myExtraDeckCount = callCardFn(activeMI.getCardNum, [boxInt32(myself), boxInt32(14)]); } catch (e) {}
+        try { myExtraDeckCount = callI32(activeMI.getCardNum, myself, 14); } catch (e) {}
 
         // ── RIVAL side ──
         var rivalHand = zoneCards(rival, ZONE_HAND, "H");
@@ -3761,12 +4322,19 @@ rpc.exports = {
         }
         var rivalGY = zoneCards(rival, ZONE_GRAVE, "GY");
         var rivalDeckCount = 0;
-        try { rivalDeckCount = callCardFn(activeMI.getCardNum, [boxInt32(rival), boxInt32(15)]); } catch (e) {}
+        try { rivalDeckCount = callI32(activeMI.getCardNum, rival, 15); } catch (e) {}
 
         // Banished zones (z17)
         var myBanished = zoneCards(myself, 17, "BN");
         var rivalBanished = zoneCards(rival, 17, "BN");
 
+        var newCards = {};
+        var allZones = [myHand, myMonsters, myExtraMonsters, mySpells, myGY, myBanished,
+                        rivalHand, rivalMonsters, rivalExtraMonsters, rivalSpells, rivalGY, rivalBanished];
+        for (var ai = 0; ai < allZones.length; ai++) {
+            collectNewCardText(allZones[ai], newCards, activeMI);
+        }
+
         return {
             myself: myself,
             rival: rival,
@@ -3794,7 +4362,106 @@ rpc.exports = {
             rivalBanished: rivalBanished,
             myDeckCount: myDeckCount,
             myExtraDeckCount: myExtraDeckCount,
-            rivalDeckCount: rivalDeckCount
+            rivalDeckCount: rivalDeckCount,
+            cards: newCards
+        };
+    },
+
+    /**
+     * Mark cardIds as already known to Python (warm CardCatalog) so gameState
+     * doesn't ship their text again.
+     */
+    primeCardIds: function (ids) {
+        for (var i = 0; i < ids.length; i++) _cardTextSent[ids[i]] = true;
+        return { primed: ids.length };
+    },
+
+    /** Forget what Python has received; the next gameState resends text for every id. */
+    resetCardDelta: function () {
+        _cardTextSent = {};
+        return { success: true };
+    },
+
+    /**
+     * Push the game state delta to Python via send(). See pushStateDelta.
+     */
+    pushState: function (full) {
+        return pushStateDelta(!!full);
+    },
+
+    /**
+     * Start/stop pushing state deltas from the agent every intervalMs.
+     */
+    stateStream: function (enable, intervalMs) {
+        if (_streamTimer !== null) {
+            clearInterval(_streamTimer);
+            _streamTimer = null;
+        }
+        if (enable) {
+            var period = Math.max(50, intervalMs || 250);
+            _streamTimer = setInterval(function () {
+                try { pushStateDelta(false); }
+                catch (e) { send("stateStream error: " + e.message); }
+            }, period);
+        }
+        return { enabled: _streamTimer !== null, rev: _streamRev };
+    },
+
+    /**
+     * ns per call for the alloc / pooled / direct invoke paths; see benchInvoke().
+     */
+    benchInvoke: function (iterations) {
+        return benchInvoke(iterations || 2000);
+    },
+
+    invokeStats: function () {
+        var threads = 0;
+        for (var tid in _invokeFrames) threads++;
+        return {
+            pooled: _invokeStats.pooled,
+            direct: _invokeStats.direct,
+            allocated: _invokeStats.allocated,
+            frames: _invokeStats.frames,
+            threads: threads,
+            directMethods: _invokeDirect.size,
+            directEnabled: _invokeDirectEnabled
+        };
+    },
+
+    setDirectInvoke: function (enable) {
+        _invokeDirectEnabled = !!enable;
+        return { directEnabled: _invokeDirectEnabled };
+    },
+
+    /**
+     * Several read exports in one round-trip; see runBatch().
+     */
+    batch: function (reads) {
+        return runBatch(reads);
+    },
+
+    batchStats: function () {
+        return _batchStats;
+    },
+
+    streamStats: function () {
+        return {
+            rev: _streamRev,
+            streaming: _streamTimer !== null,
+            pushes: _streamStats.pushes,
+            unchanged: _streamStats.unchanged,
+            full: _streamStats.full,
+            resets: _streamStats.resets
+        };
+    },
+
+    cardTextStats: function () {
+        return {
+            cached: _cardTextCache.size,
+            sent: Object.keys(_cardTextSent).length,
+            hits: _cardTextStats.hits,
+            misses: _cardTextStats.misses,
+            evictions: _cardTextStats.evictions
         };
     },
 
@@ -3877,14 +4544,14 @@ rpc.exports = {
                 getPhase = findMethodByName(engineKlass, "DLL_DuelGetCurrentPhase", -1);
                 whichTurn = findMethodByName(engineKlass, "DLL_DuelWhichTurnNow", -1);
             }
-            if (getPhase) phase = callCardFn(getPhase, []);
-            if (whichTurn) turnPlayer = callCardFn(whichTurn, []);
-            if (getMovable) movablePhases = callCardFn(getMovable, []);
+            if (getPhase) phase = callI32(getPhase);
+            if (whichTurn) turnPlayer = callI32(whichTurn);
+            if (getMovable) movablePhases = callI32(getMovable);
         } catch (e) {}
 
         // ── Determine correct player index ──
-        var myself = 0;
-        try { if (_duelMyselfFn) myself = _duelMyselfFn(ptr(0)); } catch (e) {}
+        var myself = _engineSeats().myself;
+        if (myself === -1) myself = 0;
 
         // In PvP, DLL_DuelMyself() may return wrong value.
         // Use cached PvP index if available.
@@ -3903,15 +4570,15 @@ rpc.exports = {
         var scanZones = [13, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12];
         for (var zi = 0; zi < scanZones.length; zi++) {
             var zv = scanZones[zi];
-            var cardCount = callCardFn(activeMI.getCardNum, [boxInt32(myself), boxInt32(zv)]);
+            var cardCount = callI32(activeMI.getCardNum, myself, zv);
             for (var ci = 0; ci < cardCount && ci < 20; ci++) {
                 try {
-                    var mask = callCardFn(getCmdMask, [boxInt32(myself), boxInt32(zv), boxInt32(ci)]);
+                    var mask = callI32(getCmdMask, myself, zv, ci);
                     if (mask !== 0) {
-                        var uid = callCardFn(activeMI.getCardUID, [boxInt32(myself), boxInt32(zv), boxInt32(ci)]);
+                        var uid = callI32(activeMI.getCardUID, myself, zv, ci);
                         var cardId = 0, name = null;
                         if (uid > 0) {
-                            cardId = callCardFn(activeMI.getCardIDByUID, [boxInt32(uid)]);
+                            cardId = callI32(activeMI.getCardIDByUID, uid);
                             if (cardId > 0) name = getCardName(cardId);
                         }
                         commands.push({
@@ -4169,7 +4836,7 @@ rpc.exports = {
         // Dialog state
         try {
             var dlgSelectNum = pickMethod("PVP_DuelDlgGetSelectItemNum", "DialogGetSelectItemNum", 0);
-            if (dlgSelectNum) state.dialogSelectNum = callCardFn(dlgSelectNum, []);
+            if (dlgSelectNum) state.dialogSelectNum = callI32(dlgSelectNum);
         } catch (e) { state.dialogSelectNum = 0; }
 
         try {
@@ -4179,13 +4846,13 @@ rpc.exports = {
 
         try {
             var dlgPosMask = pickMethod("PVP_DuelDlgGetPosMaskOfThisSummon", "DialogGetPosMaskOfThisSummon", 0);
-            if (dlgPosMask) state.dialogPosMask = callCardFn(dlgPosMask, []);
+            if (dlgPosMask) state.dialogPosMask = callI32(dlgPosMask);
         } catch (e) { state.dialogPosMask = 0; }
 
         // List state
         try {
             var listMax = pickMethod("PVP_DuelListGetItemMax", "ListGetItemMax", 0);
-            if (listMax) state.listItemMax = callCardFn(listMax, []);
+            if (listMax) state.listItemMax = callI32(listMax);
         } catch (e) { state.listItemMax = 0; }
 
         try {
@@ -4196,8 +4863,8 @@ rpc.exports = {
         try {
             var listSelMax = pickMethod("PVP_DuelListGetSelectMax", "ListGetSelectMax", 0);
             var listSelMin = pickMethod("PVP_DuelListGetSelectMin", "ListGetSelectMin", 0);
-            if (listSelMax) state.listSelectMax = callCardFn(listSelMax, []);
-            if (listSelMin) state.listSelectMin = callCardFn(listSelMin, []);
+            if (listSelMax) state.listSelectMax = callI32(listSelMax);
+            if (listSelMin) state.listSelectMin = callI32(listSelMin);
         } catch (e) {}
 
         // Get list item details if list is active
@@ -4209,9 +4876,9 @@ rpc.exports = {
             for (var i = 0; i < state.listItemMax && i < 30; i++) {
                 var item = { index: i };
                 try {
-                    if (listGetItemID) item.cardId = callCardFn(listGetItemID, [boxInt32(i)]);
-                    if (listGetItemUID) item.uid = callCardFn(listGetItemUID, [boxInt32(i)]);
-                    if (listGetItemFrom) item.from = callCardFn(listGetItemFrom, [boxInt32(i)]);
+                    if (listGetItemID) item.cardId = callI32(listGetItemID, i);
+                    if (listGetItemUID) item.uid = callI32(listGetItemUID, i);
+                    if (listGetItemFrom) item.from = callI32(listGetItemFrom, i);
                     if (item.cardId > 0) item.name = getCardName(item.cardId);
                 } catch (e) {}
                 state.listItems.push(item);
@@ -4221,7 +4888,7 @@ rpc.exports = {
         // Get dialog mix data if present
         try {
             var dlgMixNum = pickMethod("PVP_DuelDlgGetMixNum", "DialogGetMixNum", 0);
-            if (dlgMixNum) state.dialogMixNum = callCardFn(dlgMixNum, []);
+            if (dlgMixNum) state.dialogMixNum = callI32(dlgMixNum);
         } catch (e) { state.dialogMixNum = 0; }
 
         return state;
@@ -4265,6 +4932,66 @@ rpc.exports = {
         return _hookAutoplay(enable);
     },
 
+    /**
+     * Run a main-thread export without blocking: returns {tickets, response}
+     * where response is the export's own return (its main-thread result is
+     * null) and each ticket completes via a "mainThreadDone" message.
+     */
+    mainThreadAsync: function (name, args) {
+        if (MAIN_THREAD_ASYNC_EXPORTS.indexOf(name) < 0) return { error: name + " has no async variant" };
+        _mainThreadAsync = [];
+        var tickets, response;
+        try {
+            response = rpc.exports[name].apply(null, args || []);
+        } finally {
+            tickets = _mainThreadAsync;
+            _mainThreadAsync = null;
+        }
+        return { tickets: tickets, response: response };
+    },
+
+    /** Result of an async ticket: {done:true, ...} once finished, else {done:false, queued}. */
+    mainThreadResult: function (ticket) {
+        var job = _mainThreadTickets.get(ticket);
+        if (job) {
+            _mainThreadTickets.delete(ticket);
+            return { done: true, result: job.result, error: job.error, waitMs: job.waitMs, execMs: job.execMs };
+        }
+        for (var i = 0; i < _mainThreadQueue.length; i++) {
+            if (_mainThreadQueue[i].ticket === ticket) return { done: false, queued: i };
+        }
+        return { done: false, error: "unknown or expired ticket" };
+    },
+
+    mainThreadStats: function () {
+        return mainThreadStats();
+    },
+
+    setMainThreadBudget: function (ms) {
+        _mainThreadBudgetMs = Math.max(0, ms);
+        return { budgetMs: _mainThreadBudgetMs };
+    },
+
+    /**
+     * Hook the duel.dll player-action entry points and the (signature-filtered)
+     * engine step and emit coalesced {type: "duelDirty", seq, ts, sources}
+     * messages. enable=false removes the hooks.
+     */
+    subscribeDuelEvents: function (enable, coalesceMs) {
+        return _subscribeDuelEvents(enable, coalesceMs);
+    },
+
+    duelEventStats: function () {
+        return {
+            enabled: _duelEventListeners.length > 0,
+            hooks: _duelEventListeners.length,
+            seq: _duelEventSeq,
+            hits: _duelEventHits,
+            filtered: _duelEventFiltered,
+            coalesceMs: _duelEventCoalesceMs
+        };
+    },
+
     /**
      * Check if a player is Human by reading native duel engine memory directly.
      * DLL_DuelIsHuman reads: base_ptr[player*4+8] == 0 ? true : false
@@ -4446,6 +5173,169 @@ function _readPlayerType(player) {
     }
 }
 
+// ── Duel event subscription ──
+// Interceptor hooks on the duel.dll entry points that apply a player action
+// (command, phase move, dialog and list answers). A hit only marks the duel
+// dirty; one "duelDirty" message per coalesce window tells Python to re-read
+// the state.
+//
+// Everything else (rival plays, chain resolution, draws, phase and turn
+// changes) happens inside the engine step, DLL_DuelSysAct, which runs every
+// frame. Its hits are filtered: onLeave reads a small board signature
+// straight from duel.dll (phase, turn, LP, card count per zone, the card and
+// its face in each field zone) and only marks the duel dirty when that
+// differs from the previous read.
+const DUEL_EVENT_EXPORTS = [
+    "DLL_DuelComDoCommand",
+    "DLL_DuelComMovePhase",
+    "DLL_DuelComCancelCommand",
+    "DLL_DuelDlgSetResult",
+    "DLL_DuelListSendIndex"
+];
+const DUEL_ENGINE_STEP = "DLL_DuelSysAct";
+const DUEL_SIGNATURE_MIN_MS = 5;      // SysAct can run several times a frame; read at most this often
+const DUEL_SIGNATURE_ZONES = 17;      // zones 1..17, see ZONE_* above
+const DUEL_FIELD_ZONES = ZONE_EXTRA_MONSTER_2;  // zones 1..12 hold one card each
+
+var _duelEventListeners = [];
+var _duelEventSeq = 0;
+var _duelEventPending = null;  // {ts, sources} for the batch waiting to be flushed
+var _duelEventCoalesceMs = 30;
+var _duelEventHits = 0;
+var _duelEventFiltered = 0;    // engine steps that left the signature unchanged
+
+/** Direct duel.dll getters for the board signature, or null if one is missing. */
+function _duelSignatureReader(duelDll) {
+    function fn(name, args) {
+        var addr = duelDll.findExportByName(name);
+        return addr ? new NativeFunction(addr, "int32", args) : null;
+    }
+    var fns = {
+        phase: fn("DLL_DuelGetCurrentPhase", []),
+        turn: fn("DLL_DuelGetTurnNum", []),
+        turnPlayer: fn("DLL_DuelWhichTurnNow", []),
+        lp: fn("DLL_DuelGetLP", ["int32"]),
+        num: fn("DLL_DuelGetCardNum", ["int32", "int32"]),
+        uid: fn("DLL_DuelGetCardUniqueID", ["int32", "int32", "int32"]),
+        face: fn("DLL_DuelGetCardFace", ["int32", "int32", "int32"])
+    };
+    for (var k in fns) {
+        if (!fns[k]) return null;
+    }
+    var size = 3 + 2 * (1 + DUEL_SIGNATURE_ZONES + 2 * DUEL_FIELD_ZONES);
+    return { fns: fns, cur: new Int32Array(size), prev: new Int32Array(size), at: 0, primed: false };
+}
+
+/** Read the signature into sig.cur and swap it with sig.prev; true if it changed. */
+function _duelSignatureChanged(sig) {
+    var f = sig.fns, s = sig.cur, n = 0;
+    s[n++] = f.phase();
+    s[n++] = f.turn();
+    s[n++] = f.turnPlayer();
+    for (var p = 0; p < 2; p++) {
+        s[n++] = f.lp(p);
+        for (var z = 1; z <= DUEL_SIGNATURE_ZONES; z++) {
+            var count = s[n++] = f.num(p, z);
+            if (z <= DUEL_FIELD_ZONES) {
+                s[n++] = count > 0 ? f.uid(p, z, 0) : 0;
+                s[n++] = count > 0 ? f.face(p, z, 0) : 0;
+            }
+        }
+    }
+    var changed = !sig.primed;
+    for (var i = 0; i < n && !changed; i++) {
+        if (s[i] !== sig.prev[i]) changed = true;
+    }
+    sig.cur = sig.prev;
+    sig.prev = s;
+    sig.primed = true;
+    return changed;
+}
+
+function _hookEngineStep(duelDll) {
+    var addr = duelDll.findExportByName(DUEL_ENGINE_STEP);
+    var sig = addr ? _duelSignatureReader(duelDll) : null;
+    if (!sig) return false;
+    _duelEventListeners.push(Interceptor.attach(addr, {
+        onLeave: function () {
+            var now = Date.now();
+            if (now - sig.at < DUEL_SIGNATURE_MIN_MS) return;
+            sig.at = now;
+            var changed;
+            try {
+                changed = _duelSignatureChanged(sig);
+            } catch (e) {
+                return;
+            }
+            if (changed) _markDuelDirty(DUEL_ENGINE_STEP);
+            else _duelEventFiltered++;
+        }
+    }));
+    return true;
+}
+
+function _markDuelDirty(source) {
+    _duelEventHits++;
+    if (_duelEventPending !== null) {
+        _duelEventPending.sources[source] = (_duelEventPending.sources[source] || 0) + 1;
+        return;
+    }
+    var sources = {};
+    sources[source] = 1;
+    _duelEventPending = { ts: Date.now(), sources: sources };
+    setTimeout(_flushDuelDirty, _duelEventCoalesceMs);
+}
+
+function _flushDuelDirty() {
+    var batch = _duelEventPending;
+    _duelEventPending = null;
+    if (batch === null) return;
+    _duelEventSeq++;
+    send({ type: "duelDirty", seq: _duelEventSeq, ts: batch.ts, sources: batch.sources });
+}
+
+function _subscribeDuelEvents(enable, coalesceMs) {
+    for (var i = 0; i < _duelEventListeners.length; i++) {
+        try { _duelEventListeners[i].detach(); } catch (e) {}
+    }
+    _duelEventListeners = [];
+    _duelEventPending = null;
+    if (!enable) return { success: true, enabled: false, hooked: [] };
+
+    if (coalesceMs !== undefined && coalesceMs !== null) _duelEventCoalesceMs = Math.max(0, coalesceMs);
+
+    var duelDll;
+    try {
+        duelDll = Process.getModuleByName("duel.dll");
+    } catch (e) {
+        return { error: "duel.dll not loaded: " + e.message };
+    }
+
+    var hooked = [], missing = [];
+    DUEL_EVENT_EXPORTS.forEach(function (name) {
+        var addr = duelDll.findExportByName(name);
+        if (!addr) { missing.push(name); return; }
+        try {
+            _duelEventListeners.push(Interceptor.attach(addr, {
+                onLeave: function () { _markDuelDirty(name); }
+            }));
+            hooked.push(name);
+        } catch (e) {
+            missing.push(name);
+        }
+    });
+    try {
+        if (_hookEngineStep(duelDll)) hooked.push(DUEL_ENGINE_STEP);
+        else missing.push(DUEL_ENGINE_STEP);
+    } catch (e) {
+        missing.push(DUEL_ENGINE_STEP);
+    }
+
+    if (hooked.length === 0) return { error: "no duel event entry points hooked", missing: missing };
+    send("duelEvents: hooked " + hooked.join(", ") + (missing.length ? " (missing " + missing.join(", ") + ")" : ""));
+    return { success: true, enabled: true, hooked: hooked, missing: missing, coalesceMs: _duelEventCoalesceMs };
+}
+
 // ── Helper: poll Handle for completion ──
 
 function _pollHandle(handleObj) {
@@ -4551,3 +5441,10 @@ function _pollHandleWithParam(handleObj) {
 
     return { success: false, error: "Handle poll timeout (15s)" };
 }
+
+// Build the metadata index at load so the first RPC doesn't pay for the scan
+try {
+    ensureMetaIndex();
+} catch (e) {
+    send("metaIndex: deferred to first lookup (" + e.message + ")");
+}
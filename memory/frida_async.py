@@ -0,0 +1,299 @@
+"""asyncio client for the Frida agent, mirroring ``FridaIL2CPP``.
+
+Built on ``script.exports_async``: every call is an awaitable with a
+timeout, can be cancelled like any other task, and goes through a shared
+semaphore so at most ``max_concurrency`` requests are in flight. The agent
+still runs RPCs one at a time on its JS thread; the limit bounds how much
+round-trip latency callers overlap and how deep the agent's backlog gets.
+
+The session itself (attach/detach, the message handler feeding
+``state_store`` and the card catalog) stays with the sync ``FridaIL2CPP``;
+use ``AsyncFridaIL2CPP.from_sync(frida)`` to get an async view of it, or
+pass any object with async methods named like the agent exports (e.g. a
+fake agent in a benchmark) as *exports*.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from config import ASYNC_RPC_CONCURRENCY, ASYNC_RPC_TIMEOUT
+from memory.card_catalog import CardCatalog
+from memory.duel_state_store import DuelStateStore
+from memory.frida_il2cpp import FridaIL2CPP, hydrate_card_names
+from utils import logger
+
+# main-thread exports wait up to 30 s inside the agent
+_MAIN_THREAD_TIMEOUT = 35.0
+
+
+class AsyncFridaIL2CPP:
+
+    def __init__(
+        self,
+        exports: Any,
+        *,
+        cards: CardCatalog | None = None,
+        state_store: DuelStateStore | None = None,
+        timeout: float = ASYNC_RPC_TIMEOUT,
+        max_concurrency: int = ASYNC_RPC_CONCURRENCY,
+    ) -> None:
+        self._api = exports
+        self.cards = cards if cards is not None else CardCatalog()
+        self.state_store = state_store if state_store is not None else DuelStateStore()
+        self.timeout = timeout
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._inflight: set[asyncio.Task] = set()
+        self.timeouts = 0
+
+    @classmethod
+    def from_sync(cls, frida_session: FridaIL2CPP, **kwargs) -> AsyncFridaIL2CPP:
+        """Async view of an attached sync session, sharing its card catalog and state store."""
+        script = frida_session._script
+        return cls(
+            script.exports_async if script else None,
+            cards=frida_session.cards,
+            state_store=frida_session.state_store,
+            **kwargs,
+        )
+
+    def is_attached(self) -> bool:
+        return self._api is not None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def cancel_all(self) -> int:
+        """Cancel every request still waiting on the agent; returns how many."""
+        tasks = list(self._inflight)
+        for t in tasks:
+            t.cancel()
+        return len(tasks)
+
+    async def _call(self, export: str, *args, timeout: float | None = None, log: bool = True):
+        """One RPC under the concurrency limit. Raises only CancelledError; failures return None."""
+        if not self._api:
+            return None
+        task = asyncio.current_task()
+        if task:
+            self._inflight.add(task)
+        try:
+            async with self._sem:
+                return await asyncio.wait_for(getattr(self._api, export)(*args), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if log:
+                logger.error(f"{export} timed out after {timeout or self.timeout:.1f}s")
+            return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if log:
+                logger.error(f"{export} failed: {exc}")
+            return None
+        finally:
+            if task:
+                self._inflight.discard(task)
+
+    @staticmethod
+    def _unless_error(result: Any) -> Any:
+        if isinstance(result, dict) and "error" in result:
+            return None
+        return result
+
+    @staticmethod
+    def _success(result: Any) -> bool:
+        return bool(isinstance(result, dict) and result.get("success", False))
+
+    # ── duel state ──
+
+    async def is_duel_active(self) -> bool:
+        return bool(await self._call("active", log=False))
+
+    async def get_duel_status(self) -> dict | None:
+        return self._unless_error(await self._call("status", log=False))
+
+    async def get_game_state(self) -> dict | None:
+        result = await self._call("game_state")
+        if not isinstance(result, dict):
+            return None
+        if "error" in result:
+            logger.error(f"gameState: {result['error']}")
+            return None
+        self.cards.ingest(result.pop("cards", None))
+        hydrate_card_names(result, self.cards)
+        return result
+
+    async def refresh_state(self, full: bool = False) -> int:
+        await self._call("push_state", full or self.state_store.needs_resync)
+        return self.state_store.revision
+
+    async def batch(self, reads: list) -> list:
+        out = await self._call("batch", [list(r) if isinstance(r, (list, tuple)) else r for r in reads])
+        if not isinstance(out, dict):
+            return []
+        results = out.get("results", [])
+        for read, result in zip(reads, results):
+            name = read[0] if isinstance(read, (list, tuple)) else read
+            if name == "gameState" and isinstance(result, dict) and "error" not in result:
+                self.cards.ingest(result.pop("cards", None))
+                hydrate_card_names(result, self.cards)
+        return results
+
+    async def batch_stats(self) -> dict | None:
+        return await self._call("batch_stats")
+
+    async def get_commands(self) -> dict | None:
+        return self._unless_error(await self._call("get_commands", log=False))
+
+    async def get_input_state(self) -> dict | None:
+        return await self._call("get_input_state")
+
+    async def default_location(self) -> dict | None:
+        return await self._call("default_location")
+
+    async def is_player_human(self, player: int) -> dict | None:
+        return await self._call("is_player_human", player)
+
+    async def zone_scan(self) -> dict | None:
+        return await self._call("zonescan")
+
+    async def diag_pvp(self) -> dict | None:
+        return await self._call("diagpvp")
+
+    async def start_state_stream(self, interval_ms: int = 250) -> bool:
+        await self._call("push_state", True)
+        result = await self._call("state_stream", True, interval_ms)
+        return bool(result and result.get("enabled", False))
+
+    async def stop_state_stream(self) -> None:
+        await self._call("state_stream", False, 0)
+
+    async def subscribe_duel_events(self, enable: bool = True, coalesce_ms: int = 30) -> bool:
+        return self._success(await self._call("subscribe_duel_events", enable, coalesce_ms))
+
+    # ── duel actions ──
+
+    async def instant_win(self) -> bool:
+        result = await self._call("win")
+        if not isinstance(result, dict) or "error" in result:
+            return False
+        return result.get("status") in ("success", "already_zero")
+
+    async def do_command(self, player: int, zone: int, index: int, cmd_bit: int) -> dict | None:
+        return await self._call("do_command", player, zone, index, cmd_bit, timeout=_MAIN_THREAD_TIMEOUT)
+
+    async def move_phase(self, phase: int) -> dict | None:
+        return await self._call("move_phase", phase, timeout=_MAIN_THREAD_TIMEOUT)
+
+    async def cancel_command(self, decide: bool = True) -> dict | None:
+        return await self._call("cancel_command", decide, timeout=_MAIN_THREAD_TIMEOUT)
+
+    async def dialog_set_result(self, result: int) -> dict | None:
+        return await self._call("dialog_set_result", result, timeout=_MAIN_THREAD_TIMEOUT)
+
+    async def list_send_index(self, index: int) -> dict | None:
+        return await self._call("list_send_index", index, timeout=_MAIN_THREAD_TIMEOUT)
+
+    async def native_move_phase(self, phase: int) -> dict | None:
+        return await self._call("native_move_phase", phase)
+
+    async def native_do_command(self, player: int, zone: int, index: int, cmd_bit: int, check: bool = True) -> dict | None:
+        return await self._call("native_do_command", player, zone, index, cmd_bit, check)
+
+    async def native_cancel_command(self, decide: bool = True) -> dict | None:
+        return await self._call("native_cancel_command", decide)
+
+    async def hook_autoplay(self, enable: bool) -> dict | None:
+        return await self._call("hook_autoplay", enable)
+
+    async def set_time_scale(self, scale: float) -> bool:
+        return self._success(await self._call("set_time_scale", scale))
+
+    async def enum_engine(self, prefix: str = "DLL_DuelCom") -> dict | None:
+        return self._unless_error(await self._call("enum_engine", prefix))
+
+    async def call_engine(self, method_name: str, args: list[int] | None = None) -> dict | None:
+        return self._unless_error(await self._call("call_engine", method_name, args or [], log=False))
+
+    # ── main-thread tickets ──
+
+    async def call_async(self, name: str, *args) -> int | None:
+        out = await self._call("main_thread_async", name, list(args))
+        if not isinstance(out, dict) or "error" in out:
+            return None
+        tickets = out.get("tickets") or []
+        return tickets[-1] if tickets else None
+
+    async def await_ticket(self, ticket: int, timeout: float = 30.0) -> dict | None:
+        """Poll ``mainThreadResult`` until the ticket finishes or *timeout* passes."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.005
+        while loop.time() < deadline:
+            out = await self._call("main_thread_result", ticket)
+            if isinstance(out, dict) and out.get("done"):
+                return out
+            if isinstance(out, dict) and "error" in out:
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        return None
+
+    async def main_thread_stats(self) -> dict | None:
+        return await self._call("main_thread_stats")
+
+    async def set_main_thread_budget(self, ms: float) -> None:
+        await self._call("set_main_thread_budget", ms)
+
+    # ── solo / menus ──
+
+    async def call_api_with_result(self, method: str, arg: int | None = None) -> dict | None:
+        return await self._call("call_api_with_result", method, arg)
+
+    async def call_solo_api_fire_and_forget(self, method: str, arg: int | None = None) -> dict | None:
+        return await self._call("call_api_fire_and_forget", method, arg)
+
+    async def call_api_two_args(self, method: str, arg1: int, arg2: int) -> dict | None:
+        return await self._call("call_api_two_args", method, arg1, arg2)
+
+    async def clean_vc_stack(self) -> bool:
+        return self._success(await self._call("clean_vc_stack", timeout=_MAIN_THREAD_TIMEOUT))
+
+    async def force_reboot(self) -> bool:
+        if not self._api:
+            return False
+        result = await self._call("force_reboot", timeout=_MAIN_THREAD_TIMEOUT, log=False)
+        # like the sync client: a lost connection means the reboot went through
+        return True if result is None else self._success(result)
+
+    async def dismiss_all_dialogs(self) -> bool:
+        return self._success(await self._call("dismiss_all_dialogs", timeout=_MAIN_THREAD_TIMEOUT))
+
+    async def advance_duel_end(self) -> bool:
+        return self._success(await self._call("advance_duel_end", log=False))
+
+    async def hook_result_screens(self) -> bool:
+        return self._success(await self._call("hook_result_screens"))
+
+    async def retry_solo_duel(self, chapter_id: int, is_rental: bool = True) -> bool:
+        return self._success(await self._call("retry_duel", chapter_id, is_rental, timeout=_MAIN_THREAD_TIMEOUT))
+
+    # ── diagnostics ──
+
+    async def index_stats(self) -> dict | None:
+        return await self._call("index_stats")
+
+    async def invalidate_index(self) -> bool:
+        return self._success(await self._call("invalidate_index"))
+
+    async def card_text_stats(self) -> dict | None:
+        return await self._call("card_text_stats")
+
+    async def bench_invoke(self, iterations: int = 2000) -> dict | None:
+        return self._unless_error(await self._call("bench_invoke", iterations, timeout=60.0))
+
+    async def invoke_stats(self) -> dict | None:
+        return await self._call("invoke_stats")
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 import frida
 
 from utils import logger
-from config import PROCESS_NAME
+from config import MAIN_THREAD_BUDGET_MS, PROCESS_NAME
+from memory.card_catalog import CardCatalog
+from memory.duel_events import DuelEventHub
+from memory.duel_state_store import DuelStateStore
 
 # pyinstaller bundles data under sys._MEIPASS
 if getattr(sys, "frozen", False):
@@ -13,6 +17,21 @@ if getattr(sys, "frozen", False):
 else:
     _AGENT_PATH = os.path.join(os.path.dirname(__file__), "frida_agent.js")
 
+_STATE_ZONES = ("myHand", "rivalHand", "myGY", "rivalGY", "myBanished", "rivalBanished")
+_FIELD_ZONES = ("monsters", "spells", "extraMonsters")
+_TICKETS_MAX = 256  # unclaimed mainThreadDone results kept
+
+
+def hydrate_card_names(state: dict, cards: CardCatalog) -> None:
+    """Fill ``name`` on every card of a gameState (or patch) from the catalog."""
+    zones = [state.get(z, []) for z in _STATE_ZONES]
+    for side in ("myField", "rivalField"):
+        field = state.get(side, {})
+        zones.extend(field.get(z, []) for z in _FIELD_ZONES)
+    for zone in zones:
+        for c in zone:
+            c["name"] = cards.name(c.get("cardId", 0))
+
 
 class FridaIL2CPP:
 
@@ -20,6 +39,12 @@ class FridaIL2CPP:
         self._session: frida.core.Session | None = None
         self._script: frida.core.Script | None = None
         self._api = None
+        self.cards = CardCatalog()
+        self.cards.load()
+        self.state_store = DuelStateStore()
+        self.events = DuelEventHub()
+        self._tickets: dict[int, dict] = {}
+        self._tickets_cond = threading.Condition()
 
     def attach(self, process_name: str | None = None) -> bool:
         target = process_name or PROCESS_NAME
@@ -56,10 +81,23 @@ class FridaIL2CPP:
             self.detach()
             return False
 
+        self._prime_card_catalog()
+        self.set_main_thread_budget(MAIN_THREAD_BUDGET_MS)
         logger.ok("Frida: attached and agent loaded.")
         return True
 
+    def _prime_card_catalog(self) -> None:
+        ids = self.cards.known_ids()
+        if not ids:
+            return
+        try:
+            self._api.prime_card_ids(ids)
+            logger.info(f"Card catalog: {len(ids)} cards known, agent primed")
+        except Exception as exc:
+            logger.warn(f"Card catalog prime failed: {exc}")
+
     def detach(self) -> None:
+        self.cards.save()
         if self._script:
             try:
                 self._script.unload()
@@ -73,6 +111,8 @@ class FridaIL2CPP:
                 pass
             self._session = None
         self._api = None
+        self.state_store.clear()
+        self.events.set_mode("poll")
 
     def is_attached(self) -> bool:
         return self._api is not None
@@ -86,10 +126,32 @@ class FridaIL2CPP:
         if message.get("type") == "send":
             payload = message.get("payload", "")
             if isinstance(payload, str):
-                logger.debug(f"[Frida] {payload}")
+                # agent chatter can be a flood; skip building the message when debug is off
+                if logger.enabled("DEBUG"):
+                    logger.debug(f"[Frida] {payload}")
+            elif isinstance(payload, dict) and payload.get("type") == "duelState":
+                self._on_state_message(payload)
+            elif isinstance(payload, dict) and payload.get("type") == "duelDirty":
+                self.events.notify(payload)
+            elif isinstance(payload, dict) and payload.get("type") == "mainThreadDone":
+                with self._tickets_cond:
+                    self._tickets[payload["ticket"]] = payload
+                    if len(self._tickets) > _TICKETS_MAX:
+                        self._tickets.pop(next(iter(self._tickets)))
+                    self._tickets_cond.notify_all()
         elif message.get("type") == "error":
             logger.error(f"Frida error: {message.get('description', message)}")
 
+    def _on_state_message(self, msg: dict) -> None:
+        self.cards.ingest(msg.get("cards"))
+        patch = msg.get("patch")
+        if patch:
+            self._hydrate_names(patch)
+        if not self.state_store.apply(msg):
+            # can't call back into the agent from its message thread
+            logger.debug("State stream gap, requesting full snapshot")
+            threading.Thread(target=self.refresh_state, kwargs={"full": True}, daemon=True).start()
+
 
     def is_duel_active(self) -> bool:
         if not self._api:
@@ -227,6 +289,10 @@ class FridaIL2CPP:
 
 
     def get_game_state(self) -> dict | None:
+        """Board snapshot with card names filled in from the card catalog.
+
+        Effect text is not carried per card; look it up with ``self.cards.desc``.
+        """
         if not self._api:
             return None
         try:
@@ -234,10 +300,232 @@ class FridaIL2CPP:
             if "error" in result:
                 logger.error(f"gameState: {result['error']}")
                 return None
-            return result
         except Exception as exc:
             logger.error(f"gameState failed: {exc}")
             return None
+        self.cards.ingest(result.pop("cards", None))
+        self._hydrate_names(result)
+        return result
+
+    def refresh_state(self, full: bool = False) -> int:
+        """Have the agent push its state delta into ``state_store``.
+
+        Returns the store revision afterwards; unchanged revision means the
+        board is the same as the last time the caller looked.
+        """
+        if not self._api:
+            return self.state_store.revision
+        before = self.state_store.revision
+        try:
+            self._api.push_state(full or self.state_store.needs_resync)
+        except Exception as exc:
+            logger.error(f"pushState failed: {exc}")
+        rev = self.state_store.revision
+        self.events.record_poll(rev != before)
+        return rev
+
+    def batch(self, reads: list) -> list:
+        """Run several agent reads in one round-trip.
+
+        *reads* holds export names (``"gameState"``) or ``[name, *args]``
+        lists. Returns one result per read, in the same order, so the same
+        export can be read with different args; a read that raised gives
+        ``{"error": msg}``. ``gameState`` gets the same card-name hydration
+        as ``get_game_state``.
+        """
+        if not self._api:
+            return []
+        try:
+            out = self._api.batch([list(r) if isinstance(r, (list, tuple)) else r for r in reads])
+        except Exception as exc:
+            logger.error(f"batch failed: {exc}")
+            return []
+        results = out.get("results", [])
+        for read, result in zip(reads, results):
+            name = read[0] if isinstance(read, (list, tuple)) else read
+            if name == "gameState" and isinstance(result, dict) and "error" not in result:
+                self.cards.ingest(result.pop("cards", None))
+                self._hydrate_names(result)
+        return results
+
+    def bench_invoke(self, iterations: int = 2000) -> dict | None:
+        """ns per call through the agent's alloc / pooled / direct invoke paths."""
+        if not self._api:
+            return None
+        try:
+            result = self._api.bench_invoke(iterations)
+            if "error" in result:
+                logger.error(f"benchInvoke: {result['error']}")
+                return None
+            return result
+        except Exception as exc:
+            logger.error(f"benchInvoke failed: {exc}")
+            return None
+
+    def invoke_stats(self) -> dict | None:
+        if not self._api:
+            return None
+        try:
+            return self._api.invoke_stats()
+        except Exception as exc:
+            logger.error(f"invokeStats failed: {exc}")
+            return None
+
+    def batch_stats(self) -> dict | None:
+        if not self._api:
+            return None
+        try:
+            return self._api.batch_stats()
+        except Exception as exc:
+            logger.error(f"batchStats failed: {exc}")
+            return None
+
+    def poll_duel(self) -> tuple[bool, int]:
+        """``is_duel_active`` + ``refresh_state`` in one batch; returns (active, revision)."""
+        if not self._api:
+            return False, self.state_store.revision
+        before = self.state_store.revision
+        try:
+            out = self._api.batch(["active", ["pushState", self.state_store.needs_resync]])
+        except Exception:
+            self._api = None
+            return False, self.state_store.revision
+        rev = self.state_store.revision
+        self.events.record_poll(rev != before)
+        results = out.get("results") or [False]
+        return bool(results[0]), rev
+
+    def call_async(self, name: str, *args) -> int | None:
+        """Start a main-thread export (``doCommand``, ``movePhase``, ...) without blocking.
+
+        Returns a ticket for ``await_ticket``, or None if the export failed
+        before queueing anything.
+        """
+        if not self._api:
+            return None
+        try:
+            out = self._api.main_thread_async(name, list(args))
+        except Exception as exc:
+            logger.error(f"mainThreadAsync({name}) failed: {exc}")
+            return None
+        if "error" in out:
+            logger.error(f"mainThreadAsync({name}): {out['error']}")
+            return None
+        tickets = out.get("tickets") or []
+        if not tickets:
+            resp = out.get("response")
+            if isinstance(resp, dict) and "error" in resp:
+                logger.error(f"{name}: {resp['error']}")
+            return None
+        return tickets[-1]
+
+    def await_ticket(self, ticket: int, timeout: float = 30.0) -> dict | None:
+        """Wait for a ticket's ``mainThreadDone``; returns ``{result, error, waitMs, execMs}``."""
+        with self._tickets_cond:
+            if self._tickets_cond.wait_for(lambda: ticket in self._tickets, timeout):
+                return self._tickets.pop(ticket)
+        # message may have been evicted; ask the agent directly
+        if not self._api:
+            return None
+        try:
+            out = self._api.main_thread_result(ticket)
+        except Exception as exc:
+            logger.error(f"mainThreadResult failed: {exc}")
+            return None
+        return out if out.get("done") else None
+
+    def main_thread_stats(self) -> dict | None:
+        if not self._api:
+            return None
+        try:
+            return self._api.main_thread_stats()
+        except Exception as exc:
+            logger.error(f"mainThreadStats failed: {exc}")
+            return None
+
+    def set_main_thread_budget(self, ms: float) -> None:
+        if not self._api:
+            return
+        try:
+            self._api.set_main_thread_budget(ms)
+        except Exception as exc:
+            logger.error(f"setMainThreadBudget failed: {exc}")
+
+    def subscribe_duel_events(self, enable: bool = True, coalesce_ms: int = 30) -> bool:
+        """Install the agent's duel entry-point hooks; True only if every one was hooked.
+
+        With some hooked, consumers switch to event mode anyway; with none
+        they keep polling.
+        """
+        if not self._api:
+            return False
+        try:
+            result = self._api.subscribe_duel_events(enable, coalesce_ms)
+        except Exception as exc:
+            logger.error(f"subscribeDuelEvents failed: {exc}")
+            result = {"error": str(exc)}
+        if enable and result.get("success"):
+            self.events.set_mode("event")
+            logger.ok(f"Duel events: hooked {', '.join(result.get('hooked', []))}")
+            return not result.get("missing")
+        self.events.set_mode("poll")
+        if enable:
+            logger.warn(f"Duel events unavailable ({result.get('error', 'unknown')}), polling instead")
+        return False
+
+    def start_state_stream(self, interval_ms: int = 250) -> bool:
+        """Let the agent push deltas on its own timer instead of on refresh_state()."""
+        if not self._api:
+            return False
+        try:
+            self._api.push_state(True)
+            return self._api.state_stream(True, interval_ms).get("enabled", False)
+        except Exception as exc:
+            logger.error(f"stateStream failed: {exc}")
+            return False
+
+    def stop_state_stream(self) -> None:
+        if not self._api:
+            return
+        try:
+            self._api.state_stream(False, 0)
+        except Exception as exc:
+            logger.error(f"stateStream stop failed: {exc}")
+
+    def _hydrate_names(self, state: dict) -> None:
+        hydrate_card_names(state, self.cards)
+
+    def index_stats(self) -> dict | None:
+        """Metadata index counters (lookups served from the index vs. cold)."""
+        if not self._api:
+            return None
+        try:
+            return self._api.index_stats()
+        except Exception as exc:
+            logger.error(f"index_stats failed: {exc}")
+            return None
+
+    def invalidate_index(self) -> bool:
+        if not self._api:
+            return False
+        try:
+            result = self._api.invalidate_index()
+            return result.get("success", False)
+        except Exception as exc:
+            logger.error(f"invalidate_index failed: {exc}")
+            return False
+
+    def card_text_stats(self) -> dict | None:
+        """Agent-side card text LRU counters plus the local catalog size."""
+        if not self._api:
+            return None
+        try:
+            result = self._api.card_text_stats()
+        except Exception as exc:
+            logger.error(f"card_text_stats failed: {exc}")
+            return None
+        result["catalog"] = len(self.cards)
+        return result
 
     def enum_engine(self, prefix: str = "DLL_DuelCom") -> dict | None:
         if not self._api:
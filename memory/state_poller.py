@@ -0,0 +1,178 @@
+"""Single background reader of duel state shared by every consumer."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from config import STATE_POLL_INTERVAL
+from memory.duel_events import EVENT_HEARTBEAT, EVENT_HEARTBEAT_DUEL
+from memory.frida_il2cpp import FridaIL2CPP
+from utils import logger
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    seq: int = 0                     # bumps whenever anything below changes
+    timestamp: float = 0.0           # time.monotonic() of the read
+    attached: bool = False
+    duel_active: bool = False
+    revision: int = -1               # DuelStateStore revision
+    game_state: Mapping | None = None
+    commands: dict | None = None
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.timestamp
+
+
+class StatePoller:
+    """Owns all periodic reads from ``FridaIL2CPP``.
+
+    One thread does a single ``poll_duel`` batch (active + state delta) per
+    tick, plus ``get_commands`` when the board revision moves, so the
+    RPC rate no longer scales with the number of open views. Ticks are driven
+    by ``frida.events`` when the duel hooks are up and by
+    ``STATE_POLL_INTERVAL`` otherwise. Consumers either read ``latest()``,
+    block in ``wait_for_change()``, or ``subscribe()`` a callback that runs
+    on the poller thread.
+    """
+
+    def __init__(self, frida_session: FridaIL2CPP, interval: float = STATE_POLL_INTERVAL) -> None:
+        self.frida = frida_session
+        self.interval = interval
+        self._snap = StateSnapshot()
+        self._cond = threading.Condition()
+        self._subscribers: list[Callable[[StateSnapshot], None]] = []
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._hooks_tried = False  # duel.dll is only guaranteed loaded once a duel is up
+        self._hooks_ok = False
+        self._rpc_calls = 0
+        self._ticks = 0
+        self._started_at = 0.0
+
+    # ── lifecycle ──
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="StatePoller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self.frida.events.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    # ── consumer API ──
+
+    def latest(self, max_staleness: float | None = None) -> StateSnapshot:
+        """Latest snapshot; if older than *max_staleness* seconds, wait for a fresh one."""
+        with self._cond:
+            snap = self._snap
+        if max_staleness is None or snap.age <= max_staleness or not self._thread:
+            return snap
+        deadline = snap.timestamp + max_staleness
+        self.frida.events.notify()  # kick the poller out of its idle wait
+        with self._cond:
+            self._cond.wait_for(lambda: self._snap.timestamp >= deadline or self._stop.is_set(),
+                                timeout=max(self.interval * 4, 1.0))
+            return self._snap
+
+    def wait_for_change(self, last_seq: int, timeout: float | None = None) -> StateSnapshot:
+        """Block until the snapshot seq differs from *last_seq* (or timeout)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._snap.seq != last_seq or self._stop.is_set(), timeout)
+            return self._snap
+
+    def subscribe(self, callback: Callable[[StateSnapshot], None]) -> Callable[[], None]:
+        """Call *callback(snapshot)* on the poller thread after every change; returns an unsubscribe."""
+        with self._cond:
+            self._subscribers.append(callback)
+
+        def _unsubscribe() -> None:
+            with self._cond:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return _unsubscribe
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self._started_at, 1e-6) if self._started_at else 0.0
+        return {
+            "ticks": self._ticks,
+            "rpc_calls": self._rpc_calls,
+            "rpc_per_sec": round(self._rpc_calls / elapsed, 2) if elapsed else 0.0,
+            "mode": self.frida.events.mode,
+        }
+
+    # ── poller thread ──
+
+    def _run(self) -> None:
+        seq = self.frida.events.seq
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception as exc:
+                logger.error(f"State poller error: {exc}")
+            if self.frida.events.mode == "event":
+                timeout = EVENT_HEARTBEAT_DUEL if self._snap.duel_active else EVENT_HEARTBEAT
+            else:
+                timeout = self.interval
+            seq = self.frida.events.wait(seq, timeout)
+        with self._cond:
+            self._cond.notify_all()
+
+    def _tick(self) -> None:
+        frida = self.frida
+        prev = self._snap
+        self._ticks += 1
+
+        attached = frida.is_attached()
+        active = False
+        rev = frida.state_store.revision
+        commands = prev.commands
+        if attached:
+            self._rpc_calls += 1
+            active, rev = frida.poll_duel()
+        else:
+            self._hooks_tried = self._hooks_ok = False
+        if active:
+            if not self._hooks_tried:
+                self._hooks_tried = True
+                self._hooks_ok = frida.subscribe_duel_events()
+                self._rpc_calls += 1
+            if rev != prev.revision or not prev.duel_active:
+                self._rpc_calls += 1
+                commands = frida.get_commands()
+        else:
+            commands = None
+            if not self._hooks_ok:
+                self._hooks_tried = False  # retry the install when the next duel starts
+
+        changed = (attached, active, rev, commands) != (
+            prev.attached, prev.duel_active, prev.revision, prev.commands)
+        snap = StateSnapshot(
+            seq=prev.seq + 1 if changed else prev.seq,
+            timestamp=time.monotonic(),
+            attached=attached,
+            duel_active=active,
+            revision=rev,
+            game_state=frida.state_store.snapshot if active else None,
+            commands=commands,
+        )
+        with self._cond:
+            self._snap = snap
+            subscribers = list(self._subscribers) if changed else []
+            self._cond.notify_all()
+        for cb in subscribers:
+            try:
+                cb(snap)
+            except Exception as exc:
+                logger.error(f"State subscriber error: {exc}")
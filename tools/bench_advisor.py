@@ -0,0 +1,91 @@
+"""Latency of each advisor backend on the same recorded boards.
+
+Uses the boards in tools/fixtures/boards (the shipped ones plus any written
+by ``python -m tools.bench_prompt record``). The local backend needs no key
+or network, so its timing always runs. The Gemini backend is skipped unless
+GEMINI_API_KEY is set; every call to it is a real (billed) request, so keep
+-n small.
+
+    python -m tools.bench_advisor -n 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+
+from bot.advisor_backend import AdviceRequest, AdvisorBackend
+from bot.gemini_advisor import GeminiBackend
+from bot.heuristic_advisor import HeuristicBackend
+from bot.prompt_builder import PromptBuilder
+from config import GEMINI_API_KEY
+from tools.bench_prompt import FIXTURE_DIR, load_fixtures
+
+
+def _time(backend: AdvisorBackend, requests: list[AdviceRequest], n: int) -> tuple[list[float], list[float], int]:
+    """(total ms, first-chunk ms, errors) over n passes of every request."""
+    totals, firsts, errors = [], [], 0
+    for _ in range(n):
+        for req in requests:
+            t0 = time.perf_counter()
+            first = None
+            try:
+                for _chunk in backend.stream(req):
+                    if first is None:
+                        first = time.perf_counter()
+            except Exception as exc:
+                errors += 1
+                print(f"  {backend.name}: {exc}")
+                continue
+            end = time.perf_counter()
+            totals.append((end - t0) * 1000.0)
+            firsts.append(((first or end) - t0) * 1000.0)
+    return totals, firsts, errors
+
+
+def _fmt(ms: float) -> str:
+    return f"{ms:9.3f} ms" if ms < 10 else f"{ms:9.0f} ms"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("-n", type=int, default=3, help="passes over the fixtures")
+    ap.add_argument("--dir", default=FIXTURE_DIR, help="fixture directory")
+    ap.add_argument("--local-n", type=int, default=1000, help="passes for the local backend")
+    args = ap.parse_args()
+
+    fixtures = load_fixtures(args.dir)
+    if not fixtures:
+        print(f"no fixtures in {args.dir}; record some with `python -m tools.bench_prompt record`")
+        return 1
+    builder = PromptBuilder()
+    requests = [AdviceRequest(gs, cmds, cards, builder.build(gs, cmds, cards)) for _, gs, cmds, cards in fixtures]
+
+    print(f"{len(requests)} boards")
+    print(f"{'backend':<10} {'calls':>6} {'first chunk p50':>16} {'total p50':>12} {'total p95':>12} {'errors':>6}")
+    backends: list[tuple[AdvisorBackend, int]] = [(HeuristicBackend(), args.local_n)]
+    if GEMINI_API_KEY:
+        backends.append((GeminiBackend(), args.n))
+    for backend, n in backends:
+        if not backend.available:
+            print(f"{backend.name:<10} skipped (not configured)")
+            continue
+        totals, firsts, errors = _time(backend, requests, n)
+        if not totals:
+            print(f"{backend.name:<10} {0:>6} {'-':>16} {'-':>12} {'-':>12} {errors:>6}")
+            continue
+        s = sorted(totals)
+        p95 = s[min(len(s) - 1, int(len(s) * 0.95))]
+        print(f"{backend.name:<10} {len(totals):>6} {_fmt(statistics.median(firsts)):>16} "
+              f"{_fmt(statistics.median(s)):>12} {_fmt(p95):>12} {errors:>6}")
+    if not GEMINI_API_KEY:
+        print(f"{'gemini':<10} skipped (GEMINI_API_KEY not set)")
+    sample = HeuristicBackend().complete(requests[0])
+    print(f"\nlocal advice for {fixtures[0][0]}:\n{sample}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
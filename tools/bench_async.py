@@ -0,0 +1,87 @@
+"""AsyncFridaIL2CPP concurrency against a fake agent (no game needed).
+
+The fake models the real agent: a fixed transport round-trip per call
+(overlappable) plus agent work serialized on one JS thread.
+
+    python -m tools.bench_async --calls 200 --rtt 2 --work 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+
+from memory.frida_async import AsyncFridaIL2CPP
+
+
+class FakeAgentExports:
+    """Async stand-in for ``script.exports_async`` with agent-like timing."""
+
+    def __init__(self, rtt_ms: float, work_ms: float) -> None:
+        self._rtt = rtt_ms / 1000.0
+        self._work = work_ms / 1000.0
+        self._js_thread = asyncio.Lock()
+        self.calls = 0
+
+    async def _rpc(self, result):
+        self.calls += 1
+        await asyncio.sleep(self._rtt / 2)
+        async with self._js_thread:
+            await asyncio.sleep(self._work)
+        await asyncio.sleep(self._rtt / 2)
+        return result
+
+    async def active(self):
+        return await self._rpc(True)
+
+    async def game_state(self):
+        return await self._rpc({"myLP": 8000, "rivalLP": 8000, "myHand": [{"cardId": 1}], "cards": {}})
+
+    async def get_commands(self):
+        return await self._rpc({"commands": [], "count": 0})
+
+    async def stall(self):
+        return await self._rpc(await asyncio.sleep(3600))
+
+
+async def _run(calls: int, limit: int, rtt: float, work: float) -> tuple[float, int]:
+    client = AsyncFridaIL2CPP(FakeAgentExports(rtt, work), max_concurrency=limit)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        client.get_game_state() if i % 2 else client.get_commands() for i in range(calls)
+    ))
+    return (time.perf_counter() - t0) * 1000.0, client._api.calls
+
+
+async def _cancellation(rtt: float, work: float) -> str:
+    client = AsyncFridaIL2CPP(FakeAgentExports(rtt, work), timeout=0.05)
+    timed_out = await client._call("stall", log=False)
+    task = asyncio.create_task(client._call("stall", timeout=60))
+    await asyncio.sleep(0.01)
+    cancelled = client.cancel_all()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return f"timeout -> {timed_out!r} (timeouts={client.timeouts}); cancel_all() cancelled {cancelled}, in_flight={client.in_flight}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--rtt", type=float, default=2.0, help="transport round-trip per call, ms")
+    ap.add_argument("--work", type=float, default=0.5, help="agent JS-thread time per call, ms")
+    args = ap.parse_args()
+
+    print(f"{args.calls} calls, rtt {args.rtt} ms, agent work {args.work} ms")
+    for limit in (1, 2, 4, 8, 16):
+        ms, n = asyncio.run(_run(args.calls, limit, args.rtt, args.work))
+        print(f"  concurrency {limit:>2}: {ms:8.1f} ms total  {ms / n:6.2f} ms/call")
+    print("  " + asyncio.run(_cancellation(args.rtt, args.work)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Round-trip cost of separate read RPCs vs. one ``batch`` call.
+
+Also reports the agent's per-call cost for each invoke path (benchInvoke).
+
+Needs a running game in a duel:
+
+    python -m tools.bench_batch -n 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+
+from memory.frida_il2cpp import FridaIL2CPP
+
+READS = ["status", "gameState", "getCommands", "getInputState"]
+
+
+def _sequential(frida: FridaIL2CPP) -> None:
+    frida.get_duel_status()
+    frida.get_game_state()
+    frida.get_commands()
+    frida.get_input_state()
+
+
+def _batched(frida: FridaIL2CPP) -> None:
+    frida.batch(READS)
+
+
+def _time(fn, frida: FridaIL2CPP, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(frida)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def _row(label: str, samples: list[float]) -> str:
+    s = sorted(samples)
+    p95 = s[min(len(s) - 1, int(len(s) * 0.95))]
+    return f"{label:<12} mean {statistics.fmean(s):7.2f} ms  p50 {statistics.median(s):7.2f} ms  p95 {p95:7.2f} ms"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("-n", type=int, default=30, help="iterations per variant")
+    args = ap.parse_args()
+
+    frida = FridaIL2CPP()
+    if not frida.attach():
+        print("could not attach to the game")
+        return 1
+    try:
+        if not frida.is_duel_active():
+            print("start a duel first")
+            return 1
+        # warm both paths (method tables, card text cache) before timing
+        _sequential(frida)
+        _batched(frida)
+
+        seq = _time(_sequential, frida, args.n)
+        bat = _time(_batched, frida, args.n)
+        print(f"{len(READS)} reads x {args.n} iterations")
+        print(_row("sequential", seq))
+        print(_row("batch", bat))
+        saved = statistics.fmean(seq) - statistics.fmean(bat)
+        print(f"saved        {saved:7.2f} ms per set ({saved / statistics.fmean(seq) * 100:.0f}%)")
+        print(f"agent stats  {frida.batch_stats()}")
+        inv = frida.bench_invoke(args.n * 100)
+        if inv:
+            direct = f"{inv['directNs']:.0f}" if inv["directNs"] is not None else "n/a"
+            print(f"invoke       {inv['method']}: alloc {inv['allocNs']:.0f} ns  "
+                  f"pooled {inv['pooledNs']:.0f} ns  direct {direct} ns")
+    finally:
+        frida.detach()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
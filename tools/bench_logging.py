@@ -0,0 +1,98 @@
+"""Cost of logging a flood of agent ``send()`` messages.
+
+Feeds string payloads through ``FridaIL2CPP._on_message`` (no game needed)
+from the calling thread, the way Frida's message thread does, with the GUI
+log buffer attached as the callback. Compares the old synchronous logger
+(strftime, print and flush per record on the caller's thread) with the
+queued one at DEBUG (records written) and INFO (debug dropped at the call
+site). Console output goes to a temp file unless --console is given, so the
+terminal's speed doesn't dominate.
+
+    python -m tools.bench_logging -n 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from memory.frida_il2cpp import FridaIL2CPP
+from ui.log_handler import TuiLogBuffer
+from utils import logger
+
+
+def _sync_log(buf: TuiLogBuffer):
+    """The pre-queue logger: everything on the caller's thread."""
+    def log(tag: str, msg: str) -> None:
+        ts = datetime.now().strftime("%H:%M:%S")
+        print(f"{ts} [{tag}] {msg}")
+        sys.stdout.flush()
+        buf.append(tag, msg)
+    return log
+
+
+def _flood(frida: FridaIL2CPP, n: int) -> float:
+    """Caller-side ms for n agent messages."""
+    t0 = time.perf_counter()
+    for i in range(n):
+        frida._on_message({"type": "send", "payload": f"hook fired: DuelClient.Update #{i}"}, None)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def run(frida: FridaIL2CPP, n: int, mode: str) -> tuple[float, float]:
+    """(caller ms, ms until every record is written)."""
+    buf = TuiLogBuffer()
+    t0 = time.perf_counter()
+    if mode == "sync":
+        logger.configure(level="DEBUG")
+        real = logger._log
+        logger._log = _sync_log(buf)
+        try:
+            caller = _flood(frida, n)
+        finally:
+            logger._log = real
+    else:
+        logger.set_log_callback(buf.append)
+        logger.configure(level=mode)
+        caller = _flood(frida, n)
+        logger.flush(timeout=60.0)
+        logger.set_log_callback(None)
+    return caller, (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=20000, help="messages per run")
+    ap.add_argument("--console", action="store_true", help="write to the real console")
+    args = ap.parse_args()
+
+    frida = FridaIL2CPP()
+    real_stdout = sys.stdout
+    sink = None
+    if not args.console:
+        sink = tempfile.TemporaryFile("w+", encoding="utf-8")
+        sys.stdout = sink
+    results = {}
+    try:
+        for mode in ("sync", "DEBUG", "INFO"):
+            run(frida, min(args.n, 1000), mode)  # warm up
+            results[mode] = run(frida, args.n, mode)
+    finally:
+        sys.stdout = real_stdout
+        if sink:
+            sink.close()
+
+    print(f"{args.n} agent messages{'' if args.console else ' (console to temp file)'}")
+    print(f"  {'logger':<14}{'caller ms':>11}{'us/msg':>9}{'drained ms':>12}")
+    labels = {"sync": "sync (old)", "DEBUG": "queued DEBUG", "INFO": "queued INFO"}
+    for mode, (caller, total) in results.items():
+        print(f"  {labels[mode]:<14}{caller:>11.1f}{caller * 1000 / args.n:>9.2f}{total:>12.1f}")
+    print(f"  writer: {logger.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Advisor prompt size: the old full-JSON prompt vs. PromptBuilder.
+
+Runs offline over recorded boards. tools/fixtures/boards ships five,
+anonymized (placeholder card names, effect text of realistic length):
+opening hand, mid-game, rival's turn, late game and going second. Record
+more from a live duel with
+
+    python -m tools.bench_prompt record
+
+(each call writes a fixture with the game state, commands and the card text
+it references), then compare token estimates across all fixtures:
+
+    python -m tools.bench_prompt --budget 1500 800
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from bot.prompt_builder import ACTION_NAMES, PHASE_NAMES, PromptBuilder, estimate_tokens, zone_label
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "boards")
+
+
+class FixtureCards:
+    def __init__(self, text: dict) -> None:
+        self._text = {int(k): v for k, v in text.items()}
+
+    def name(self, card_id: int) -> str | None:
+        entry = self._text.get(card_id)
+        return entry[0] if entry else None
+
+    def desc(self, card_id: int) -> str | None:
+        entry = self._text.get(card_id)
+        return entry[1] if entry else None
+
+
+def load_fixtures(fixture_dir: str) -> list[tuple[str, dict, dict, FixtureCards]]:
+    """(file name, game state, commands, card text) for every recorded board."""
+    out = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            fx = json.load(f)
+        out.append((os.path.basename(path), fx["gameState"], fx.get("commands") or {}, FixtureCards(fx.get("cards", {}))))
+    return out
+
+
+def _legacy_prompt(gs: dict, cmd_result: dict, cards: FixtureCards) -> str:
+    """The prompt GeminiAdvisor sent before PromptBuilder: every effect inline, as JSON."""
+    def card_detail(pile: list) -> list[dict]:
+        out = []
+        for c in pile:
+            entry = {"name": c.get("name") or f"id:{c.get('cardId', '?')}"}
+            desc = cards.desc(c.get("cardId", 0))
+            if desc:
+                entry["effect"] = desc
+            out.append(entry)
+        return out
+
+    def names(pile: list) -> list[str]:
+        return [c.get("name") or f"id:{c.get('cardId', '?')}" for c in pile]
+
+    def field_summary(field: dict) -> list[dict]:
+        return card_detail(field.get("monsters", []) + field.get("spells", []) + field.get("extraMonsters", []))
+
+    board = {
+        "myLP": gs.get("myLP", "?"),
+        "rivalLP": gs.get("rivalLP", "?"),
+        "myHand": card_detail(gs.get("myHand", [])),
+        "myField": field_summary(gs.get("myField", {})),
+        "rivalField": field_summary(gs.get("rivalField", {})),
+        "myGY": names(gs.get("myGY", [])),
+        "rivalGY": names(gs.get("rivalGY", [])),
+        "myBanished": names(gs.get("myBanished", [])),
+        "rivalBanished": names(gs.get("rivalBanished", [])),
+        "myDeckCount": gs.get("myDeckCount", "?"),
+        "myExtraDeckCount": gs.get("myExtraDeckCount", "?"),
+        "rivalDeckCount": gs.get("rivalDeckCount", "?"),
+        "turnNum": gs.get("turnNum", "?"),
+    }
+    lines = []
+    for i, cmd in enumerate(cmd_result.get("commands", [])):
+        name = cmd.get("name") or f"Unknown(id={cmd.get('cardId', '?')})"
+        acts = ",".join(label for bit, label in ACTION_NAMES.items() if cmd["mask"] & bit)
+        lines.append(f"  [{i}] {name} | zone={zone_label(cmd['zone'])} | actions={acts}")
+    phase = PHASE_NAMES.get(cmd_result.get("phase", -1), str(cmd_result.get("phase", -1)))
+    my_turn = cmd_result.get("myself", 0) == cmd_result.get("turnPlayer", -1)
+    return (
+        f"{json.dumps(board, separators=(',', ':'))}\n"
+        f"Phase:{phase} MyTurn:{my_turn}\n"
+        f"Commands:\n{chr(10).join(lines) or '  (none)'}\n"
+        "Quick advice?"
+    )
+
+
+def _record(out_dir: str) -> int:
+    from memory.frida_il2cpp import FridaIL2CPP
+
+    frida = FridaIL2CPP()
+    if not frida.attach():
+        print("could not attach to the game")
+        return 1
+    try:
+        gs = frida.get_game_state()
+        commands = frida.get_commands() or {}
+        if not gs:
+            print("start a duel first")
+            return 1
+        ids = set()
+        for key in ("myHand", "myGY", "rivalGY", "myBanished", "rivalBanished"):
+            ids.update(c.get("cardId", 0) for c in gs.get(key, []))
+        for key in ("myField", "rivalField"):
+            for zone in gs.get(key, {}).values():
+                ids.update(c.get("cardId", 0) for c in zone)
+        ids.update(c.get("cardId", 0) for c in commands.get("commands", []))
+        text = {str(cid): [frida.cards.name(cid), frida.cards.desc(cid)] for cid in sorted(ids) if cid}
+    finally:
+        frida.detach()
+
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"board-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"gameState": gs, "commands": commands, "cards": text}, f, ensure_ascii=False, indent=1)
+    print(f"recorded {path} ({len(text)} cards)")
+    return 0
+
+
+def _bench(fixture_dir: str, budgets: list[int]) -> int:
+    fixtures = load_fixtures(fixture_dir)
+    if not fixtures:
+        print(f"no fixtures in {fixture_dir}; record some with `python -m tools.bench_prompt record`")
+        return 1
+
+    header = f"{'fixture':<28} {'legacy':>7}" + "".join(f" {f'@{b}':>7} {'clip':>4}" for b in budgets)
+    print(header)
+    totals = [0] * (len(budgets) + 1)
+    for name, gs, cmds, cards in fixtures:
+        legacy = estimate_tokens(_legacy_prompt(gs, cmds, cards))
+        totals[0] += legacy
+        row = f"{name[:28]:<28} {legacy:>7}"
+        for i, budget in enumerate(budgets):
+            p = PromptBuilder(budget).build(gs, cmds, cards)
+            totals[i + 1] += p.tokens
+            row += f" {p.tokens:>7} {p.clipped:>4}"
+        print(row)
+
+    row = f"{'total':<28} {totals[0]:>7}"
+    for t in totals[1:]:
+        row += f" {t:>7} {f'{t / totals[0] * 100:.0f}%' if totals[0] else '-':>4}"
+    print(row)
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("command", nargs="?", choices=["bench", "record"], default="bench")
+    ap.add_argument("--dir", default=FIXTURE_DIR, help="fixture directory")
+    ap.add_argument("--budget", type=int, nargs="+", default=[1500, 800], help="token budgets to compare")
+    args = ap.parse_args()
+    if args.command == "record":
+        return _record(args.dir)
+    return _bench(args.dir, args.budget)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Import cost of the startup path, measured with ``python -X importtime``.
+
+Each run is a fresh interpreter, so this is a cold-ish start (the OS file
+cache stays warm). ``--eager`` also imports what ``main.py`` now preloads in
+the background, which is what it used to import before "Waiting for
+Master Duel window..." could be logged.
+
+    python -m tools.bench_startup -n 5
+    python -m tools.bench_startup -n 5 --eager
+    python -m tools.bench_startup -m bot.advisor --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _preload_list() -> list[str]:
+    # read main._PRELOAD without importing main (which would pull in keyboard/win32)
+    import ast
+    with open(os.path.join(ROOT, "main.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", "") == "_PRELOAD" for t in node.targets):
+            return list(ast.literal_eval(node.value))
+    return []
+
+
+def profile(modules: list[str]) -> tuple[float, list[tuple[float, float, str]], str]:
+    """(total ms, [(self us, cumulative us, module)], error) for one fresh interpreter."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((float(self_us), float(cum_us), name.rstrip()))
+        except ValueError:
+            continue
+    # top-level imports are the rows without indentation
+    total = sum(cum for _, cum, name in rows if not name.startswith("  ")) / 1000.0
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode else ""
+    return total, rows, error
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-m", "--module", action="append", help="module(s) to import (default: main)")
+    ap.add_argument("--eager", action="store_true", help="also import main's background preloads")
+    ap.add_argument("-n", type=int, default=5, help="runs")
+    ap.add_argument("--top", type=int, default=20, help="slowest modules to list")
+    args = ap.parse_args()
+
+    modules = args.module or ["main"]
+    if args.eager:
+        modules += _preload_list()
+
+    totals, rows, error = [], [], ""
+    for _ in range(args.n):
+        total, rows, error = profile(modules)
+        totals.append(total)
+    print(f"import {', '.join(modules)}")
+    if error:
+        print(f"  (stopped early: {error})")
+    print(f"  {len(rows)} modules, median {statistics.median(totals):.1f} ms, "
+          f"min {min(totals):.1f} ms over {args.n} runs")
+    print(f"\n  {'self ms':>8} {'cum ms':>8}  module")
+    for self_us, cum_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} {cum_us / 1000:8.1f}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
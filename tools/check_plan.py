@@ -0,0 +1,89 @@
+"""Run canned advisor replies through the plan parser and validator.
+
+Offline; exits non-zero if any case doesn't come out as expected:
+
+    python -m tools.check_plan
+"""
+
+from __future__ import annotations
+
+import sys
+
+from bot.advice_plan import StepStream, parse_plan, render_plan, resolve_step, validate_plan
+
+COMMANDS = {
+    "phase": 2, "myself": 0, "turnPlayer": 0, "online": False,
+    "commands": [
+        {"zone": 13, "index": 0, "mask": 0x18, "cardId": 101, "name": "Ash Blossom", "uid": 11},
+        {"zone": 13, "index": 1, "mask": 0x50, "cardId": 102, "name": "Aleister", "uid": 12},
+        {"zone": 6, "index": 0, "mask": 0x08, "cardId": 103, "name": "Invocation", "uid": 13},
+    ],
+}
+
+# (label, reply, expected (cmd, action, valid) per step or None for "not a plan", expected note)
+CASES = [
+    ("plain", '{"steps":[{"cmd":1,"action":"Summon","why":"search"},{"cmd":2,"action":"Activate"}],"note":"Then battle."}',
+     [(1, "Summon", True), (2, "Activate", True)], "Then battle."),
+    ("fenced", '```json\n{"steps":[{"cmd":0,"action":"activate"}]}\n```',
+     [(0, "Activate", True)], ""),
+    ("chatter", 'Sure! Here is the plan: {"steps":[{"cmd":1,"action":"SetMonster"}]} Good luck.',
+     [(1, "SetMonster", True)], ""),
+    ("bad index", '{"steps":[{"cmd":7,"action":"Summon"},{"cmd":"1","action":"Summon"}]}',
+     [(-1, "Summon", False), (-1, "Summon", False)], ""),
+    ("bad action", '{"steps":[{"cmd":2,"action":"Summon"},{"cmd":0,"action":"Attack"}]}',
+     [(2, "Summon", False), (0, "Attack", False)], ""),
+    ("empty", '{"steps":[],"note":"Pass."}', [], "Pass."),
+    ("free text", "1. Summon Aleister 2. Activate Invocation", None, ""),
+    ("truncated", '{"steps":[{"cmd":1,"action":"Summon"},{"cmd":2,', None, ""),
+]
+
+
+def _check(label: str, reply: str, expected, note: str) -> list[str]:
+    problems = []
+    raw = parse_plan(reply)
+    if expected is None:
+        return [f"{label}: parsed a plan from a non-plan reply"] if raw is not None else []
+    if raw is None:
+        return [f"{label}: no plan parsed"]
+    plan = validate_plan(raw, COMMANDS, revision=1)
+    got = [(s.cmd, s.action, s.valid) for s in plan.steps]
+    if got != expected:
+        problems.append(f"{label}: steps {got} != {expected}")
+    if plan.note != note:
+        problems.append(f"{label}: note {plan.note!r} != {note!r}")
+
+    # streaming in small chunks must yield the same steps as the whole reply
+    stream = StepStream()
+    streamed = []
+    for i in range(0, len(reply), 7):
+        streamed.extend(stream.feed(reply[i:i + 7]))
+    if streamed != raw["steps"]:
+        problems.append(f"{label}: streamed steps {streamed} != {raw['steps']}")
+
+    for step in plan.executable:
+        live = resolve_step(step, COMMANDS)
+        if live is None or live["uid"] != COMMANDS["commands"][step.cmd]["uid"]:
+            problems.append(f"{label}: step {step.label} did not resolve")
+    return problems
+
+
+def main() -> int:
+    failures = []
+    for label, reply, expected, note in CASES:
+        problems = _check(label, reply, expected, note)
+        failures.extend(problems)
+        print(f"{'FAIL' if problems else 'ok  '} {label}")
+    # a step whose card moved (new index) still resolves; one whose action is gone doesn't
+    step = validate_plan(parse_plan(CASES[0][1]), COMMANDS, 1).steps[0]
+    moved = {"commands": [dict(COMMANDS["commands"][1], index=3)]}
+    gone = {"commands": [dict(COMMANDS["commands"][1], mask=0x08)]}
+    if (resolve_step(step, moved) or {}).get("index") != 3 or resolve_step(step, gone) is not None:
+        failures.append("resolve: live lookup by uid/action wrong")
+    print(f"\n{render_plan(validate_plan(parse_plan(CASES[3][1]), COMMANDS, 1))}")
+    for f in failures:
+        print(f)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""List model for the hand/field panels, diffed by card identity."""
+
+from __future__ import annotations
+
+import html
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
+
+if TYPE_CHECKING:
+    from bot.prompt_builder import CardText
+
+EMPTY_TEXT = "(empty)"
+
+
+@dataclass(frozen=True)
+class CardRow:
+    key: object      # uid when the engine gives one, else the card's slot
+    text: str
+    card_id: int = 0
+
+
+def card_rows(cards: list[dict], *, positions: tuple[str, str] | None = None, slot: str = "") -> list[CardRow]:
+    """Rows for a zone's cards; *positions* is the (face-up, face-down) label, e.g. ("ATK", "SET")."""
+    rows = []
+    seen = set()
+    for i, c in enumerate(cards):
+        uid = c.get("uid", 0)
+        key = uid if uid and uid > 0 else (slot, c.get("zone", "?"), c.get("index", i))
+        if key in seen:  # never let two rows share an identity
+            key = (slot, "dup", i)
+        seen.add(key)
+        card_id = c.get("cardId", 0) or 0
+        name = c.get("name") or str(card_id or "?")
+        if positions:
+            pos = positions[0] if c.get("face") else positions[1]
+            text = f"[{c.get('zone', '?')}] {name} ({pos})"
+        else:
+            text = name
+        rows.append(CardRow(key, text, card_id))
+    return rows
+
+
+class CardListModel(QAbstractListModel):
+    """Rows keyed by ``CardRow.key``; ``set_rows()`` emits per-row insert/remove/move/change.
+
+    A card that stays put keeps its row (and selection, scroll position and
+    hover), so only rows that actually changed repaint. Tooltips look the
+    card text up in the catalog when the view asks for them.
+    """
+
+    def __init__(self, cards: CardText | None = None, parent=None) -> None:
+        super().__init__(parent)
+        self._cards = cards
+        self._rows: list[CardRow] = []
+
+    @property
+    def count(self) -> int:
+        """Cards shown, not counting the placeholder."""
+        return sum(1 for r in self._rows if r.key is not None)
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row.text
+        if role == Qt.ToolTipRole and row.card_id and self._cards is not None:
+            return self._tooltip(row.card_id)
+        return None
+
+    def _tooltip(self, card_id: int) -> str | None:
+        name = self._cards.name(card_id)
+        desc = self._cards.desc(card_id)
+        if not name and not desc:
+            return None
+        body = html.escape(desc).replace("\n", "<br>") if desc else "<i>no card text cached yet</i>"
+        return f"<b>{html.escape(name or str(card_id))}</b><p>{body}</p>"
+
+    def set_rows(self, rows: list[CardRow]) -> None:
+        if not rows:
+            rows = [CardRow(None, EMPTY_TEXT)]
+        if rows == self._rows:
+            return
+        root = QModelIndex()
+        wanted = {r.key for r in rows}
+
+        # drop cards that left, bottom up so indices stay valid
+        for i in range(len(self._rows) - 1, -1, -1):
+            if self._rows[i].key not in wanted:
+                self.beginRemoveRows(root, i, i)
+                del self._rows[i]
+                self.endRemoveRows()
+
+        # then walk the target order, moving or inserting as needed
+        for i, row in enumerate(rows):
+            if i < len(self._rows) and self._rows[i].key == row.key:
+                if self._rows[i] != row:
+                    self._rows[i] = row
+                    idx = self.index(i)
+                    self.dataChanged.emit(idx, idx)
+                continue
+            j = next((k for k in range(i + 1, len(self._rows)) if self._rows[k].key == row.key), -1)
+            if j >= 0:
+                self.beginMoveRows(root, j, j, root, i)
+                self._rows.insert(i, self._rows.pop(j))
+                self.endMoveRows()
+                if self._rows[i] != row:
+                    self._rows[i] = row
+                    idx = self.index(i)
+                    self.dataChanged.emit(idx, idx)
+            else:
+                self.beginInsertRows(root, i, i)
+                self._rows.insert(i, row)
+                self.endInsertRows()
@@ -0,0 +1,173 @@
+"""Advisor chat history: markdown-to-HTML, per-message cache and transcript eviction."""
+
+from __future__ import annotations
+
+import itertools
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from config import CHAT_HISTORY_MAX, CHAT_TRANSCRIPT_PATH
+from utils import logger
+
+_ids = itertools.count(1)
+
+
+@dataclass(eq=False)
+class ChatMessage:
+    text: str
+    type: str                   # "ai" | "system" | "loading"
+    time: str
+    streaming: bool = False     # still receiving chunks; may change in place
+    version: int = 0            # bumped on every change, invalidates the cached HTML
+    id: int = field(default_factory=lambda: next(_ids))
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def md_to_html(text: str) -> str:
+    text = _escape(text)
+
+    # close unclosed markdown pairs
+    if text.count("**") % 2 != 0:
+        text += "**"
+    stripped_bold = re.sub(r'\*\*', '', text)
+    if stripped_bold.count("*") % 2 != 0:
+        text += "*"
+
+    text = re.sub(r'\*\*(.+?)\*\*', r'<b style="color:#89b4fa;">\1</b>', text)
+    text = re.sub(r'__(.+?)__', r'<b style="color:#89b4fa;">\1</b>', text)
+    text = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'<i>\1</i>', text)
+    text = re.sub(r'`(.+?)`', r'<code style="background:#313244; padding:1px 4px; border-radius:3px;">\1</code>', text)
+
+    result = []
+    for line in text.split("\n"):
+        stripped = line.strip()
+
+        m = re.match(r'^(\d+)[.)]\s+(.+)$', stripped)
+        if m:
+            num, content = m.group(1), m.group(2)
+            result.append(
+                f'<div style="margin:3px 0 3px 8px;">'
+                f'<span style="color:#89b4fa; font-weight:bold;">{num}.</span> {content}</div>'
+            )
+            continue
+
+        m = re.match(r'^[-*]\s+(.+)$', stripped)
+        if m:
+            result.append(
+                f'<div style="margin:3px 0 3px 8px;">'
+                f'<span style="color:#f9e2af;">&#8226;</span> {m.group(1)}</div>'
+            )
+            continue
+
+        if not stripped:
+            result.append('<div style="height:6px;"></div>')
+        else:
+            result.append(f'<div style="margin:2px 0;">{stripped}</div>')
+
+    return "".join(result)
+
+
+def message_html(msg: ChatMessage) -> str:
+    ts = msg.time
+    if msg.type == "system":
+        return (
+            f'<div style="text-align:center; margin:8px 0;">'
+            f'<span style="color:#6c7086; font-size:11px;">{ts} -- {_escape(msg.text)}</span>'
+            f'</div>'
+        )
+    if msg.type == "loading":
+        return (
+            f'<div style="margin:8px 0; padding:10px 14px; '
+            f'background:#181825; border-radius:12px; border:1px solid #313244;">'
+            f'<span style="color:#89b4fa; font-size:12px;">Analyzing board state...</span>'
+            f'</div>'
+        )
+    return (
+        f'<div style="margin:8px 0; padding:12px 16px; '
+        f'background:#181825; border-radius:12px; border:1px solid #313244;">'
+        f'<div style="color:#89b4fa; font-size:10px; margin-bottom:8px; font-weight:bold;">'
+        f'AI Advisor  {ts}</div>'
+        f'<div style="color:#cdd6f4; font-size:13px; line-height:1.6;">{md_to_html(msg.text)}</div>'
+        f'</div>'
+    )
+
+
+class ChatLog:
+    """The messages shown in the chat panel.
+
+    Rendered HTML is cached per message and only rebuilt when the message's
+    version changes. Past ``max_messages`` the oldest finished messages are
+    appended to a markdown transcript on disk and dropped; ``evicted`` holds
+    them until the view has removed them from its document.
+    """
+
+    def __init__(self, max_messages: int = CHAT_HISTORY_MAX, transcript_path: str = CHAT_TRANSCRIPT_PATH) -> None:
+        self.messages: list[ChatMessage] = []
+        self.max_messages = max_messages
+        self.transcript_path = transcript_path
+        self.evicted: list[ChatMessage] = []
+        self.dirty = False
+        self._html: dict[int, tuple[int, str]] = {}  # id -> (version, html)
+
+    def add(self, text: str, msg_type: str = "ai", streaming: bool = False) -> ChatMessage:
+        msg = ChatMessage(text, msg_type, datetime.now().strftime("%H:%M:%S"), streaming)
+        self.messages.append(msg)
+        self.dirty = True
+        self._evict()
+        return msg
+
+    def update(self, msg: ChatMessage, **changes) -> None:
+        for name, value in changes.items():
+            setattr(msg, name, value)
+        msg.version += 1
+        self.dirty = True
+
+    def html(self, msg: ChatMessage) -> str:
+        cached = self._html.get(msg.id)
+        if cached and cached[0] == msg.version:
+            return cached[1]
+        out = message_html(msg)
+        self._html[msg.id] = (msg.version, out)
+        return out
+
+    def clear(self) -> None:
+        self._save(self.messages)
+        self.messages.clear()
+        self.evicted.clear()
+        self._html.clear()
+        self.dirty = False
+
+    def _evict(self) -> None:
+        if len(self.messages) <= self.max_messages:
+            return
+        # drop a quarter at a time so the view trims its document in batches
+        target = self.max_messages - self.max_messages // 4
+        n = 0
+        while len(self.messages) - n > target and not self.messages[n].streaming:
+            n += 1
+        if not n:
+            return
+        gone, self.messages = self.messages[:n], self.messages[n:]
+        for msg in gone:
+            self._html.pop(msg.id, None)
+        self.evicted.extend(gone)
+        self._save(gone)
+
+    def _save(self, messages: list[ChatMessage]) -> None:
+        kept = [m for m in messages if m.type != "loading" and m.text]
+        if not kept or not self.transcript_path:
+            return
+        day = datetime.now().strftime("%Y-%m-%d")
+        lines = []
+        for m in kept:
+            who = "advisor" if m.type == "ai" else m.type
+            lines.append(f"**{day} {m.time} {who}**\n\n{m.text.strip()}\n\n")
+        try:
+            with open(self.transcript_path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        except OSError as exc:
+            logger.warn(f"Chat transcript not saved: {exc}")
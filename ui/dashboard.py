@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import time
+
 from rich.live import Live
 from rich.panel import Panel
 from rich.text import Text
 
-from memory.frida_il2cpp import FridaIL2CPP
+from memory.state_poller import StatePoller
 from ui.bot_state import BotState
 from ui.log_handler import TuiLogBuffer
+from ui.refresh import RefreshController
 from config import (
     TUI_REFRESH_RATE, HOTKEY_INSTANT_WIN, HOTKEY_AUTOPILOT,
-    HOTKEY_WIN_NOW, STOP_HOTKEY,
+    HOTKEY_WIN_NOW, STOP_HOTKEY, REFRESH_ACTIVE_MS, REFRESH_NORMAL_MS,
 )
 
 
@@ -17,37 +20,25 @@ class Dashboard:
 
     def __init__(
         self,
-        frida_session: FridaIL2CPP,
+        poller: StatePoller,
         hwnd: int,
         bot_state: BotState,
         log_buf: TuiLogBuffer,
     ) -> None:
-        self.frida = frida_session
+        self.poller = poller
         self.hwnd = hwnd
         self.state = bot_state
         self.log_buf = log_buf
+        self._duel_seq = -1
+        self._duel_cache = Text()
+        # a terminal redraw is dearer than a Qt repaint, so never faster than TUI_REFRESH_RATE
+        top_ms = 1000 // TUI_REFRESH_RATE
+        self.refresh = RefreshController(
+            active_ms=max(REFRESH_ACTIVE_MS, top_ms), normal_ms=max(REFRESH_NORMAL_MS, top_ms),
+        )
 
-    def _build_layout(self) -> Panel:
+    def _duel_text(self, gs) -> Text:
         lines = Text()
-
-        attached = self.frida.is_attached()
-        dot_attach = "[green]@[/]" if attached else "[red]@[/]"
-        lines.append_text(Text.from_markup(
-            f"  Status: {dot_attach} {'Attached' if attached else 'Detached'}\n"
-        ))
-        lines.append_text(Text.from_markup(
-            f"  Window: masterduel (HWND: {hex(self.hwnd)})\n"
-        ))
-        dot_frida = "[green]@[/]" if attached else "[red]@[/]"
-        lines.append_text(Text.from_markup(
-            f"  Frida:  {dot_frida} {'Connected' if attached else 'Disconnected'}\n"
-        ))
-
-        lines.append_text(Text.from_markup("\n  [bold]-- Duel --[/bold]\n"))
-
-        duel_active = self.frida.is_duel_active() if attached else False
-        gs = self.frida.get_game_state() if (attached and duel_active) else None
-
         if gs:
             lines.append_text(Text.from_markup(f"  Duel Active: [green]Yes[/]\n"))
             lines.append_text(Text.from_markup(f"  My LP:       {gs['myLP']}\n"))
@@ -72,9 +63,9 @@ class Dashboard:
                 lines.append_text(Text.from_markup("    [dim](empty)[/]\n"))
 
             my_field = gs.get("myField", {})
-            my_mons = my_field.get("monsters", [])
-            my_sp = my_field.get("spells", [])
-            my_em = my_field.get("extraMonsters", [])
+            my_mons = my_field.get("monsters", ())
+            my_sp = my_field.get("spells", ())
+            my_em = my_field.get("extraMonsters", ())
             total_field = len(my_mons) + len(my_sp) + len(my_em)
             lines.append_text(Text.from_markup(
                 f"\n  [bold]-- My Field ({total_field}) --[/bold]\n"
@@ -95,9 +86,9 @@ class Dashboard:
                 lines.append_text(Text.from_markup("    [dim](empty)[/]\n"))
 
             r_field = gs.get("rivalField", {})
-            r_mons = r_field.get("monsters", [])
-            r_sp = r_field.get("spells", [])
-            r_em = r_field.get("extraMonsters", [])
+            r_mons = r_field.get("monsters", ())
+            r_sp = r_field.get("spells", ())
+            r_em = r_field.get("extraMonsters", ())
             r_total = len(r_mons) + len(r_sp) + len(r_em)
             lines.append_text(Text.from_markup(
                 f"\n  [bold]-- Rival Field ({r_total}) --[/bold]\n"
@@ -143,6 +134,33 @@ class Dashboard:
             lines.append_text(Text.from_markup(f"  My LP:       --\n"))
             lines.append_text(Text.from_markup(f"  Rival LP:    --\n"))
 
+        return lines
+
+    def _build_layout(self) -> Panel:
+        lines = Text()
+
+        snap = self.poller.latest()
+        attached = snap.attached
+        dot_attach = "[green]@[/]" if attached else "[red]@[/]"
+        lines.append_text(Text.from_markup(
+            f"  Status: {dot_attach} {'Attached' if attached else 'Detached'}\n"
+        ))
+        lines.append_text(Text.from_markup(
+            f"  Window: masterduel (HWND: {hex(self.hwnd)})\n"
+        ))
+        dot_frida = "[green]@[/]" if attached else "[red]@[/]"
+        lines.append_text(Text.from_markup(
+            f"  Frida:  {dot_frida} {'Connected' if attached else 'Disconnected'}\n"
+        ))
+
+        lines.append_text(Text.from_markup("\n  [bold]-- Duel --[/bold]\n"))
+
+        if snap.seq != self._duel_seq:
+            self._duel_seq = snap.seq
+            self._duel_cache = self._duel_text(snap.game_state)
+            self.refresh.note_activity()
+        lines.append_text(self._duel_cache)
+
         lines.append_text(Text.from_markup("\n  [bold]-- Features --[/bold]\n"))
         ap = self.state.autopilot_enabled
         ap_label = "[green]ON (AI)[/]" if ap else "[red]OFF[/]"
@@ -162,9 +180,9 @@ class Dashboard:
         lines.append_text(Text.from_markup(f"  {STOP_HOTKEY}  Quit\n"))
 
         lines.append_text(Text.from_markup("\n  [bold]-- Log --[/bold]\n"))
-        log_lines = self.log_buf.get_lines()
+        log_lines = self.log_buf.get_lines(10)
         if log_lines:
-            for line in log_lines[-10:]:
+            for line in log_lines:
                 lines.append_text(Text.from_markup(f"  {_markup_safe(line)}\n"))
         else:
             lines.append_text(Text.from_markup("  [dim](no log entries yet)[/]\n"))
@@ -172,16 +190,25 @@ class Dashboard:
         return Panel(
             lines,
             title="[bold]Master Duel Bot[/bold]",
+            subtitle=f"[dim]{self.refresh.label()}[/]",
             border_style="blue",
             width=64,
         )
 
     def run(self) -> None:
-        interval = 1.0 / TUI_REFRESH_RATE
-        with Live(self._build_layout(), refresh_per_second=TUI_REFRESH_RATE) as live:
+        # redraw only when we do, at the rate the refresh controller picks
+        with Live(self._build_layout(), auto_refresh=False) as live:
             while not self.state.stop_event.is_set():
-                live.update(self._build_layout())
-                self.state.stop_event.wait(interval)
+                t0 = time.perf_counter()
+                live.update(self._build_layout(), refresh=True)
+                cost = (time.perf_counter() - t0) * 1000.0
+                snap = self.poller.latest()
+                gs = snap.game_state or {}
+                interval = self.refresh.next_interval(
+                    cost, visible=True, duel_active=snap.duel_active,
+                    busy=bool(gs) and gs.get("turnPlayer") == gs.get("myself"),
+                )
+                self.state.stop_event.wait(interval / 1000.0)
 
 
 _PHASE_NAMES = {
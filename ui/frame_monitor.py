@@ -0,0 +1,67 @@
+"""Measures how long the Qt event loop is blocked between frames."""
+
+from __future__ import annotations
+
+import time
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+from config import FRAME_BUDGET_MS
+from memory.duel_events import LatencyHistogram
+from utils import logger
+
+# stalls longer than this get logged individually
+_STALL_LOG_MS = 100.0
+
+
+class FrameMonitor(QObject):
+    """A precise ~one-frame timer whose lateness is the GUI thread's blocking time.
+
+    Every tick records ``actual gap - interval`` into a histogram; anything
+    above ``FRAME_BUDGET_MS`` counts as an over-budget frame.
+    """
+
+    def __init__(self, parent=None, interval_ms: int = 16) -> None:
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.hist = LatencyHistogram()
+        self.over_budget = 0
+        self.window_max = 0.0  # worst lag since the last take_window_max()
+        self._last = 0.0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self) -> None:
+        self._last = time.perf_counter()
+        self._timer.start(self.interval_ms)
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def set_interval(self, interval_ms: int) -> None:
+        if interval_ms != self.interval_ms:
+            self.interval_ms = interval_ms
+            self._last = time.perf_counter()  # setInterval restarts the timer
+            self._timer.setInterval(interval_ms)
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        lag = max(0.0, (now - self._last) * 1000.0 - self.interval_ms)
+        self._last = now
+        self.hist.record(lag)
+        self.window_max = max(self.window_max, lag)
+        if lag > FRAME_BUDGET_MS:
+            self.over_budget += 1
+            if lag >= _STALL_LOG_MS:
+                logger.warn(f"GUI thread blocked for {lag:.0f} ms")
+
+    def take_window_max(self) -> float:
+        worst, self.window_max = self.window_max, 0.0
+        return worst
+
+    def summary(self) -> dict:
+        out = self.hist.summary()
+        out["over_budget"] = self.over_budget
+        out["budget_ms"] = FRAME_BUDGET_MS
+        return out
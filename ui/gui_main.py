@@ -1,39 +1,54 @@
 from __future__ import annotations
 
 import sys
-import threading
 
+from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtWidgets import QApplication
 
+from bot.advisor_prefetch import AdvisorPrefetcher
+from bot.advisor_session import AdvisorSession
 from bot.autopilot import DuelAutopilot
-from bot.gemini_advisor import GeminiAdvisor
-from config import SPEED_SCALE
-from memory.frida_il2cpp import FridaIL2CPP
+from bot.advice_plan import PlanStep, resolve_step
+from bot.advisor import Advisor
+from config import ADVISOR_PREFETCH, SPEED_SCALE
+from memory.state_poller import StatePoller
 from ui.bot_state import BotState
 from ui.log_handler import TuiLogBuffer
 from ui.main_window import MainWindow, SettingsDialog
-from utils import logger
+from ui.qt_threads import TaskThread
+from utils import logger, startup
+
+
+class _AdviceBridge(QObject):
+    """Carries advisor callbacks and the F4/F7 hotkeys onto the GUI thread."""
+
+    token = Signal(int, str)
+    done = Signal(int, str, str)
+    plan = Signal(int, object)
+    ask = Signal()
+    run_step = Signal()
 
 
 def run_gui(
-    frida_session: FridaIL2CPP,
+    poller: StatePoller,
     hwnd: int,
     state: BotState,
     log_buf: TuiLogBuffer,
     autopilot: DuelAutopilot,
-    advisor: GeminiAdvisor | None = None,
+    advisor: Advisor | None = None,
     assist_cb_ref: list | None = None,
+    run_step_cb_ref: list | None = None,
 ) -> None:
+    frida_session = poller.frida
     app = QApplication(sys.argv)
-    win = MainWindow(frida_session, hwnd, state, log_buf)
+    win = MainWindow(poller, hwnd, state, log_buf)
+    if advisor:
+        win.set_metrics(advisor.metrics)
 
     def _toggle_autopilot(checked: bool) -> None:
         if state.autopilot_enabled != checked:
             state.toggle_autopilot()
-        if checked:
-            autopilot.enable()
-        else:
-            autopilot.disable()
+        TaskThread(autopilot.enable if checked else autopilot.disable, "autopilot toggle").start()
         logger.info(f"Autopilot: {'ON' if checked else 'OFF'}")
 
     def _toggle_instant_win(checked: bool) -> None:
@@ -41,53 +56,86 @@ def run_gui(
             state.toggle_instant_win()
         logger.info(f"Instant Win: {'ON' if checked else 'OFF'}")
 
+    session = AdvisorSession(advisor, poller) if advisor else None
+    prefetcher = AdvisorPrefetcher(advisor, poller) if advisor and ADVISOR_PREFETCH else None
+    if prefetcher:
+        prefetcher.start()
+    bridge = _AdviceBridge()
+
     def _assist() -> None:
-        if not advisor or not advisor.has_client:
-            win.append_ai_advice("No API key configured. Click the gear icon to add your Gemini API key.", "system")
+        if not advisor or not advisor.ready:
+            win.append_ai_advice(
+                "No API key configured. Click the gear icon to add your Gemini API key "
+                "or switch to the local advisor.", "system")
             return
-        if not frida_session.is_attached() or not frida_session.is_duel_active():
+        if not poller.latest().duel_active:
             win.append_ai_advice("No active duel detected.", "system")
             return
 
-        win.append_ai_advice("", "loading")
+        # a second press cancels the in-flight request and starts over
+        rid = session.ask(bridge.token.emit, bridge.done.emit, bridge.plan.emit)
+        win.set_plan(None)
+        win.begin_ai_stream(rid)
         win.lbl_ai_status.setText("Thinking...")
         win.lbl_ai_status.setStyleSheet("color: #89b4fa; font-size: 10px; background: transparent;")
 
-        def _query():
-            try:
-                advice = advisor.analyze_board(frida_session)
-                if win._ai_messages and win._ai_messages[-1]["type"] == "loading":
-                    win._ai_messages.pop()
-                if advice:
-                    win.append_ai_advice(advice.strip())
-                else:
-                    win.append_ai_advice("Could not get advice. Check API key in .env file.", "system")
-            except Exception as exc:
-                if win._ai_messages and win._ai_messages[-1]["type"] == "loading":
-                    win._ai_messages.pop()
-                win.append_ai_advice(f"Error: {exc}", "system")
-            finally:
-                _update_ai_status()
-
-        threading.Thread(target=_query, daemon=True).start()
+    def _advice_plan(rid: int, plan) -> None:
+        win.set_plan(plan)
+
+    def _run_step() -> None:
+        step = win.next_plan_step()
+        if step is None:
+            return
+        snap = poller.latest()
+        commands = snap.commands if isinstance(snap.commands, dict) else {}
+        if win.plan.online or commands.get("online"):
+            win.append_ai_advice("Running plan steps only works in solo duels.", "system")
+            return
+        live = resolve_step(step, commands)
+        if live is None:
+            win.mark_plan_step(step, False, "that command is no longer available")
+            return
+        player = commands.get("myself", 0)
+        logger.info(f"Plan step: {step.label}")
+        win.start_plan_step(step)  # until _step_done, next_plan_step() is None and the button is off
+        task = TaskThread(
+            lambda: frida_session.do_command(player, live["zone"], live["index"], step.command_type),
+            "do_command",
+        )
+        task.done.connect(lambda result, s=step: _step_done(s, result))
+        task.start()
+
+    def _step_done(step: PlanStep, result) -> None:
+        if isinstance(result, dict) and result.get("success"):
+            win.mark_plan_step(step, True)
+        else:
+            error = result.get("error", "no result") if isinstance(result, dict) else "no result"
+            win.mark_plan_step(step, False, error)
+
+    def _advice_done(rid: int, status: str, error: str) -> None:
+        win.end_ai_stream(rid, status, error)
+        if not session.busy:
+            _update_ai_status()
 
     def _toggle_speed(checked: bool) -> None:
         if state.speed_hack_enabled != checked:
             state.toggle_speed_hack()
-        frida_session.set_time_scale(SPEED_SCALE if checked else 1.0)
+        scale = SPEED_SCALE if checked else 1.0
+        TaskThread(lambda: frida_session.set_time_scale(scale), "set_time_scale").start()
         logger.info(f"Speed Hack: {'ON' if checked else 'OFF'}")
 
     def _win_now() -> None:
         logger.info("One-shot instant win triggered!")
-        try:
-            frida_session.instant_win()
-        except Exception as exc:
-            logger.error(f"One-shot failed: {exc}")
+        TaskThread(frida_session.instant_win, "One-shot").start()
 
     def _update_ai_status() -> None:
-        if advisor and advisor.has_client:
+        if advisor and advisor.ready and not advisor.backend.remote:
             win.lbl_ai_status.setText(advisor.model)
             win.lbl_ai_status.setStyleSheet("color: #6c7086; font-size: 10px; background: transparent;")
+        elif advisor and advisor.ready:
+            cs = advisor.cache.stats()
+            win.lbl_ai_status.setText(f"{advisor.model} · cache {cs['hits']}/{cs['hits'] + cs['misses']}")
+            win.lbl_ai_status.setStyleSheet("color: #6c7086; font-size: 10px; background: transparent;")
         else:
             win.lbl_ai_status.setText("Not configured")
             win.lbl_ai_status.setStyleSheet("color: #f38ba8; font-size: 10px; background: transparent;")
@@ -99,20 +147,45 @@ def run_gui(
 
     _update_ai_status()
 
+    bridge.token.connect(win.append_ai_stream)
+    bridge.done.connect(_advice_done)
+    bridge.plan.connect(_advice_plan)
+    bridge.ask.connect(_assist)
+    bridge.run_step.connect(_run_step)
+
     win.btn_autopilot.toggled.connect(_toggle_autopilot)
     win.btn_instant_win.toggled.connect(_toggle_instant_win)
     win.btn_speed.toggled.connect(_toggle_speed)
     win.btn_assist.clicked.connect(_assist)
+    win.btn_run_step.clicked.connect(_run_step)
     win.btn_win_now.clicked.connect(_win_now)
     win.btn_settings.clicked.connect(_open_settings)
 
-    # gui sets the callback so F4 hotkey works before window exists
+    # gui sets the callback so F4 hotkey works before window exists;
+    # the hotkey fires on the keyboard hook thread, so hop to the GUI thread
     if assist_cb_ref is not None:
-        assist_cb_ref[0] = _assist
+        assist_cb_ref[0] = bridge.ask.emit
+    if run_step_cb_ref is not None:
+        run_step_cb_ref[0] = bridge.run_step.emit
+
+    def _shown() -> None:
+        startup.mark("GUI shown")
+        logger.info(f"Startup: {startup.summary()}")
+        if startup.ENABLED:
+            logger.flush()
+            print(startup.report())
 
     win.show()
+    # fires once the event loop has painted the window
+    QTimer.singleShot(0, _shown)
     app.exec()
 
+    if session:
+        session.shutdown()
+    if prefetcher:
+        prefetcher.stop()
+        logger.info(f"Advisor prefetch: {prefetcher.stats()}")
+
     state.stop_event.set()
     if autopilot.ai_active:
         autopilot.disable()
@@ -1,23 +1,55 @@
-"""Captures log output into a deque for TUI display."""
+"""Captures log output into a ring buffer for the GUI log panel and TUI."""
 
 from __future__ import annotations
 
 import collections
+import itertools
+import threading
 from datetime import datetime
 
+from config import LOG_VIEW_LINES
+
+# (seq, time, tag, message); seq increases by one per appended entry
+LogEntry = tuple[int, str, str, str]
+
 
 class TuiLogBuffer:
-    """Ring buffer that stores recent log entries for the dashboard."""
+    """Ring buffer of recent log entries, each stamped with a sequence number.
+
+    Views remember the last sequence number they drew and ask for
+    ``since(seq)``, so each refresh touches only the new entries no matter
+    how much history is kept.
+    """
 
-    def __init__(self, maxlen: int = 30) -> None:
-        self._buf: collections.deque[tuple[str, str, str]] = collections.deque(maxlen=maxlen)
+    def __init__(self, maxlen: int = LOG_VIEW_LINES) -> None:
+        self._buf: collections.deque[LogEntry] = collections.deque(maxlen=maxlen)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self.last_seq = 0
 
     def append(self, tag: str, msg: str) -> None:
         ts = datetime.now().strftime("%H:%M:%S")
-        self._buf.append((ts, tag, msg))
+        with self._lock:
+            seq = next(self._seq)
+            self._buf.append((seq, ts, tag, msg))
+            self.last_seq = seq
+
+    def since(self, seq: int) -> list[LogEntry]:
+        """Entries newer than *seq*, oldest first (only those still kept if the view fell behind)."""
+        if seq >= self.last_seq:
+            return []
+        with self._lock:
+            if not self._buf:
+                return []
+            # the buffer holds a contiguous seq range, so the new entries are simply the last n
+            return self._tail(self.last_seq - seq)
+
+    def get_lines(self, limit: int | None = None) -> list[str]:
+        with self._lock:
+            entries = self._tail(limit) if limit else list(self._buf)
+        return [f"{ts} [{tag}] {msg}" for _, ts, tag, msg in entries]
 
-    def get_lines(self) -> list[str]:
-        lines = []
-        for ts, tag, msg in self._buf:
-            lines.append(f"{ts} [{tag}] {msg}")
-        return lines
+    def _tail(self, n: int) -> list[LogEntry]:
+        tail = list(itertools.islice(reversed(self._buf), n))
+        tail.reverse()
+        return tail
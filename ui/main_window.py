@@ -2,22 +2,26 @@ from __future__ import annotations
 
 import math
 import os
-import re
 import sys
+import time
 from datetime import datetime
 
-from PySide6.QtCore import QPointF, QTimer, Qt
-from PySide6.QtGui import QColor, QFont, QIcon, QPainter, QPainterPath, QPixmap, QTextCursor
+from PySide6.QtCore import QEvent, QPointF, QTimer, Qt
+from PySide6.QtGui import QColor, QFont, QIcon, QPainter, QPainterPath, QPixmap, QTextBlockFormat, QTextCharFormat, QTextCursor
 from PySide6.QtWidgets import (
     QComboBox,
     QDialog,
+    QFileDialog,
     QFrame,
     QGroupBox,
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
+    QListWidgetItem,
     QMainWindow,
+    QPlainTextEdit,
     QPushButton,
     QScrollArea,
     QSizePolicy,
@@ -27,11 +31,21 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from memory.frida_il2cpp import FridaIL2CPP
+from bot.advice_plan import AdvicePlan, PlanStep
+from bot.advisor_metrics import AdvisorMetrics
+from config import FRAME_BUDGET_MS, HOTKEY_RUN_STEP, LOG_VIEW_LINES
+from memory.state_poller import StatePoller, StateSnapshot
 from ui.bot_state import BotState
+from ui.card_model import CardListModel, card_rows
+from ui.chat_log import ChatLog, ChatMessage
+from ui.frame_monitor import FrameMonitor
 from ui.log_handler import TuiLogBuffer
+from ui.qt_threads import SnapshotRelay, TaskThread
+from ui.refresh import RefreshController
+from utils import logger
 
 _PHASE_NAMES = {0: "Draw", 1: "Standby", 2: "Main1", 3: "Battle", 4: "Main2", 5: "End"}
+_LOG_COLORS = {"OK": "#a6e3a1", "ERROR": "#f38ba8", "WARN": "#f9e2af", "DEBUG": "#cba6f7"}
 
 
 def _gear_icon(size=16, color="#a6adc8"):
@@ -63,9 +77,9 @@ QMainWindow, QWidget { background: #1e1e2e; color: #cdd6f4; }
 QGroupBox { border: 1px solid #45475a; border-radius: 4px;
             margin-top: 8px; padding-top: 14px; font-weight: bold; }
 QGroupBox::title { subcontrol-origin: margin; left: 8px; padding: 0 4px; }
-QListWidget { background: #181825; border: 1px solid #45475a; border-radius: 4px;
-              font-family: Consolas, monospace; font-size: 12px; }
-QListWidget::item { padding: 2px 4px; }
+QListView { background: #181825; border: 1px solid #45475a; border-radius: 4px;
+            font-family: Consolas, monospace; font-size: 12px; }
+QListView::item { padding: 2px 4px; }
 QPushButton { background: #313244; border: 1px solid #45475a; border-radius: 4px;
               padding: 6px 14px; font-weight: bold; }
 QPushButton:hover { background: #45475a; }
@@ -87,7 +101,7 @@ class SettingsDialog(QDialog):
         super().__init__(parent)
         self._advisor = advisor
         self.setWindowTitle("Settings")
-        self.setFixedSize(420, 280)
+        self.setFixedSize(420, 340)
         self.setStyleSheet(
             "QDialog { background: #1e1e2e; color: #cdd6f4; }"
             "QLabel { color: #cdd6f4; font-size: 13px; }"
@@ -111,6 +125,14 @@ class SettingsDialog(QDialog):
         layout.setSpacing(10)
         layout.setContentsMargins(20, 16, 20, 16)
 
+        layout.addWidget(QLabel("Advisor"))
+        self._backend_combo = QComboBox()
+        if advisor:
+            for backend in advisor.backends:
+                self._backend_combo.addItem(backend.label, backend.name)
+            self._backend_combo.setCurrentIndex(self._backend_combo.findData(advisor.backend.name))
+        layout.addWidget(self._backend_combo)
+
         layout.addWidget(QLabel("Gemini API Key"))
         key_row = QHBoxLayout()
         self._key_input = QLineEdit()
@@ -136,8 +158,8 @@ class SettingsDialog(QDialog):
         self._model_combo.addItem(current_model)
         self._model_combo.setCurrentText(current_model)
         model_row.addWidget(self._model_combo)
-        self._btn_fetch = QPushButton("Fetch")
-        self._btn_fetch.setFixedWidth(60)
+        self._btn_fetch = QPushButton("Refresh")
+        self._btn_fetch.setFixedWidth(70)
         self._btn_fetch.setToolTip("Fetch available models from Gemini API")
         self._btn_fetch.clicked.connect(self._fetch_models)
         model_row.addWidget(self._btn_fetch)
@@ -146,6 +168,15 @@ class SettingsDialog(QDialog):
         self._lbl_status = QLabel()
         self._update_status()
         layout.addWidget(self._lbl_status)
+        if advisor:
+            # disk/memory cache only; the network is touched by Refresh or the startup warm-up
+            models, fetched = advisor.cached_models()
+            if models:
+                self._fill_models(models)
+                age = int((time.time() - fetched) // 60)
+                self._lbl_status.setText(
+                    f"{self._lbl_status.text()} -- {len(models)} models (cached {age // 60}h {age % 60}m ago)"
+                )
 
         layout.addStretch()
 
@@ -173,7 +204,7 @@ class SettingsDialog(QDialog):
             self._btn_toggle.setText("Show")
 
     def _update_status(self) -> None:
-        has = self._advisor and self._advisor.has_client
+        has = self._advisor and self._advisor.gemini.has_client
         if has:
             self._lbl_status.setText("Status: Configured")
             self._lbl_status.setStyleSheet("color: #a6e3a1; font-size: 12px;")
@@ -182,29 +213,35 @@ class SettingsDialog(QDialog):
             self._lbl_status.setStyleSheet("color: #f38ba8; font-size: 12px;")
 
     def _fetch_models(self) -> None:
-        if not self._advisor or not self._advisor.has_client:
+        if not self._advisor or not self._advisor.gemini.has_client:
             key = self._key_input.text().strip() or self._existing_key
             if key and self._advisor:
                 self._advisor.set_api_key(key)
-            if not self._advisor or not self._advisor.has_client:
+            if not self._advisor or not self._advisor.gemini.has_client:
                 self._lbl_status.setText("Status: Enter API key first")
                 self._lbl_status.setStyleSheet("color: #f9e2af; font-size: 12px;")
                 return
 
         self._btn_fetch.setEnabled(False)
         self._btn_fetch.setText("...")
-        from PySide6.QtCore import QCoreApplication
-        QCoreApplication.processEvents()
+        self._fetch_thread = TaskThread(self._advisor.refresh_models, "refresh_models")
+        self._fetch_thread.done.connect(self._on_models)
+        self._fetch_thread.start()
 
-        models = self._advisor.list_models()
+    def _on_models(self, models: list[str] | None) -> None:
         self._btn_fetch.setEnabled(True)
-        self._btn_fetch.setText("Fetch")
+        self._btn_fetch.setText("Refresh")
 
         if not models:
             self._lbl_status.setText("Status: Could not fetch models")
             self._lbl_status.setStyleSheet("color: #f38ba8; font-size: 12px;")
             return
 
+        self._fill_models(models)
+        self._lbl_status.setText(f"Status: {len(models)} models loaded")
+        self._lbl_status.setStyleSheet("color: #a6e3a1; font-size: 12px;")
+
+    def _fill_models(self, models: list[str]) -> None:
         current = self._model_combo.currentText()
         self._model_combo.clear()
         self._model_combo.addItems(models)
@@ -214,41 +251,41 @@ class SettingsDialog(QDialog):
         else:
             self._model_combo.setCurrentText(current)
 
-        self._lbl_status.setText(f"Status: {len(models)} models loaded")
-        self._lbl_status.setStyleSheet("color: #a6e3a1; font-size: 12px;")
-
     @staticmethod
-    def _read_env_filtered() -> list[str]:
+    def _read_env_filtered(keys: tuple[str, ...] = ("GEMINI_API_KEY", "GEMINI_MODEL", "ADVISOR_BACKEND")) -> list[str]:
         env = _env_path()
         if not os.path.isfile(env):
             return []
+        prefixes = tuple(f"{k}=" for k in keys)
         with open(env, "r", encoding="utf-8") as f:
-            return [
-                l for l in f.readlines()
-                if not l.startswith("GEMINI_API_KEY=") and not l.startswith("GEMINI_MODEL=")
-            ]
+            return [l for l in f.readlines() if not l.startswith(prefixes)]
 
     def _save(self) -> None:
         key = self._key_input.text().strip() or self._existing_key
         model = self._model_combo.currentText().strip()
-        if not key:
+        backend = self._backend_combo.currentData() or "gemini"
+        if not key and backend == "gemini":
             return
         lines = self._read_env_filtered()
-        lines.append(f"GEMINI_API_KEY={key}\n")
+        if key:
+            lines.append(f"GEMINI_API_KEY={key}\n")
         if model:
             lines.append(f"GEMINI_MODEL={model}\n")
+        lines.append(f"ADVISOR_BACKEND={backend}\n")
         with open(_env_path(), "w", encoding="utf-8") as f:
             f.writelines(lines)
         if self._advisor:
-            self._advisor.set_api_key(key)
+            if key:
+                self._advisor.set_api_key(key)
             if model:
                 self._advisor.set_model(model)
+            self._advisor.set_backend(backend)
         self._update_status()
         self.accept()
 
     def _clear_key(self) -> None:
         self._key_input.clear()
-        lines = self._read_env_filtered()
+        lines = self._read_env_filtered(("GEMINI_API_KEY", "GEMINI_MODEL"))
         with open(_env_path(), "w", encoding="utf-8") as f:
             f.writelines(lines)
         os.environ.pop("GEMINI_API_KEY", None)
@@ -261,13 +298,14 @@ class SettingsDialog(QDialog):
 class MainWindow(QMainWindow):
     def __init__(
         self,
-        frida_session: FridaIL2CPP,
+        poller: StatePoller,
         hwnd: int,
         state: BotState,
         log_buf: TuiLogBuffer,
     ) -> None:
         super().__init__()
-        self.frida = frida_session
+        self.poller = poller
+        self.frida = poller.frida
         self.hwnd = hwnd
         self.state = state
         self.log_buf = log_buf
@@ -292,9 +330,18 @@ class MainWindow(QMainWindow):
         self.lbl_attach = QLabel()
         self.lbl_frida = QLabel()
         self.lbl_hwnd = QLabel()
+        self.lbl_stale = QLabel()
+        self.lbl_frame = QLabel()
+        self.lbl_frame.setToolTip("Worst GUI-thread stall in the last refresh (frame budget lag)")
+        self.lbl_rate = QLabel()
+        self.lbl_rate.setToolTip("Refresh rate: fast while a duel changes, slow in menus or when minimized")
+        self.lbl_rate.setStyleSheet("color: #6c7086;")
         sl.addWidget(self.lbl_attach)
         sl.addWidget(self.lbl_frida)
         sl.addStretch()
+        sl.addWidget(self.lbl_stale)
+        sl.addWidget(self.lbl_frame)
+        sl.addWidget(self.lbl_rate)
         sl.addWidget(self.lbl_hwnd)
         left_layout.addWidget(status_box)
 
@@ -309,25 +356,13 @@ class MainWindow(QMainWindow):
         dl.addWidget(self.lbl_turn)
         left_layout.addWidget(duel_box)
 
+        # card panels: one model per zone group, rows keyed by card uid (tooltips read the catalog)
+        self._card_panels: list[tuple[QGroupBox, CardListModel, str]] = []
         cards_row = QHBoxLayout()
-        hand_box = QGroupBox("My Hand")
-        hl = QVBoxLayout(hand_box)
-        self.list_hand = QListWidget()
-        hl.addWidget(self.list_hand)
-        cards_row.addWidget(hand_box)
-
-        field_box = QGroupBox("My Field")
-        fl = QVBoxLayout(field_box)
-        self.list_my_field = QListWidget()
-        fl.addWidget(self.list_my_field)
-        cards_row.addWidget(field_box)
+        self.list_hand = self._card_panel("My Hand", cards_row)
+        self.list_my_field = self._card_panel("My Field", cards_row)
         left_layout.addLayout(cards_row)
-
-        rival_box = QGroupBox("Rival Field")
-        rl = QVBoxLayout(rival_box)
-        self.list_rival_field = QListWidget()
-        rl.addWidget(self.list_rival_field)
-        left_layout.addWidget(rival_box)
+        self.list_rival_field = self._card_panel("Rival Field", left_layout)
 
         self.lbl_gy_deck = QLabel("")
         self.lbl_gy_deck.setFont(QFont("Consolas", 11))
@@ -348,15 +383,37 @@ class MainWindow(QMainWindow):
         feat_lay.addWidget(self.btn_speed)
         left_layout.addWidget(feat_box)
 
+        # collapsed by default; unchecking the box hides its contents
+        self.metrics_box = QGroupBox("Advisor metrics")
+        self.metrics_box.setCheckable(True)
+        self.metrics_box.setChecked(False)
+        ml = QHBoxLayout(self.metrics_box)
+        self.lbl_metrics = QLabel("No advisor requests yet")
+        self.lbl_metrics.setFont(QFont("Consolas", 10))
+        self.lbl_metrics.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.btn_export_metrics = QPushButton("Export…")
+        self.btn_export_metrics.setToolTip("Save every recorded request as CSV or JSONL")
+        self.btn_export_metrics.clicked.connect(self._export_metrics)
+        ml.addWidget(self.lbl_metrics, 1)
+        ml.addWidget(self.btn_export_metrics, 0, Qt.AlignTop)
+        self.lbl_metrics.setVisible(False)
+        self.btn_export_metrics.setVisible(False)
+        self.metrics_box.toggled.connect(self._toggle_metrics)
+        self.metrics_box.hide()
+        left_layout.addWidget(self.metrics_box)
+
         log_box = QGroupBox("Log")
         ll = QVBoxLayout(log_box)
-        self.log_view = QTextEdit()
+        # one block per entry; the block limit drops the oldest as new ones are appended
+        self.log_view = QPlainTextEdit()
         self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(LOG_VIEW_LINES)
         self.log_view.setFont(QFont("Consolas", 10))
         self.log_view.setStyleSheet(
-            "QTextEdit { background: #181825; border: 1px solid #45475a; "
+            "QPlainTextEdit { background: #181825; border: 1px solid #45475a; "
             "border-radius: 4px; color: #a6adc8; padding: 4px; }"
         )
+        self._log_seq = 0  # last log entry drawn
         ll.addWidget(self.log_view)
         left_layout.addWidget(log_box)
 
@@ -427,6 +484,16 @@ class MainWindow(QMainWindow):
         self._chat_area.setHtml(self._welcome_html())
         right_layout.addWidget(self._chat_area)
 
+        # steps of the last structured reply; the next runnable one is highlighted
+        self.list_plan = QListWidget()
+        self.list_plan.setMaximumHeight(110)
+        self.list_plan.setStyleSheet(
+            "QListWidget { background: #181825; border: none; border-top: 1px solid #313244; "
+            "color: #cdd6f4; font-size: 12px; padding: 4px 8px; }"
+        )
+        self.list_plan.hide()
+        right_layout.addWidget(self.list_plan)
+
         btn_bar = QWidget()
         btn_bar.setFixedHeight(56)
         btn_bar.setStyleSheet("background: #181825; border-top: 1px solid #313244;")
@@ -445,6 +512,18 @@ class MainWindow(QMainWindow):
             "QPushButton:pressed { background: #585b70; color: #cdd6f4; }"
         )
         btn_bar_lay.addWidget(self.btn_assist)
+        self.btn_run_step = QPushButton(f"Run step [{HOTKEY_RUN_STEP}]")
+        self.btn_run_step.setFixedHeight(38)
+        self.btn_run_step.setCursor(Qt.PointingHandCursor)
+        self.btn_run_step.setToolTip("Execute the highlighted plan step (solo duels only)")
+        self.btn_run_step.setStyleSheet(
+            "QPushButton { background: #313244; color: #cdd6f4; font-size: 13px; font-weight: bold; "
+            "border: 1px solid #45475a; border-radius: 8px; padding: 0 12px; }"
+            "QPushButton:hover { background: #45475a; }"
+            "QPushButton:disabled { color: #585b70; }"
+        )
+        self.btn_run_step.setEnabled(False)
+        btn_bar_lay.addWidget(self.btn_run_step)
         right_layout.addWidget(btn_bar)
 
         splitter = QSplitter(Qt.Horizontal)
@@ -454,12 +533,32 @@ class MainWindow(QMainWindow):
         splitter.setHandleWidth(2)
         main_layout.addWidget(splitter)
 
-        self._ai_messages: list[dict] = []
-        self._ai_dirty = False
+        self.chat = ChatLog()
+        self._ai_streams: dict[int, ChatMessage] = {}  # request id -> message being streamed
+        # the chat document is a prefix of finished messages, never touched again
+        # except for eviction, then a tail that is re-rendered on every change
+        self._chat_sealed: list[tuple[int, int]] = []  # (message id, end position) in document order
+        self._chat_tail = 0                            # where the tail starts
+        self._chat_welcome = True
+        self._snap = StateSnapshot()
+        self.plan: AdvicePlan | None = None
+        self._plan_state: dict[int, str] = {}  # step position -> "running" | "done" | "failed"
+        self.metrics: AdvisorMetrics | None = None
+        self._metrics_version = -1
+
+        self.refresh = RefreshController()
+
+        # Frida reads happen on the poller; the GUI only ever sees snapshots
+        self._relay = SnapshotRelay(poller)
+        self._relay.snapshot.connect(self._on_snapshot)
+        self._relay.start()
+
+        self.frame_monitor = FrameMonitor(self)
+        self.frame_monitor.start()
 
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._refresh)
-        self._timer.start(250)
+        self._timer.start(self.refresh.interval_ms)
 
     @staticmethod
     def _welcome_html() -> str:
@@ -478,112 +577,194 @@ class MainWindow(QMainWindow):
         )
 
     def append_ai_advice(self, text: str, msg_type: str = "ai") -> None:
-        ts = datetime.now().strftime("%H:%M:%S")
-        self._ai_messages.append({"text": text, "type": msg_type, "time": ts})
-        self._ai_dirty = True
-
-    def _clear_ai(self) -> None:
-        self._ai_messages.clear()
-        self._chat_area.setHtml(self._welcome_html())
-        self._ai_dirty = False
+        self.chat.add(text, msg_type)
 
-    @staticmethod
-    def _md_to_html(text: str) -> str:
-        text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
-        # close unclosed markdown pairs
-        if text.count("**") % 2 != 0:
-            text += "**"
-        stripped_bold = re.sub(r'\*\*', '', text)
-        if stripped_bold.count("*") % 2 != 0:
-            text += "*"
-
-        text = re.sub(r'\*\*(.+?)\*\*', r'<b style="color:#89b4fa;">\1</b>', text)
-        text = re.sub(r'__(.+?)__', r'<b style="color:#89b4fa;">\1</b>', text)
-        text = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'<i>\1</i>', text)
-        text = re.sub(r'`(.+?)`', r'<code style="background:#313244; padding:1px 4px; border-radius:3px;">\1</code>', text)
-
-        lines = text.split("\n")
-        result = []
-        in_list = False
-
-        for line in lines:
-            stripped = line.strip()
-
-            m = re.match(r'^(\d+)[.)]\s+(.+)$', stripped)
-            if m:
-                if not in_list:
-                    in_list = True
-                num, content = m.group(1), m.group(2)
-                result.append(
-                    f'<div style="margin:3px 0 3px 8px;">'
-                    f'<span style="color:#89b4fa; font-weight:bold;">{num}.</span> {content}</div>'
-                )
-                continue
-
-            m = re.match(r'^[-*]\s+(.+)$', stripped)
-            if m:
-                if not in_list:
-                    in_list = True
-                content = m.group(1)
-                result.append(
-                    f'<div style="margin:3px 0 3px 8px;">'
-                    f'<span style="color:#f9e2af;">&#8226;</span> {content}</div>'
-                )
-                continue
+    def begin_ai_stream(self, rid: int) -> None:
+        self._ai_streams[rid] = self.chat.add("", "loading", streaming=True)
+        self._reschedule()
 
-            in_list = False
+    def append_ai_stream(self, rid: int, text: str) -> None:
+        msg = self._ai_streams.get(rid)
+        if msg is None:
+            return
+        self.chat.update(msg, type="ai", text=msg.text + text)
 
-            if not stripped:
-                result.append('<div style="height:6px;"></div>')
+    def end_ai_stream(self, rid: int, status: str, error: str = "") -> None:
+        msg = self._ai_streams.pop(rid, None)
+        if msg is None:
+            return
+        if status == "done":
+            self.chat.update(msg, text=msg.text.strip(), streaming=False)
+        elif msg.text and status == "cancelled":
+            self.chat.update(msg, text=msg.text.rstrip() + "\n*(cancelled)*", streaming=False)
+        else:
+            if status == "error":
+                text = f"Error: {error}"
+            elif status == "cancelled":
+                text = "Request cancelled."
             else:
-                result.append(f'<div style="margin:2px 0;">{stripped}</div>')
+                text = "Could not get advice. Check API key in .env file."
+            if msg.text:
+                self.chat.update(msg, streaming=False)
+                self.append_ai_advice(text, "system")
+            else:
+                self.chat.update(msg, text=text, type="system", streaming=False)
 
-        return "".join(result)
+    def _clear_ai(self) -> None:
+        self.chat.clear()
+        self._ai_streams.clear()
+        self._chat_area.setHtml(self._welcome_html())
+        self._chat_sealed.clear()
+        self._chat_tail = 0
+        self._chat_welcome = True
+        self.set_plan(None)
+
+    # ── advisor plan ──
+
+    def set_plan(self, plan: AdvicePlan | None) -> None:
+        self.plan = plan
+        self._plan_state = {}
+        self._render_plan()
+
+    def next_plan_step(self) -> PlanStep | None:
+        """The step to run next; None while one is still running, so it can't be sent twice."""
+        if not self.plan or "running" in self._plan_state.values():
+            return None
+        for pos, step in enumerate(self.plan.steps):
+            if step.valid and pos not in self._plan_state:
+                return step
+        return None
+
+    def start_plan_step(self, step: PlanStep) -> None:
+        if not self.plan or step not in self.plan.steps:
+            return
+        self._plan_state[self.plan.steps.index(step)] = "running"
+        self._render_plan()
 
-    def _render_chat(self) -> None:
-        if not self._ai_dirty:
+    def mark_plan_step(self, step: PlanStep, ok: bool, error: str = "") -> None:
+        if not self.plan or step not in self.plan.steps:
             return
-        self._ai_dirty = False
-
-        html_parts = []
-        for msg in self._ai_messages:
-            ts = msg["time"]
-
-            if msg["type"] == "system":
-                esc = msg["text"].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                html_parts.append(
-                    f'<div style="text-align:center; margin:8px 0;">'
-                    f'<span style="color:#6c7086; font-size:11px;">{ts} -- {esc}</span>'
-                    f'</div>'
-                )
-            elif msg["type"] == "loading":
-                html_parts.append(
-                    f'<div style="margin:8px 0; padding:10px 14px; '
-                    f'background:#181825; border-radius:12px; border:1px solid #313244;">'
-                    f'<span style="color:#89b4fa; font-size:12px;">Analyzing board state...</span>'
-                    f'</div>'
-                )
-            else:
-                body = self._md_to_html(msg["text"])
-                html_parts.append(
-                    f'<div style="margin:8px 0; padding:12px 16px; '
-                    f'background:#181825; border-radius:12px; border:1px solid #313244;">'
-                    f'<div style="color:#89b4fa; font-size:10px; margin-bottom:8px; font-weight:bold;">'
-                    f'AI Advisor  {ts}</div>'
-                    f'<div style="color:#cdd6f4; font-size:13px; line-height:1.6;">{body}</div>'
-                    f'</div>'
-                )
+        self._plan_state[self.plan.steps.index(step)] = "done" if ok else "failed"
+        if not ok:
+            self.append_ai_advice(f"Step '{step.label}' failed: {error}", "system")
+        self._render_plan()
+
+    def _render_plan(self) -> None:
+        self.list_plan.clear()
+        nxt = self.next_plan_step()
+        self.btn_run_step.setEnabled(nxt is not None and not self.plan.online)
+        if not self.plan or not self.plan.steps:
+            self.list_plan.hide()
+            return
+        for pos, step in enumerate(self.plan.steps, 1):
+            state = self._plan_state.get(pos - 1)
+            text = f"{pos}. {step.label}" + (f" -- {step.why}" if step.why else "")
+            item = QListWidgetItem({"done": "\u2713 ", "running": "\u2026 "}.get(state, "") + text)
+            if not step.valid:
+                item.setForeground(QColor("#585b70"))
+                item.setToolTip(step.error)
+            elif state == "done":
+                item.setForeground(QColor("#a6e3a1"))
+            elif state == "failed":
+                item.setForeground(QColor("#f38ba8"))
+            elif state == "running":
+                item.setForeground(QColor("#f9e2af"))
+            elif step is nxt:
+                item.setBackground(QColor("#313244"))
+                font = item.font()
+                font.setBold(True)
+                item.setFont(font)
+            self.list_plan.addItem(item)
+        self.list_plan.show()
 
-        self._chat_area.setHtml(
-            '<div style="padding:4px;">' + "".join(html_parts) + '</div>'
-        )
-        cursor = self._chat_area.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self._chat_area.setTextCursor(cursor)
+    def _render_chat(self) -> None:
+        """Bring the chat document up to date, touching only evicted and unfinished messages."""
+        chat = self.chat
+        if not chat.dirty:
+            return
+        chat.dirty = False
+        doc = self._chat_area.document()
+        cursor = QTextCursor(doc)
+        bar = self._chat_area.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 4
+
+        if self._chat_welcome:
+            self._chat_area.clear()
+            self._chat_welcome = False
+
+        # cut evicted messages off the front of the sealed prefix
+        if chat.evicted:
+            gone = {m.id for m in chat.evicted}
+            chat.evicted.clear()
+            n = 0
+            while n < len(self._chat_sealed) and self._chat_sealed[n][0] in gone:
+                n += 1
+            if n:
+                cut = self._chat_sealed[n - 1][1]
+                cursor.setPosition(0)
+                cursor.setPosition(cut, QTextCursor.KeepAnchor)
+                cursor.removeSelectedText()
+                self._chat_sealed = [(mid, end - cut) for mid, end in self._chat_sealed[n:]]
+                self._chat_tail -= cut
+
+        # re-render the tail: seal finished messages in order, then redraw the rest
+        cursor.setPosition(self._chat_tail)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        tail = chat.messages[len(self._chat_sealed):]
+        sealing = True
+        for msg in tail:
+            if cursor.position() > 0:
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+            cursor.insertHtml(chat.html(msg))
+            sealing = sealing and not msg.streaming
+            if sealing:
+                self._chat_tail = cursor.position()
+                self._chat_sealed.append((msg.id, self._chat_tail))
+
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+    def _on_snapshot(self, snap: StateSnapshot) -> None:
+        self._snap = snap
+        self._render_duel(snap.game_state)
+        if self.plan and not snap.duel_active:
+            self.set_plan(None)
+        self.refresh.note_activity()
+        self._reschedule()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._reschedule()
+
+    def _refresh_state(self) -> dict:
+        gs = self._snap.game_state or {}
+        my_turn = bool(gs) and gs.get("turnPlayer") == gs.get("myself")
+        return {
+            "visible": self.isVisible() and not self.isMinimized(),
+            "duel_active": self._snap.duel_active,
+            "busy": my_turn or bool(self._ai_streams),
+        }
+
+    def _reschedule(self) -> None:
+        """Pull the next refresh in if the situation now calls for a faster rate."""
+        interval = self.refresh.interval_for(**self._refresh_state())
+        if interval < self._timer.remainingTime():
+            self._timer.start(interval)
 
     def _refresh(self) -> None:
-        attached = self.frida.is_attached()
+        t0 = time.perf_counter()
+        self._refresh_ui()
+        cost = (time.perf_counter() - t0) * 1000.0
+        interval = self.refresh.next_interval(cost, **self._refresh_state())
+        self._timer.setInterval(interval)
+        # the 60 Hz stall probe is only worth its wakeups while someone is watching a duel
+        self.frame_monitor.set_interval(16 if self.refresh.mode in ("active", "normal") else 250)
+        self.lbl_rate.setText(self.refresh.label())
+
+    def _refresh_ui(self) -> None:
+        attached = self._snap.attached
 
         dot = "\u2022"
         if attached:
@@ -596,9 +777,104 @@ class MainWindow(QMainWindow):
         self.lbl_frida.setTextFormat(Qt.RichText)
         self.lbl_hwnd.setText(f"HWND {hex(self.hwnd)}")
 
-        duel_active = self.frida.is_duel_active() if attached else False
-        gs = self.frida.get_game_state() if (attached and duel_active) else None
+        # age of the poller's last read; latest() only takes a lock, no RPC
+        stale_ms = self.poller.latest().age * 1000.0
+        limit_ms = 2000.0 if self.frida.events.mode == "event" else self.poller.interval * 2000.0
+        stale_color = "#f9e2af" if stale_ms > limit_ms else "#6c7086"
+        self.lbl_stale.setText(f'<span style="color:{stale_color}">stale {stale_ms:.0f} ms</span>')
+        self.lbl_stale.setTextFormat(Qt.RichText)
+        worst = self.frame_monitor.take_window_max()
+        frame_color = "#f38ba8" if worst > FRAME_BUDGET_MS else "#6c7086"
+        self.lbl_frame.setText(f'<span style="color:{frame_color}">GUI {worst:.0f} ms</span>')
+        self.lbl_frame.setTextFormat(Qt.RichText)
+
+        # block signals so setChecked doesn't re-fire toggle handlers
+        for btn, val in [
+            (self.btn_autopilot, self.state.autopilot_enabled),
+            (self.btn_instant_win, self.state.instant_win_enabled),
+            (self.btn_speed, self.state.speed_hack_enabled),
+        ]:
+            btn.blockSignals(True)
+            btn.setChecked(val)
+            btn.blockSignals(False)
+
+        self._append_log()
+        self._render_chat()
+        self._render_metrics()
+
+    def _append_log(self) -> None:
+        """Append only the entries logged since the last refresh."""
+        entries = self.log_buf.since(self._log_seq)
+        if not entries:
+            return
+        self._log_seq = entries[-1][0]
+        bar = self.log_view.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 4
+        for _, ts, tag, msg in entries:
+            color = _LOG_COLORS.get(tag, "#a6adc8")
+            escaped = f"{ts} [{tag}] {msg}".replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            self.log_view.appendHtml(f'<span style="color:{color}; white-space:pre-wrap;">{escaped}</span>')
+        # follow the tail unless the user scrolled up to read something
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+    def set_metrics(self, metrics: AdvisorMetrics) -> None:
+        self.metrics = metrics
+        self.metrics_box.show()
+
+    def _toggle_metrics(self, on: bool) -> None:
+        self.lbl_metrics.setVisible(on)
+        self.btn_export_metrics.setVisible(on)
+        self._metrics_version = -1
+        self._render_metrics()
+
+    def _render_metrics(self) -> None:
+        m = self.metrics
+        # only redrawn while expanded and after a new request was recorded
+        if m is None or not self.metrics_box.isChecked() or m.version == self._metrics_version:
+            return
+        self._metrics_version = m.version
+        s = m.summary()
+        n = s["requests"]
+        if not n:
+            self.lbl_metrics.setText("No advisor requests yet")
+            return
+
+        def row(label: str, key: str) -> str:
+            p = s[key]
+            cells = [f"{p[q]:>7.0f}" if p[q] is not None else f"{'-':>7}" for q in ("p50", "p95", "p99")]
+            return f"{label:<8}{''.join(cells)}"
+
+        lines = [
+            f"{n} requests, {s['cache_hits']} cached, {s['errors']} errors, {s['cancelled']} cancelled",
+            f"{'ms':<8}{'p50':>7}{'p95':>7}{'p99':>7}",
+            row("board", "board_ms"),
+            row("prompt", "prompt_ms"),
+            row("queue", "queue_ms"),
+            row("ttft", "ttft_ms"),
+            row("total", "total_ms"),
+            f"tokens in {s['input_tokens']}, out {s['output_tokens']}",
+        ]
+        if "cost_usd" in s:
+            lines[-1] += f" (~${s['cost_usd']:.4f})"
+        if s["error_classes"]:
+            lines.append("errors: " + ", ".join(f"{k} ×{v}" for k, v in s["error_classes"].items()))
+        self.lbl_metrics.setText("\n".join(lines))
+
+    def _export_metrics(self) -> None:
+        if self.metrics is None:
+            return
+        name = f"advisor_metrics_{datetime.now():%Y%m%d_%H%M%S}.csv"
+        path, _ = QFileDialog.getSaveFileName(self, "Export advisor metrics", name, "CSV (*.csv);;JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            count = self.metrics.export(path)
+            logger.ok(f"Exported {count} advisor requests to {path}")
+        except OSError as exc:
+            logger.error(f"Metrics export failed: {exc}")
 
+    def _render_duel(self, gs) -> None:
         if gs:
             self.lbl_my_lp.setText(f"My LP: {gs['myLP']}")
             self.lbl_rival_lp.setText(f"Rival LP: {gs['rivalLP']}")
@@ -606,34 +882,9 @@ class MainWindow(QMainWindow):
             turn_who = "Mine" if gs.get("turnPlayer") == gs.get("myself") else "Rival"
             self.lbl_turn.setText(f"Turn {gs.get('turnNum', '?')} | {phase} | {turn_who}'s turn")
 
-            self._fill_list(self.list_hand, [
-                c.get("name") or str(c.get("cardId", "?"))
-                for c in gs.get("myHand", [])
-            ], "My Hand")
-
-            my_field = gs.get("myField", {})
-            my_items = []
-            for c in my_field.get("monsters", []) + my_field.get("extraMonsters", []):
-                name = c.get("name") or str(c.get("cardId", "?"))
-                pos = "ATK" if c.get("face") else "SET"
-                my_items.append(f"[{c.get('zone', '?')}] {name} ({pos})")
-            for c in my_field.get("spells", []):
-                name = c.get("name") or str(c.get("cardId", "?"))
-                pos = "UP" if c.get("face") else "SET"
-                my_items.append(f"[{c.get('zone', '?')}] {name} ({pos})")
-            self._fill_list(self.list_my_field, my_items, "My Field")
-
-            r_field = gs.get("rivalField", {})
-            r_items = []
-            for c in r_field.get("monsters", []) + r_field.get("extraMonsters", []):
-                name = c.get("name") or str(c.get("cardId", "?"))
-                pos = "ATK" if c.get("face") else "SET"
-                r_items.append(f"[{c.get('zone', '?')}] {name} ({pos})")
-            for c in r_field.get("spells", []):
-                name = c.get("name") or str(c.get("cardId", "?"))
-                pos = "UP" if c.get("face") else "SET"
-                r_items.append(f"[{c.get('zone', '?')}] {name} ({pos})")
-            self._fill_list(self.list_rival_field, r_items, "Rival Field")
+            self._set_cards(0, card_rows(gs.get("myHand", []), slot="hand"))
+            self._set_cards(1, self._field_rows(gs.get("myField", {}), "my"))
+            self._set_cards(2, self._field_rows(gs.get("rivalField", {}), "rival"))
 
             my_gy = gs.get("myGY", [])
             rival_gy = gs.get("rivalGY", [])
@@ -647,56 +898,40 @@ class MainWindow(QMainWindow):
             self.lbl_my_lp.setText("My LP: --")
             self.lbl_rival_lp.setText("Rival LP: --")
             self.lbl_turn.setText("No active duel")
-            self.list_hand.clear()
-            self.list_my_field.clear()
-            self.list_rival_field.clear()
+            for i in range(len(self._card_panels)):
+                self._set_cards(i, [])
             self.lbl_gy_deck.setText("")
 
-        # block signals so setChecked doesn't re-fire toggle handlers
-        for btn, val in [
-            (self.btn_autopilot, self.state.autopilot_enabled),
-            (self.btn_instant_win, self.state.instant_win_enabled),
-            (self.btn_speed, self.state.speed_hack_enabled),
-        ]:
-            btn.blockSignals(True)
-            btn.setChecked(val)
-            btn.blockSignals(False)
-
-        lines = self.log_buf.get_lines()
-        log_html = ""
-        for line in lines:
-            if "[OK]" in line:
-                color = "#a6e3a1"
-            elif "[ERROR]" in line:
-                color = "#f38ba8"
-            elif "[WARN]" in line:
-                color = "#f9e2af"
-            elif "[DEBUG]" in line:
-                color = "#cba6f7"
-            else:
-                color = "#a6adc8"
-            escaped = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            log_html += f'<div style="color:{color}; font-size:11px; font-family:Consolas,monospace;">{escaped}</div>'
-        current_html = self.log_view.toHtml()
-        if log_html and log_html not in current_html:
-            self.log_view.setHtml(log_html)
-            cursor = self.log_view.textCursor()
-            cursor.movePosition(QTextCursor.End)
-            self.log_view.setTextCursor(cursor)
+    def _card_panel(self, title: str, layout: QHBoxLayout | QVBoxLayout) -> QListView:
+        box = QGroupBox(title)
+        QVBoxLayout(box)
+        view = QListView()
+        view.setUniformItemSizes(True)
+        model = CardListModel(self.frida.cards, view)
+        view.setModel(model)
+        box.layout().addWidget(view)
+        layout.addWidget(box)
+        self._card_panels.append((box, model, title))
+        return view
 
-        self._render_chat()
+    @staticmethod
+    def _field_rows(field: dict, side: str) -> list:
+        monsters = list(field.get("monsters", ())) + list(field.get("extraMonsters", ()))
+        return (
+            card_rows(monsters, positions=("ATK", "SET"), slot=f"{side}-mon")
+            + card_rows(field.get("spells", ()), positions=("UP", "SET"), slot=f"{side}-st")
+        )
 
-    def _fill_list(self, widget: QListWidget, items: list[str], group_title: str) -> None:
-        current = [widget.item(i).text() for i in range(widget.count())]
-        if current != items:
-            widget.clear()
-            widget.addItems(items if items else ["(empty)"])
-            parent_box = widget.parent()
-            if isinstance(parent_box, QWidget):
-                box = parent_box.parent()
-                if isinstance(box, QGroupBox):
-                    box.setTitle(f"{group_title} ({len(items)})")
+    def _set_cards(self, panel: int, rows: list) -> None:
+        box, model, title = self._card_panels[panel]
+        before = model.count
+        model.set_rows(rows)
+        if model.count != before or title == box.title():
+            box.setTitle(f"{title} ({model.count})")
 
     def closeEvent(self, event) -> None:
         self._timer.stop()
+        self.frame_monitor.stop()
+        self._relay.stop()
+        logger.info(f"GUI frame lag (ms): {self.frame_monitor.summary()}")
         event.accept()
@@ -0,0 +1,63 @@
+"""QThread helpers that keep Frida and network calls off the GUI thread."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from PySide6.QtCore import QThread, Signal
+
+from memory.state_poller import StatePoller
+from utils import logger
+
+
+class SnapshotRelay(QThread):
+    """Forwards StatePoller changes to the GUI thread as a queued signal."""
+
+    snapshot = Signal(object)
+
+    def __init__(self, poller: StatePoller, parent=None) -> None:
+        super().__init__(parent)
+        self._poller = poller
+        self._running = True
+
+    def run(self) -> None:
+        snap = self._poller.latest()
+        self.snapshot.emit(snap)
+        while self._running:
+            nxt = self._poller.wait_for_change(snap.seq, timeout=0.25)
+            if nxt.seq != snap.seq:
+                snap = nxt
+                self.snapshot.emit(snap)
+
+    def stop(self) -> None:
+        self._running = False
+        self.wait(1000)
+
+
+class TaskThread(QThread):
+    """Runs *fn* once on its own thread and emits ``done(result)``.
+
+    Instances keep themselves alive until finished so callers can fire and
+    forget without parenting the thread to a widget that may close first.
+    """
+
+    done = Signal(object)
+    _live: set[TaskThread] = set()
+
+    def __init__(self, fn: Callable[[], object], name: str = "task") -> None:
+        super().__init__()
+        self._fn = fn
+        self._name = name
+        self.finished.connect(lambda: TaskThread._live.discard(self))
+
+    def start(self) -> None:
+        TaskThread._live.add(self)
+        super().start()
+
+    def run(self) -> None:
+        try:
+            result = self._fn()
+        except Exception as exc:
+            logger.error(f"{self._name} failed: {exc}")
+            result = None
+        self.done.emit(result)
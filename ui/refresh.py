@@ -0,0 +1,85 @@
+"""Adaptive refresh interval shared by the GUI timer and the TUI loop."""
+
+from __future__ import annotations
+
+import time
+
+from config import (
+    FRAME_BUDGET_MS, REFRESH_ACTIVE_MS, REFRESH_HIDDEN_MS, REFRESH_IDLE_MS, REFRESH_NORMAL_MS,
+)
+
+# how long a state change keeps the view in "active" mode
+_ACTIVE_HOLD = 2.0
+_MAX_BACKOFF = 8
+# consecutive refreshes under budget before the backoff is halved again
+_RECOVER_AFTER = 5
+
+
+class RefreshController:
+    """Chooses how long to wait before the next refresh.
+
+    The base interval comes from what is on screen: a slow heartbeat while
+    hidden or outside a duel, fast while a duel is changing (or it's my
+    turn), normal otherwise. A refresh that takes longer than *budget_ms*
+    doubles a backoff multiplier on top of that, up to 8x; a run of cheap
+    refreshes halves it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        active_ms: int = REFRESH_ACTIVE_MS,
+        normal_ms: int = REFRESH_NORMAL_MS,
+        idle_ms: int = REFRESH_IDLE_MS,
+        hidden_ms: int = REFRESH_HIDDEN_MS,
+        budget_ms: float = FRAME_BUDGET_MS,
+    ) -> None:
+        self.intervals = {"active": active_ms, "normal": normal_ms, "idle": idle_ms, "hidden": hidden_ms}
+        self.budget_ms = budget_ms
+        self.mode = "idle"
+        self.backoff = 1
+        self.interval_ms = idle_ms
+        self.over_budget = 0
+        self._under = 0
+        self._active_until = 0.0
+
+    @property
+    def rate_hz(self) -> float:
+        return 1000.0 / self.interval_ms
+
+    def note_activity(self) -> None:
+        """The displayed state changed; stay in active mode for a moment."""
+        self._active_until = time.monotonic() + _ACTIVE_HOLD
+
+    def mode_for(self, *, visible: bool, duel_active: bool, busy: bool = False) -> str:
+        if not visible:
+            return "hidden"
+        if not duel_active:
+            return "idle"
+        if busy or time.monotonic() < self._active_until:
+            return "active"
+        return "normal"
+
+    def interval_for(self, *, visible: bool, duel_active: bool, busy: bool = False) -> int:
+        """Interval the current state calls for, with the current backoff, without recording a refresh."""
+        base = self.intervals[self.mode_for(visible=visible, duel_active=duel_active, busy=busy)]
+        return min(base * self.backoff, max(base, self.intervals["hidden"]))
+
+    def next_interval(self, cost_ms: float, *, visible: bool, duel_active: bool, busy: bool = False) -> int:
+        """Record a refresh that took *cost_ms* and return the delay before the next one."""
+        if cost_ms > self.budget_ms:
+            self.over_budget += 1
+            self._under = 0
+            self.backoff = min(self.backoff * 2, _MAX_BACKOFF)
+        elif self.backoff > 1:
+            self._under += 1
+            if self._under >= _RECOVER_AFTER:
+                self._under = 0
+                self.backoff //= 2
+        self.mode = self.mode_for(visible=visible, duel_active=duel_active, busy=busy)
+        self.interval_ms = self.interval_for(visible=visible, duel_active=duel_active, busy=busy)
+        return self.interval_ms
+
+    def label(self) -> str:
+        rate = f"{self.rate_hz:.1f}" if self.rate_hz < 10 else f"{self.rate_hz:.0f}"
+        return f"{rate} Hz {self.mode}" + (f" x{self.backoff}" if self.backoff > 1 else "")
@@ -1,5 +1,24 @@
+"""Console logging through a background writer thread.
+
+``info()``/``ok()``/``warn()``/``error()``/``debug()`` only check the level
+and put a record on a queue, so logging from the Frida message thread or
+the GUI thread never waits on the console. One writer thread formats the
+records in batches, prints them with a single flush per batch, feeds the
+GUI/TUI callback and, if enabled, appends them to a rotating JSONL file.
+
+Records below the level set with ``configure(level=...)`` are dropped
+before they are queued; guard expensive debug messages with
+``enabled("DEBUG")``. ``flush()`` waits for the queue to drain and runs at
+interpreter exit.
+"""
+
+import atexit
+import json
+import os
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
 from typing import Callable, Optional
 
 from colorama import Fore, Style, init
@@ -14,7 +33,21 @@ _TAG_COLORS = {
     "DEBUG":   Fore.MAGENTA,
 }
 
+LEVELS = {"DEBUG": 10, "INFO": 20, "OK": 25, "WARN": 30, "ERROR": 40}
+
+_BATCH_MAX = 512
+
 _log_callback: Optional[Callable[[str, str], None]] = None
+_level = LEVELS["DEBUG"]
+
+# (epoch seconds, tag, message, thread name); None wakes the writer for a flush
+_queue: "queue.SimpleQueue[Optional[tuple[float, str, str, str]]]" = queue.SimpleQueue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_idle = threading.Event()
+_idle.set()
+_sink: Optional["_JsonlSink"] = None
+_stats = {"records": 0, "batches": 0, "dropped": 0}
 
 
 def set_log_callback(fn: Optional[Callable[[str, str], None]]) -> None:
@@ -22,13 +55,140 @@ def set_log_callback(fn: Optional[Callable[[str, str], None]]) -> None:
     _log_callback = fn
 
 
+def configure(
+    level: Optional[str] = None,
+    file: Optional[str] = None,
+    max_bytes: int = 5_000_000,
+    backups: int = 3,
+) -> None:
+    """Set the minimum level and/or open a rotating JSONL sink at *file* ("" closes it)."""
+    global _level, _sink
+    if level is not None:
+        _level = LEVELS.get(level.upper(), LEVELS["INFO"])
+    if file is not None:
+        flush()
+        old, _sink = _sink, (_JsonlSink(file, max_bytes, backups) if file else None)
+        if old:
+            old.close()
+
+
+def enabled(tag: str) -> bool:
+    return LEVELS.get(tag, 0) >= _level
+
+
+def stats() -> dict:
+    return dict(_stats, queued=_queue.qsize())
+
+
+def flush(timeout: float = 2.0) -> bool:
+    """Wait until every queued record has been written; False on timeout."""
+    if _writer is None or not _writer.is_alive():
+        return True
+    _idle.clear()
+    _queue.put(None)
+    return _idle.wait(timeout)
+
+
 def _log(tag: str, msg: str) -> None:
-    color = _TAG_COLORS.get(tag, "")
-    ts = datetime.now().strftime("%H:%M:%S")
-    print(f"{Fore.WHITE}{ts} {color}[{tag}]{Style.RESET_ALL} {msg}")
-    sys.stdout.flush()
-    if _log_callback:
-        _log_callback(tag, msg)
+    if LEVELS.get(tag, 0) < _level:
+        _stats["dropped"] += 1
+        return
+    _queue.put((time.time(), tag, msg, threading.current_thread().name))
+    if _writer is None:
+        _start_writer()
+
+
+def _start_writer() -> None:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="logger", daemon=True)
+            _writer.start()
+
+
+def _write_loop() -> None:
+    stamp_sec, stamp = -1, ""
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < _BATCH_MAX:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        records = [r for r in batch if r is not None]
+        if records:
+            lines = []
+            for t, tag, msg, _ in records:
+                sec = int(t)
+                if sec != stamp_sec:  # strftime once per second, not per record
+                    stamp_sec, stamp = sec, time.strftime("%H:%M:%S", time.localtime(t))
+                lines.append(f"{Fore.WHITE}{stamp} {_TAG_COLORS.get(tag, '')}[{tag}]{Style.RESET_ALL} {msg}\n")
+            try:
+                sys.stdout.write("".join(lines))
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+            cb = _log_callback
+            if cb:
+                for _, tag, msg, _ in records:
+                    try:
+                        cb(tag, msg)
+                    except Exception:
+                        pass
+            sink = _sink
+            if sink:
+                sink.write(records)
+            _stats["records"] += len(records)
+            _stats["batches"] += 1
+        if None in batch or _queue.empty():
+            _idle.set()
+
+
+class _JsonlSink:
+    """Appends records as JSON lines, rolling to ``.1`` … ``.N`` past *max_bytes*."""
+
+    def __init__(self, path: str, max_bytes: int, backups: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._f = open(path, "a", encoding="utf-8")
+        self._size = self._f.tell()
+
+    def write(self, records: list) -> None:
+        try:
+            data = "".join(
+                json.dumps({"t": round(t, 3), "level": tag, "thread": th, "msg": msg}, ensure_ascii=False) + "\n"
+                for t, tag, msg, th in records
+            )
+            self._f.write(data)
+            self._f.flush()
+            self._size += len(data)
+            if self._size >= self.max_bytes:
+                self._rotate()
+        except (OSError, ValueError):
+            pass
+
+    def _rotate(self) -> None:
+        self._f.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+    def close(self) -> None:
+        try:
+            self._f.close()
+        except OSError:
+            pass
+
+
+atexit.register(flush)
 
 
 def info(msg: str) -> None:
@@ -48,4 +208,7 @@ def error(msg: str) -> None:
 
 
 def debug(msg: str) -> None:
+    if _level > LEVELS["DEBUG"]:
+        _stats["dropped"] += 1
+        return
     _log("DEBUG", msg)
@@ -0,0 +1,132 @@
+"""Startup timeline, background preloading and an optional import-time profile.
+
+Import this first in ``main.py``: the clock starts when it is imported.
+``mark()`` records milestones ("waiting for window", "GUI shown"),
+``preload()`` imports heavy modules on a daemon thread while the main
+thread waits for the game, and ``timed()`` records lazily loaded pieces
+(e.g. the Gemini SDK on first use).
+
+With ``--startup-report`` on the command line or ``STARTUP_REPORT=1`` in
+the environment, an ``__import__`` hook also times every module loaded
+from then on, like ``python -X importtime``, and ``report()`` includes the
+slowest ones. Without it the hook is never installed.
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_T0 = time.perf_counter()
+ENABLED = "--startup-report" in sys.argv or os.environ.get("STARTUP_REPORT", "0") == "1"
+
+_lock = threading.Lock()
+_marks: list[tuple[str, float]] = []                   # (label, seconds since start)
+_loads: list[tuple[str, str, float, float]] = []       # (what, thread, started at, ms)
+_imports: dict[str, tuple[float, float, int]] = {}     # module -> (self us, cumulative us, depth)
+_threads: list[threading.Thread] = []
+
+
+def elapsed() -> float:
+    return time.perf_counter() - _T0
+
+
+def mark(label: str) -> float:
+    t = elapsed()
+    with _lock:
+        _marks.append((label, t))
+    return t
+
+
+@contextmanager
+def timed(what: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000.0
+        with _lock:
+            _loads.append((what, threading.current_thread().name, start - _T0, ms))
+
+
+def preload(*modules: str, name: str = "preload") -> threading.Thread:
+    """Import *modules* in order on a daemon thread; failures are left for the real import to report."""
+    def run() -> None:
+        for mod in modules:
+            if mod in sys.modules:
+                continue
+            try:
+                with timed(f"import {mod}"):
+                    importlib.import_module(mod)
+            except Exception:
+                pass
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    with _lock:
+        _threads.append(thread)
+    thread.start()
+    return thread
+
+
+def wait_preloads(timeout: float | None = None) -> None:
+    with _lock:
+        threads = list(_threads)
+    for t in threads:
+        t.join(timeout)
+
+
+def summary() -> str:
+    with _lock:
+        return ", ".join(f"{label} {t:.2f}s" for label, t in _marks)
+
+
+def report(top: int = 25) -> str:
+    with _lock:
+        marks, loads, imports = list(_marks), list(_loads), dict(_imports)
+    lines = ["Startup timeline (s since start):"]
+    lines += [f"  {t:7.3f}  {label}" for label, t in marks]
+    if loads:
+        lines.append("Deferred loads:")
+        lines += [f"  {at:7.3f}  {ms:8.1f} ms  {what}  [{thread}]" for what, thread, at, ms in sorted(loads, key=lambda x: x[2])]
+    if imports:
+        lines.append(f"Slowest imports ({len(imports)} modules, -X importtime style, us):")
+        lines.append(f"  {'self':>9} | {'cumulative':>10} | module")
+        slowest = sorted(imports.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+        lines += [f"  {s:9.0f} | {c:10.0f} | {'  ' * d}{m}" for m, (s, c, d) in slowest]
+    elif not ENABLED:
+        lines.append("(per-module import times: run with --startup-report)")
+    return "\n".join(lines)
+
+
+# ── import profiling ──
+
+_real_import = builtins.__import__
+_stack = threading.local()
+
+
+def _timing_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # relative and already-loaded imports are cheap and not what we're after
+    if level or name in sys.modules:
+        return _real_import(name, globals, locals, fromlist, level)
+    frames = getattr(_stack, "frames", None)
+    if frames is None:
+        frames = _stack.frames = []
+    frames.append(0.0)  # children's cumulative time
+    start = time.perf_counter()
+    try:
+        return _real_import(name, globals, locals, fromlist, level)
+    finally:
+        cumulative = (time.perf_counter() - start) * 1e6
+        children = frames.pop()
+        if frames:
+            frames[-1] += cumulative
+        with _lock:
+            _imports.setdefault(name, (cumulative - children, cumulative, len(frames)))
+
+
+if ENABLED:
+    builtins.__import__ = _timing_import